@@ -10,10 +10,22 @@ This script controls the complete data science workflow:
 4. Model training (Random Forest & XGBoost)
 5. Model evaluation and saving artifacts
 
+The steps form a dependency graph (src/pipeline_dag.py): independent stages
+such as the EDA plots and the two model trainings run concurrently within a
+worker budget. Every stage also goes through a content-addressed stage cache
+(src/pipeline_cache.py): a stage whose inputs, code and parameters are
+unchanged is skipped and its stored result is reused.
+
+Usage:
+    python main.py                         # reuse cached stages
+    python main.py --workers 4             # up to 4 stages at once
+    python main.py --force                 # recompute everything
+    python main.py --force-stage eda_overview   # recompute selected stages
+
 Author: Xinmei Ma (Leah)
 """
-
 # === 1. Imports ===
+import argparse
 import os
 import joblib
 from src.utils import setup_environment, configure_chinese_fonts, set_color_palette
@@ -30,9 +42,19 @@ from src.eda import (
     plot_categorical_features,
     plot_numerical_features,
     plot_correlations,
+    generate_eda_report,
+    compute_summary,
+    save_summary,
+    load_summary,
+    summarize_csv,
 )
 from src.model_train import train_baseline_rf, train_xgboost_tuned
-from src.model_eval import evaluate_model
+from src.model_eval import evaluate_model, paired_bootstrap
+from src.cv_engine import OOF_DIR, CVResult, compare_results
+from src.pipeline_cache import StageCache, module_sources
+from src.pipeline_dag import Stage, run_dag, print_report
+from src.rendering import FIGURE_FORMAT
+from src.resources import cap_native_threads, share_between_stages, stage_budget
 
 
 # === 2. Global configuration ===
@@ -40,70 +62,215 @@ RAW_DATA_PATH = "data/raw/Telco-Customer-Churn.csv"
 PROCESSED_DATA_PATH = "data/processed/telco_processed.csv"
 RF_MODEL_PATH = "models/baseline_rf.pkl"
 XGB_MODEL_PATH = "models/xgboost_tuned.pkl"
+BEST_XGB_PATH = "models/best_xgb.pkl"
+FINAL_MODEL_PATH = "models/final_model.pkl"
+ENCODER_PATH = "models/categorical_encoder.joblib"
+EDA_DIR = "reports/eda_results"
+EDA_SUMMARY_PATH = f"{EDA_DIR}/eda_stats.json"
+EVAL_DIR = "reports/model_eval"
 
+DEFAULT_WORKERS = int(os.getenv("PIPELINE_WORKERS", str(min(4, os.cpu_count() or 1))))
+XGB_SEARCH = os.getenv("XGB_SEARCH", "grid")
+EDA_CHUNKSIZE = int(os.getenv("EDA_CHUNKSIZE", "0"))
 
-# === 3. Main workflow ===
-def main():
-    print("\n🚀 Starting Telco Customer Churn Full Pipeline...\n")
 
-    # ---------- Step 1: Environment Setup ----------
-    print("🧩 Step 1 — Setting up environment...")
+# === 3. Pipeline stages ===
+def setup_worker():
+    """Environment setup — runs in the parent and in every worker process."""
+    cap_native_threads(stage_budget())
     setup_environment()
     configure_chinese_fonts()
-    colors = set_color_palette()
-    print("✅ Environment configured.\n")
 
-    # ---------- Step 2: Data Preprocessing ----------
-    print("🧹 Step 2 — Loading and cleaning data...")
+
+def stage_preprocess():
     data = load_data(RAW_DATA_PATH)
     data = clean_total_charges(data)
     data = drop_unnecessary_columns(data)
-    df_encoded = encode_categorical_features(data)
+    df_encoded = encode_categorical_features(data, encoder_path=ENCODER_PATH)
     save_processed_data(df_encoded, PROCESSED_DATA_PATH)
-    print(f"✅ Data preprocessing completed! Saved to {PROCESSED_DATA_PATH}\n")
-
-    # ---------- Step 3: Exploratory Data Analysis ----------
-    print("📊 Step 3 — Running Exploratory Data Analysis (EDA)...")
-    plot_overview(df_encoded, colors)
-    plot_categorical_features(df_encoded, colors)
-    plot_numerical_features(df_encoded, colors)
-    plot_correlations(df_encoded, colors)
-    print("✅ EDA completed. Results available in reports/eda_results/\n")
-
-    # ---------- Step 4a: Random Forest Model ----------
-    print("🌲 Step 4a — Training baseline Random Forest model...")
+
+
+def stage_eda_summary(chunksize=0):
+    if chunksize:
+        save_summary(summarize_csv(PROCESSED_DATA_PATH, chunksize=chunksize), EDA_SUMMARY_PATH)
+        return
+    import pandas as pd
+    save_summary(compute_summary(pd.read_csv(PROCESSED_DATA_PATH)), EDA_SUMMARY_PATH)
+
+
+def stage_eda_overview(colors):
+    plot_overview(load_summary(EDA_SUMMARY_PATH), colors)
+
+
+def stage_eda_categorical(colors):
+    plot_categorical_features(load_summary(EDA_SUMMARY_PATH), colors)
+
+
+def stage_eda_numerical(colors):
+    plot_numerical_features(load_summary(EDA_SUMMARY_PATH), colors)
+
+
+def stage_eda_correlation(colors):
+    plot_correlations(load_summary(EDA_SUMMARY_PATH), colors)
+
+
+def stage_eda_report():
+    generate_eda_report(EDA_DIR)
+
+
+def stage_train_rf():
     f1, t1 = load_processed_data(PROCESSED_DATA_PATH)
-    rf_model, (x_train, x_test, y_train, y_test) = train_baseline_rf(f1, t1)
-    joblib.dump(rf_model, RF_MODEL_PATH)
+    rf_model, split = train_baseline_rf(f1, t1, save_path=RF_MODEL_PATH)
     print(f"✅ RandomForest saved to {RF_MODEL_PATH}\n")
+    return rf_model, split
 
-    print("📈 Evaluating Random Forest...")
-    rf_metrics = evaluate_model(rf_model, x_test, y_test, model_name="RandomForest")
 
-    # ---------- Step 4b: XGBoost Model ----------
-    print("\n⚡ Step 4b — Training tuned XGBoost model...")
-    xgb_model, (x_train, x_test, y_train, y_test) = train_xgboost_tuned(f1, t1)
+def stage_train_xgb(search="grid", max_seconds=None):
+    f1, t1 = load_processed_data(PROCESSED_DATA_PATH)
+    xgb_model, split = train_xgboost_tuned(f1, t1, save_path=BEST_XGB_PATH,
+                                           search=search, max_seconds=max_seconds)
     joblib.dump(xgb_model, XGB_MODEL_PATH)
     print(f"✅ XGBoost model saved to {XGB_MODEL_PATH}\n")
+    return xgb_model, split
+
+
+def _ci(metrics, name):
+    low, high = metrics.get(f"{name}_ci", (None, None))
+    return f"[{low:.3f}–{high:.3f}] " if low is not None else ""
+
+
+def stage_evaluate(model_name, trained):
+    model, (_, x_test, _, y_test) = trained
+    print(f"📈 Evaluating {model_name}...")
+    return evaluate_model(model, x_test, y_test, model_name=model_name, oof=CVResult.load(model_name))
 
-    print("📈 Evaluating XGBoost...")
-    xgb_metrics = evaluate_model(xgb_model, x_test, y_test, model_name="XGBoost")
 
-    # ---------- Step 5: Model Comparison ----------
+def stage_compare(rf, xgb, rf_metrics, xgb_metrics):
     print("\n📊 Step 5 — Comparing model performance...")
-    print(f"RandomForest  | ROC AUC: {rf_metrics['roc_auc']:.3f} | PR AUC: {rf_metrics['pr_auc']:.3f} | Acc: {rf_metrics['accuracy']:.3f}")
-    print(f"XGBoost       | ROC AUC: {xgb_metrics['roc_auc']:.3f} | PR AUC: {xgb_metrics['pr_auc']:.3f} | Acc: {xgb_metrics['accuracy']:.3f}")
+    for name, m in [("RandomForest", rf_metrics), ("XGBoost", xgb_metrics)]:
+        print(f"{name:<13} | ROC AUC: {m['roc_auc']:.3f} {_ci(m, 'roc_auc')}| PR AUC: {m['pr_auc']:.3f} "
+              f"{_ci(m, 'pr_auc')}| Acc: {m['accuracy']:.3f} {_ci(m, 'accuracy')}".rstrip())
+
+    (_, x_test, _, y_test), (_, xgb_x_test, _, _) = rf[1], xgb[1]
+    assert x_test.index.equals(xgb_x_test.index), "models were evaluated on different test splits"
+    paired = paired_bootstrap(y_test, rf[0].predict_proba(x_test)[:, 1], xgb[0].predict_proba(x_test)[:, 1])
+    print("\nPaired bootstrap, XGBoost − RandomForest (95% CI):")
+    for metric, d in paired.items():
+        verdict = "significant" if d["low"] > 0 or d["high"] < 0 else "within noise"
+        print(f"  {metric:<9} Δ {d['diff']:+.3f} [{d['low']:+.3f}, {d['high']:+.3f}] p={d['p_value']:.3f} → {verdict}")
+    print("\nOut-of-fold (same folds, no refits):")
+    for name, fold_auc, oof_auc, oof_pr, wins in compare_results(CVResult.load("RandomForest"),
+                                                                 CVResult.load("XGBoost")):
+        print(f"{name:<13} | fold AUC: {fold_auc:.3f} | OOF AUC: {oof_auc:.3f} | OOF PR AUC: {oof_pr:.3f} | folds won vs RF: {wins}")
 
     if xgb_metrics['roc_auc'] > rf_metrics['roc_auc']:
         print("\n🏆 XGBoost outperformed RandomForest — saving as final model.")
-        joblib.dump(xgb_model, "models/final_model.pkl")
-    else:
-        print("\n🏆 RandomForest remains best — saving as final model.")
-        joblib.dump(rf_model, "models/final_model.pkl")
+        joblib.dump(xgb[0], FINAL_MODEL_PATH)
+        return "XGBoost"
+    print("\n🏆 RandomForest remains best — saving as final model.")
+    joblib.dump(rf[0], FINAL_MODEL_PATH)
+    return "RandomForest"
+
+
+def build_stages(colors, xgb_search="grid", xgb_budget_seconds=None, eda_chunksize=0) -> list:
+    """The pipeline graph: preprocess → {EDA summary → 4 EDA plots → report, RF, XGB} → evaluations → compare."""
+    # Code lists follow each stage module's `src.*` imports, so editing any dependency reruns the stage
+    train_code = module_sources("src/model_train.py")
+    eval_code = module_sources("src/model_eval.py", "src/cv_engine.py")
+    # Figures are written as FIGURE_FORMAT (png | jpg | svg | pdf), see src.rendering
+    eda = [
+        ("eda_overview", stage_eda_overview, "src/eda/overview.py", f"overview_churn_distribution.{FIGURE_FORMAT}"),
+        ("eda_categorical", stage_eda_categorical, "src/eda/categorical_analysis.py", f"categorical_overview.{FIGURE_FORMAT}"),
+        ("eda_numerical", stage_eda_numerical, "src/eda/numerical_analysis.py", f"numerical_*_p*.{FIGURE_FORMAT}"),
+        ("eda_correlation", stage_eda_correlation, "src/eda/correlation_analysis.py", f"correlation_heatmap.{FIGURE_FORMAT}"),
+    ]
+    return [
+        Stage("preprocess", stage_preprocess, cache={
+            "inputs": [RAW_DATA_PATH], "code": module_sources("src/preprocess.py"),
+            "outputs": [PROCESSED_DATA_PATH, ENCODER_PATH]}),
+        Stage("eda_summary", stage_eda_summary, args=(eda_chunksize,), deps=["preprocess"], cache={
+            "inputs": [PROCESSED_DATA_PATH],
+            "code": module_sources("src/eda/summary.py", "src/eda/streaming.py"),
+            "params": {"chunksize": eda_chunksize}, "outputs": [EDA_SUMMARY_PATH]}),
+        *[
+            Stage(name, fn, args=(colors,), deps=["eda_summary"], cache={
+                "inputs": [EDA_SUMMARY_PATH], "code": module_sources(module, "src/utils.py"),
+                "params": {"colors": colors, "format": FIGURE_FORMAT}, "outputs": [f"{EDA_DIR}/{pattern}"]})
+            for name, fn, module, pattern in eda
+        ],
+        Stage("eda_report", stage_eda_report, deps=[name for name, *_ in eda], cache={
+            "inputs": [f"{EDA_DIR}/*.{FIGURE_FORMAT}"],
+            "code": module_sources("src/eda/report_generator.py"),
+            "outputs": [f"{EDA_DIR}/eda_summary.html", f"{EDA_DIR}/manifest.json", f"{EDA_DIR}/thumbs/*"]}),
+        Stage("rf_train", stage_train_rf, deps=["preprocess"], cache={
+            "inputs": [PROCESSED_DATA_PATH], "code": train_code,
+            "outputs": [RF_MODEL_PATH, f"{OOF_DIR}/RandomForest.joblib"]}),
+        Stage("xgb_train", stage_train_xgb, args=(xgb_search, xgb_budget_seconds),
+              deps=["preprocess"], cache={
+            "inputs": [PROCESSED_DATA_PATH], "code": train_code,
+            "params": {"search": xgb_search, "budget_seconds": xgb_budget_seconds},
+            "outputs": [BEST_XGB_PATH, XGB_MODEL_PATH, f"{OOF_DIR}/XGBoost.joblib"]}),
+        Stage("rf_evaluate", stage_evaluate, args=("RandomForest",), deps=["rf_train"],
+              consumes=["rf_train"], cache={
+                  "inputs": [f"{OOF_DIR}/RandomForest.joblib"], "code": eval_code,
+                  "params": {"format": FIGURE_FORMAT},
+                  "outputs": [f"{EVAL_DIR}/RandomForest_*"]}),
+        Stage("xgb_evaluate", stage_evaluate, args=("XGBoost",), deps=["xgb_train"],
+              consumes=["xgb_train"], cache={
+                  "inputs": [f"{OOF_DIR}/XGBoost.joblib"], "code": eval_code,
+                  "params": {"format": FIGURE_FORMAT},
+                  "outputs": [f"{EVAL_DIR}/XGBoost_*"]}),
+        Stage("compare", stage_compare,
+              deps=["rf_train", "xgb_train", "rf_evaluate", "xgb_evaluate"],
+              consumes=["rf_train", "xgb_train", "rf_evaluate", "xgb_evaluate"]),
+    ]
+
+
+# === 4. Main workflow ===
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Telco Customer Churn full pipeline")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Maximum number of stages running at once")
+    parser.add_argument("--force", action="store_true", help="Recompute every stage")
+    parser.add_argument("--force-stage", action="append", default=[],
+                        help="Recompute the given stage (repeatable)")
+    parser.add_argument("--xgb-search", choices=["grid", "halving", "early_stopping"], default=XGB_SEARCH,
+                        help="XGBoost tuning strategy: exhaustive grid, budgeted successive halving or early stopping")
+    parser.add_argument("--xgb-budget-seconds", type=float, default=None,
+                        help="Wall-clock budget for the successive-halving search")
+    parser.add_argument("--eda-chunksize", type=int, default=EDA_CHUNKSIZE,
+                        help="Build the EDA summary by streaming the data in chunks of this many rows (0: in memory)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cache = StageCache(force=True if args.force else args.force_stage)
+    print("\n🚀 Starting Telco Customer Churn Full Pipeline...\n")
+
+    # ---------- Step 1: Environment Setup ----------
+    print("🧩 Step 1 — Setting up environment...")
+    share_between_stages(args.workers)
+    setup_worker()
+    colors = set_color_palette()
+    os.makedirs("models", exist_ok=True)
+    print("✅ Environment configured.\n")
+
+    # ---------- Steps 2–5: Stage graph ----------
+    stages = build_stages(colors, args.xgb_search, args.xgb_budget_seconds, args.eda_chunksize)
+    unknown = set(args.force_stage) - {s.name for s in stages}
+    if unknown:
+        raise SystemExit(f"Unknown stage(s) for --force-stage: {sorted(unknown)}")
+
+    print(f"🧮 Running {len(stages)} stages with up to {args.workers} worker(s)...\n")
+    results, timings = run_dag(stages, max_workers=args.workers, cache=cache, initializer=setup_worker)
 
+    print(f"\n🏆 Final model: {results['compare']} → {FINAL_MODEL_PATH}")
+    cache.print_summary()
+    print_report(stages, timings)
     print("\n🎯 All pipeline stages executed successfully! Artifacts stored under /models and /reports.\n")
 
 
-# === 4. Entry point ===
+# === 5. Entry point ===
 if __name__ == "__main__":
     main()
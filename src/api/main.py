@@ -11,7 +11,8 @@ Run with:
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.routers import predict, healthcheck, data_preview
+from src.api.routers import predict, healthcheck, data_preview, models, metrics
+from src.api.services.metrics import MetricsMiddleware
 
 
 # ===============================================================
@@ -35,6 +36,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts, errors and latency for /metrics (added last, so it wraps everything)
+app.add_middleware(MetricsMiddleware)
+
 
 # ===============================================================
 # Register routers
@@ -42,6 +46,8 @@ app.add_middleware(
 app.include_router(healthcheck.router, prefix="/api")
 app.include_router(data_preview.router, prefix="/api")
 app.include_router(predict.router, prefix="/api")
+app.include_router(models.router, prefix="/api")
+app.include_router(metrics.router)
 
 
 # ===============================================================
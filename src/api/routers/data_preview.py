@@ -1,21 +1,60 @@
-# src/api/routers/data_preview.py
 """
 Data Preview Router
 -------------------
-Returns first few rows of processed dataset for verification.
+Returns paginated, column-projected rows of the processed dataset.
+Rows are served from a memory-mapped columnar cache that is rebuilt
+only when the CSV file changes.
 """
 
-from fastapi import APIRouter, HTTPException
-import pandas as pd
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response
 import os
+from src.api.services.data_store import ColumnarStore
 
 router = APIRouter(tags=["Data Preview"])
 DATA_PATH = "data/processed/telco_processed.csv"
+MAX_LIMIT = 1000
+store = ColumnarStore(DATA_PATH)
+
+
+def _parse_filters(filters: Optional[List[str]]) -> dict:
+    parsed = {}
+    for item in filters or []:
+        col, sep, value = item.partition(":")
+        if not sep or not col:
+            raise HTTPException(status_code=400, detail=f"Invalid filter '{item}', expected column:value.")
+        parsed[col] = value
+    return parsed
+
 
 @router.get("/data-preview")
-def data_preview(n: int = 5):
-    """Preview first n rows of the processed dataset."""
+def data_preview(
+    response: Response,
+    n: int = Query(5, ge=0, le=MAX_LIMIT, description="Rows to return (alias of limit)"),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=0, le=MAX_LIMIT),
+    columns: Optional[List[str]] = Query(None, description="Columns to return; repeat or comma-separate"),
+    filter: Optional[List[str]] = Query(None, description="Equality filter column:value; repeatable"),
+):
+    """
+    Preview rows of the processed dataset.
+    The total number of matching rows is returned in the X-Total-Count header.
+    """
     if not os.path.exists(DATA_PATH):
         raise HTTPException(status_code=404, detail="Processed data not found.")
-    df = pd.read_csv(DATA_PATH)
-    return df.head(n).to_dict(orient="records")
+
+    selected = [c for item in columns or [] for c in item.split(",") if c] or None
+    try:
+        total, records = store.query(
+            offset=offset,
+            limit=n if limit is None else limit,
+            columns=selected,
+            filters=_parse_filters(filter),
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers["X-Total-Count"] = str(total)
+    return records
@@ -0,0 +1,18 @@
+"""
+Metrics Router
+--------------
+Exposes /metrics in the Prometheus text format: request counts and errors,
+end-to-end and per-stage latency histograms, model version / load time
+and process RSS.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+from src.api.services.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,18 @@
+"""
+Models Router
+-------------
+Lists servable model artifacts and the state of the model pool.
+"""
+
+from fastapi import APIRouter
+from src.api.routers.predict import model_service
+
+router = APIRouter(tags=["Models"])
+
+@router.get("/models")
+def list_models():
+    """Discovered model artifacts with their versions and load state."""
+    return {
+        "models": model_service.registry.list_models(),
+        "pool": model_service.registry.stats(),
+    }
@@ -2,24 +2,95 @@
 """
 Predict Router
 --------------
-Defines the /api/predict endpoint for churn probability prediction.
+Defines the /api/predict endpoints for churn probability prediction.
+Every endpoint accepts optional `model` (artifact name) and `version`
+(content hash prefix) query parameters to choose the serving model.
 """
 
-from fastapi import APIRouter, HTTPException
-from src.api.schemas.churn_schema import CustomerFeatures, PredictionResult
+from typing import Optional
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from src.api.schemas.churn_schema import (
+    CustomerFeatures,
+    PredictionResult,
+    BatchPredictionRequest,
+    BatchPredictionResult,
+)
 from src.api.services.churn_service import ChurnModelService
+from src.api.services.metrics import endpoint_stages, register_model_metrics
+from src.api.services.model_registry import ModelNotFoundError
+from src.bulk_score import DEFAULT_CHUNKSIZE, detect_format, iter_ndjson
+from src.config import BATCH_MAX_RECORDS
 
 router = APIRouter(tags=["Prediction"])
 model_service = ChurnModelService()
+register_model_metrics(model_service.registry.stats)
 
 
 @router.post("/predict", response_model=PredictionResult)
-def predict_churn(data: CustomerFeatures):
+async def predict_churn(data: CustomerFeatures, request: Request, model: Optional[str] = None,
+                        version: Optional[str] = None):
     """
     Predict customer churn based on input features.
+    Concurrent calls are transparently micro-batched into one model call.
     """
     try:
-        result = model_service.predict(data)
-        return result
+        with endpoint_stages(request):
+            return await model_service.predict_async(data, model, version)
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/predict/batch", response_model=BatchPredictionResult)
+def predict_churn_batch(data: BatchPredictionRequest, request: Request, model: Optional[str] = None,
+                        version: Optional[str] = None):
+    """
+    Predict churn for many customers in one call.
+    Rows that fail validation carry an `error` instead of a prediction.
+    """
+    if len(data.records) > BATCH_MAX_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(data.records)} records (max {BATCH_MAX_RECORDS}).",
+        )
+    try:
+        with endpoint_stages(request):
+            return model_service.predict_batch(data.records, model, version)
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/predict/bulk")
+def predict_churn_bulk(file: UploadFile = File(...), chunksize: int = DEFAULT_CHUNKSIZE,
+                       model: Optional[str] = None, version: Optional[str] = None):
+    """
+    Stream-score an uploaded CSV or JSONL file.
+    Results are streamed back as NDJSON, one line per row, followed by a summary line.
+    """
+    if chunksize < 1:
+        raise HTTPException(status_code=422, detail="chunksize must be positive.")
+    try:
+        model_service.registry.get(model, version)
+    except ModelNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    fmt = detect_format(file.filename or "")
+    score_fn = lambda X: model_service.score_matrix(X, model, version)
+    return StreamingResponse(
+        iter_ndjson(file.file, fmt, score_fn, chunksize),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/predict/stats")
+def predict_stats():
+    """Micro-batching and prediction-cache counters."""
+    return {
+        "model_version": model_service.model_version,
+        "microbatch": {name: b.stats() for name, b in model_service.batchers.items()},
+        "cache": model_service.cache.stats(),
+    }
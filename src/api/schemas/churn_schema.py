@@ -6,29 +6,64 @@ Defines data validation and serialization models
 for API request and response.
 """
 
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel, Field, field_validator
+
+# Categorical fields accept either the label-encoded integer or the raw Telco
+# value (e.g. "Female", "Month-to-month"); raw values are encoded by the service.
+# Digit-only strings ("1") are label codes sent as text and are coerced to int.
+Category = Union[int, str]
 
 class CustomerFeatures(BaseModel):
-    gender: int = Field(..., example=1)
+    gender: Category = Field(..., example=1)
     SeniorCitizen: int = Field(..., example=0)
-    Partner: int = Field(..., example=1)
-    Dependents: int = Field(..., example=0)
+    Partner: Category = Field(..., example=1)
+    Dependents: Category = Field(..., example=0)
     tenure: float = Field(..., example=12)
-    PhoneService: int = Field(..., example=1)
-    MultipleLines: int = Field(..., example=0)
-    InternetService: int = Field(..., example=2)
-    OnlineSecurity: int = Field(..., example=1)
-    OnlineBackup: int = Field(..., example=0)
-    DeviceProtection: int = Field(..., example=1)
-    TechSupport: int = Field(..., example=0)
-    StreamingTV: int = Field(..., example=1)
-    StreamingMovies: int = Field(..., example=0)
-    Contract: int = Field(..., example=2)
-    PaperlessBilling: int = Field(..., example=1)
-    PaymentMethod: int = Field(..., example=3)
+    PhoneService: Category = Field(..., example=1)
+    MultipleLines: Category = Field(..., example=0)
+    InternetService: Category = Field(..., example=2)
+    OnlineSecurity: Category = Field(..., example=1)
+    OnlineBackup: Category = Field(..., example=0)
+    DeviceProtection: Category = Field(..., example=1)
+    TechSupport: Category = Field(..., example=0)
+    StreamingTV: Category = Field(..., example=1)
+    StreamingMovies: Category = Field(..., example=0)
+    Contract: Category = Field(..., example=2)
+    PaperlessBilling: Category = Field(..., example=1)
+    PaymentMethod: Category = Field(..., example=3)
     MonthlyCharges: float = Field(..., example=70.35)
     TotalCharges: float = Field(..., example=840.5)
 
+    @field_validator("gender", "Partner", "Dependents", "PhoneService", "MultipleLines",
+                     "InternetService", "OnlineSecurity", "OnlineBackup", "DeviceProtection",
+                     "TechSupport", "StreamingTV", "StreamingMovies", "Contract",
+                     "PaperlessBilling", "PaymentMethod", mode="before")
+    @classmethod
+    def _numeric_codes(cls, value):
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value)
+        return value
+
 class PredictionResult(BaseModel):
     churn_probability: float
     prediction: str
+
+# Column order expected by the trained model (same as the processed dataset)
+FEATURE_COLUMNS = list(CustomerFeatures.model_fields)
+
+class BatchPredictionRequest(BaseModel):
+    # Records are validated row by row in the service so that one bad
+    # record is reported on its own item instead of failing the whole batch.
+    records: List[Dict[str, Any]] = Field(..., min_length=1)
+
+class BatchPredictionItem(BaseModel):
+    index: int
+    churn_probability: Optional[float] = None
+    prediction: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchPredictionResult(BaseModel):
+    count: int
+    failed: int
+    results: List[BatchPredictionItem]
@@ -2,37 +2,214 @@
 """
 Churn Model Service
 -------------------
-Handles model loading and prediction.
+Handles model selection and prediction.
+Models are resolved through the `ModelRegistry`, so they are loaded lazily,
+can be picked by name or version, and are hot-swapped when their file changes.
 """
 
-import joblib
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
 import numpy as np
-import pandas as pd
-from src.api.schemas.churn_schema import CustomerFeatures, PredictionResult
-from src.utils import ensure_dir
+from pydantic import ValidationError
+from src.api.schemas.churn_schema import (
+    CustomerFeatures,
+    PredictionResult,
+    BatchPredictionItem,
+    BatchPredictionResult,
+    FEATURE_COLUMNS,
+)
+from src.api.services.metrics import stage_timer
+from src.api.services.micro_batcher import MicroBatcher
+from src.api.services.model_registry import LoadedModel, ModelRegistry
+from src.api.services.prediction_cache import PredictionCache
+from src.encoder import CategoricalEncoder
+from src.config import (
+    MICROBATCH_WINDOW_MS,
+    MICROBATCH_MAX_SIZE,
+    NATIVE_TREES,
+    NATIVE_TREES_MAX_ROWS,
+    SERVING_MODEL_PATH,
+    MODEL_POOL_MAX_MODELS,
+    MODEL_POOL_MAX_MB,
+    MODEL_RELOAD_CHECK_SECONDS,
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_CACHE_TTL,
+    SERVING_ENCODER_PATH,
+)
 
-MODEL_PATH = "models/best_xgb.pkl"
+MODEL_PATH = SERVING_MODEL_PATH
+THRESHOLD = 0.5
 
 
 
 class ChurnModelService:
     """Service class for model inference."""
 
-    def __init__(self):
-        self.model = self._load_model()
+    def __init__(self, microbatch_window_ms: float = MICROBATCH_WINDOW_MS,
+                 microbatch_max_size: int = MICROBATCH_MAX_SIZE,
+                 cache_size: int = PREDICTION_CACHE_SIZE,
+                 cache_ttl: float = PREDICTION_CACHE_TTL,
+                 registry: Optional[ModelRegistry] = None):
+        self.registry = registry or ModelRegistry(
+            model_dir=os.path.dirname(MODEL_PATH) or ".",
+            default_model=os.path.splitext(os.path.basename(MODEL_PATH))[0],
+            max_models=MODEL_POOL_MAX_MODELS,
+            max_bytes=MODEL_POOL_MAX_MB * 1024 * 1024,
+            native_trees=NATIVE_TREES,
+            check_interval=MODEL_RELOAD_CHECK_SECONDS,
+        )
+        self.microbatch_window_ms = microbatch_window_ms
+        self.microbatch_max_size = microbatch_max_size
+        self.batchers: Dict[str, MicroBatcher] = {}
+        self.cache = PredictionCache(cache_size, cache_ttl)
+        self._encoder: Optional[CategoricalEncoder] = None
 
-    def _load_model(self):
-        """Load trained model from disk."""
-        try:
-            model = joblib.load(MODEL_PATH)
-            print(f"✅ Model loaded successfully from {MODEL_PATH}")
-            return model
-        except Exception as e:
-            raise RuntimeError(f"Failed to load model: {e}")
+    # ------------------------------------------------------------
+    # Default-model shortcuts
+    # ------------------------------------------------------------
+    @property
+    def model(self):
+        return self.registry.get().model
 
-    def predict(self, features: CustomerFeatures) -> PredictionResult:
-        """Perform churn prediction."""
-        input_df = pd.DataFrame([features.dict()])
-        prob = self.model.predict_proba(input_df)[0, 1]
-        prediction = "Churn" if prob >= 0.5 else "No Churn"
+    @property
+    def native(self):
+        return self.registry.get().native
+
+    @property
+    def model_version(self) -> str:
+        return self.registry.get().version
+
+    @property
+    def batcher(self) -> MicroBatcher:
+        return self._batcher(self.registry.default_model)
+
+    def _batcher(self, name: str) -> MicroBatcher:
+        """One micro-batcher per model name; rows are scored with the snapshot they were submitted with."""
+        if name not in self.batchers:
+            self.batchers[name] = MicroBatcher(
+                lambda X, loaded: self._score(loaded, X),
+                self.microbatch_window_ms,
+                self.microbatch_max_size,
+            )
+        return self.batchers[name]
+
+    @staticmethod
+    def _format(prob: float) -> PredictionResult:
+        prediction = "Churn" if prob >= THRESHOLD else "No Churn"
         return PredictionResult(churn_probability=round(float(prob), 3), prediction=prediction)
+
+    # ------------------------------------------------------------
+    # Single-row prediction
+    # ------------------------------------------------------------
+    def predict(self, features: CustomerFeatures, model: Optional[str] = None,
+                version: Optional[str] = None) -> PredictionResult:
+        """Perform churn prediction."""
+        loaded = self.registry.get(model, version)
+        row = self.build_feature_matrix([features])
+        key, cached = self._cache_lookup(row, loaded)
+        if cached is not None:
+            return cached
+        result = self._format(self._score(loaded, row)[0])
+        self._cache_store(key, result)
+        return result
+
+    async def predict_async(self, features: CustomerFeatures, model: Optional[str] = None,
+                            version: Optional[str] = None) -> PredictionResult:
+        """Perform churn prediction, coalescing concurrent calls into micro-batches."""
+        # Resolving the snapshot may hot-reload it (a blocking joblib.load), so keep it off the event loop
+        loaded = await asyncio.to_thread(self.registry.get, model, version)
+        batcher = self._batcher(loaded.name)
+        if not batcher.enabled:
+            return await asyncio.to_thread(self.predict, features, loaded.name, version)
+        row = self.build_feature_matrix([features])
+        key, cached = self._cache_lookup(row, loaded)
+        if cached is not None:
+            return cached
+        result = self._format(await batcher.submit(row, loaded))
+        self._cache_store(key, result)
+        return result
+
+    def _cache_lookup(self, row: np.ndarray, loaded: LoadedModel):
+        if not self.cache.enabled:
+            return None, None
+        key = PredictionCache.make_key(row, f"{loaded.name}:{loaded.version}")
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key, result: PredictionResult) -> None:
+        if key is not None:
+            self.cache.put(key, result)
+
+    # ------------------------------------------------------------
+    # Vectorized scoring
+    # ------------------------------------------------------------
+    def score_matrix(self, X: np.ndarray, model: Optional[str] = None,
+                     version: Optional[str] = None) -> np.ndarray:
+        """Churn probability for every row of a feature matrix."""
+        return self._score(self.registry.get(model, version), X)
+
+    @staticmethod
+    def _score(loaded: LoadedModel, X: np.ndarray) -> np.ndarray:
+        with stage_timer("predict"):
+            if loaded.native is not None and len(X) <= NATIVE_TREES_MAX_ROWS:
+                return loaded.native.predict_proba(X)[:, 1]
+            return loaded.model.predict_proba(X)[:, 1]
+
+    @property
+    def encoder(self) -> CategoricalEncoder:
+        """Category tables saved at training time (loaded on first raw-string input)."""
+        if self._encoder is None:
+            if not os.path.exists(SERVING_ENCODER_PATH):
+                raise ValueError(
+                    f"Raw categorical values need the encoder artifact {SERVING_ENCODER_PATH}."
+                )
+            self._encoder = CategoricalEncoder.load(SERVING_ENCODER_PATH, handle_unknown="missing")
+        return self._encoder
+
+    def build_feature_matrix(self, rows: List[CustomerFeatures]) -> np.ndarray:
+        """
+        Stack validated rows into one C-contiguous float64 matrix in schema column order.
+        Columns holding raw category strings are encoded column-wise in one lookup.
+        """
+        with stage_timer("features"):
+            columns = [[getattr(row, col) for row in rows] for col in FEATURE_COLUMNS]
+            X = np.empty((len(rows), len(FEATURE_COLUMNS)), dtype=np.float64)
+            for j, (col, values) in enumerate(zip(FEATURE_COLUMNS, columns)):
+                if any(isinstance(v, str) for v in values):
+                    X[:, j] = self.encoder.encode_column(col, values)
+                else:
+                    X[:, j] = values
+            return X
+
+    def predict_batch(self, records: List[Dict[str, Any]], model: Optional[str] = None,
+                      version: Optional[str] = None) -> BatchPredictionResult:
+        """
+        Score many records with a single vectorized `predict_proba` call.
+
+        Every record is validated on its own; invalid rows are reported with
+        an error on their item while the remaining rows are still scored.
+        Results are returned in input order.
+        """
+        loaded = self.registry.get(model, version)
+        items: List[BatchPredictionItem] = [None] * len(records)
+        valid_rows, valid_idx = [], []
+        with stage_timer("validate"):
+            for i, record in enumerate(records):
+                try:
+                    valid_rows.append(CustomerFeatures(**record))
+                    valid_idx.append(i)
+                except (ValidationError, TypeError) as e:
+                    items[i] = BatchPredictionItem(index=i, error=str(e))
+
+        if valid_rows:
+            probs = self._score(loaded, self.build_feature_matrix(valid_rows))
+            for i, prob in zip(valid_idx, probs):
+                result = self._format(prob)
+                items[i] = BatchPredictionItem(
+                    index=i,
+                    churn_probability=result.churn_probability,
+                    prediction=result.prediction,
+                )
+
+        failed = len(records) - len(valid_rows)
+        return BatchPredictionResult(count=len(records), failed=failed, results=items)
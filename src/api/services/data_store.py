@@ -0,0 +1,171 @@
+"""
+Columnar Data Store
+-------------------
+Read-optimised, cached columnar view of a CSV dataset.
+
+The CSV is parsed once into one `.npy` file per column (plus a small
+`meta.json`) under a sidecar `.columnar/` folder. Columns are memory-mapped,
+so pagination and projection only touch the rows that are returned, and
+the cache is rebuilt automatically when the CSV's mtime or size changes.
+"""
+
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+FILTER_CACHE_SIZE = 64
+
+
+class ColumnarStore:
+    """Memory-mapped columnar cache of one CSV file."""
+
+    def __init__(self, csv_path: str, cache_dir: Optional[str] = None):
+        self.csv_path = Path(csv_path)
+        self.cache_dir = Path(cache_dir) if cache_dir else (
+            self.csv_path.parent / ".columnar" / self.csv_path.stem
+        )
+        self._lock = threading.Lock()
+        self._signature = None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._nrows = 0
+        self._filters: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+    # ------------------------------------------------------------
+    # Cache management
+    # ------------------------------------------------------------
+    def _csv_signature(self) -> Tuple[int, int]:
+        stat = self.csv_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> None:
+        """(Re)open the columnar cache if the CSV changed since the last request."""
+        signature = self._csv_signature()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            meta = self._read_meta()
+            if meta is None or tuple(meta["signature"]) != signature:
+                meta = self._build(signature)
+            self._columns = {
+                col: np.load(self.cache_dir / f"{i}.npy", mmap_mode="r")
+                for i, col in enumerate(meta["columns"])
+            }
+            self._nrows = meta["nrows"]
+            self._filters.clear()
+            self._signature = signature
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self.cache_dir / "meta.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _build(self, signature: Tuple[int, int]) -> dict:
+        """Convert the CSV into per-column .npy files (written to a temp dir, then swapped in)."""
+        df = pd.read_csv(self.csv_path)
+        tmp_dir = self.cache_dir.with_name(self.cache_dir.name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        for i, col in enumerate(df.columns):
+            values = df[col].to_numpy()
+            if values.dtype == object or not np.issubdtype(values.dtype, np.number):
+                values = df[col].astype(str).to_numpy().astype(str)
+            np.save(tmp_dir / f"{i}.npy", values)
+
+        meta = {"signature": list(signature), "columns": list(df.columns), "nrows": len(df)}
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.replace(tmp_dir, self.cache_dir)
+        print(f"🗂️ Columnar cache built for {self.csv_path} ({len(df)} rows)")
+        return meta
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    @property
+    def columns(self) -> List[str]:
+        return list(self._snapshot()[1])
+
+    def _snapshot(self) -> Tuple[tuple, Dict[str, np.ndarray], int]:
+        """Refresh, then read (signature, column mmaps, row count) together under the lock."""
+        self._refresh()
+        with self._lock:
+            return self._signature, self._columns, self._nrows
+
+    def _matching_rows(self, filters: Dict[str, str], snapshot) -> Optional[np.ndarray]:
+        """Row indices satisfying every `column == value` filter (None = no filter)."""
+        if not filters:
+            return None
+        signature, columns, nrows = snapshot
+        key = (signature, tuple(sorted(filters.items())))
+        # Sync endpoints run in the threadpool: the LRU is only touched under the lock
+        with self._lock:
+            cached = self._filters.get(key)
+            if cached is not None:
+                self._filters.move_to_end(key)
+                return cached
+
+        mask = np.ones(nrows, dtype=bool)
+        for col, raw in filters.items():
+            values = columns[col]
+            if np.issubdtype(values.dtype, np.number):
+                try:
+                    target = float(raw)
+                except ValueError:
+                    raise ValueError(f"Filter value '{raw}' is not numeric for column '{col}'.")
+            else:
+                target = raw
+            mask &= values == target
+
+        rows = np.flatnonzero(mask)
+        with self._lock:
+            if signature == self._signature:   # skip if the cache was reopened meanwhile
+                self._filters[key] = rows
+                if len(self._filters) > FILTER_CACHE_SIZE:
+                    self._filters.popitem(last=False)
+        return rows
+
+    def query(self, offset: int = 0, limit: int = 5, columns: Optional[List[str]] = None,
+              filters: Optional[Dict[str, str]] = None) -> Tuple[int, List[dict]]:
+        """
+        Return `(total_matching_rows, records)` for one page.
+
+        The page is read from one consistent snapshot of the column mmaps, even
+        if the CSV changes and the cache is reopened while the query runs.
+
+        Args:
+            offset (int): Number of matching rows to skip.
+            limit (int): Maximum number of rows to return.
+            columns (list[str], optional): Columns to project (default: all).
+            filters (dict, optional): Equality filters `{column: value}`.
+        """
+        snapshot = self._snapshot()
+        _, store_columns, nrows = snapshot
+        columns = columns or list(store_columns)
+        unknown = [c for c in list(columns) + list(filters or {}) if c not in store_columns]
+        if unknown:
+            raise KeyError(f"Unknown columns: {unknown}")
+
+        rows = self._matching_rows(filters or {}, snapshot)
+        if rows is None:
+            total = nrows
+            selector = slice(offset, min(offset + limit, total))
+        else:
+            total = len(rows)
+            selector = rows[offset:offset + limit]
+
+        data = {col: np.asarray(store_columns[col][selector]).tolist() for col in columns}
+        records = [dict(zip(columns, values)) for values in zip(*data.values())]
+        return total, records
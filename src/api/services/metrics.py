@@ -0,0 +1,296 @@
+"""
+Metrics
+-------
+Minimal, dependency-free metrics registry rendered in the Prometheus text
+exposition format (served at /metrics).
+
+Collection is meant to stay on under full load: an observation is one
+`bisect` and a few integer increments under a per-series lock, and series
+are keyed by a small, fixed set of label values (stage names and route
+templates, never raw paths). Process and model gauges are computed only
+when /metrics is scraped.
+
+    http_requests_total{method,route,status}     requests by outcome
+    http_request_errors_total{method,route,status}  4xx/5xx responses
+    http_request_duration_seconds{route}         end-to-end latency histogram
+    inference_stage_seconds{route,stage}         parse | validate | features | predict | serialize
+    model_pool_events{event}                     loads / reloads / evictions
+    model_info{model,version} / model_load_seconds{model,version}
+    process_resident_memory_bytes                current RSS
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; dense below 10 ms where single-row inference lives
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}      # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        i = bisect_left(self.buckets, value)      # le-bucket index; len(buckets) is +Inf
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def time(self, *labels) -> "_Timer":
+        """Context manager observing the elapsed wall time of its block."""
+        return _Timer(self, labels)
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for labels, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: tuple):
+        self.histogram, self.labels = histogram, labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class Gauge:
+    """Value computed at scrape time by `collect()` → {label values: value}."""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 collect: Optional[Callable[[], Dict[tuple, float]]] = None):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.collect = collect or (lambda: {})
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        lines += [f"{self.name}{_labels(self.labelnames, k)} {_format_value(v)}"
+                  for k, v in sorted(self.collect().items())]
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics keyed by name: registering a name again replaces the old family in place."""
+
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        # Idempotent across re-imports (uvicorn --reload, rebuilt test apps); Prometheus
+        # rejects an exposition that repeats a metric family
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for m in list(self.metrics.values()) for line in m.render()) + "\n"
+
+
+def resident_memory_bytes() -> int:
+    """Current RSS from /proc (Linux); peak RSS from getrusage elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+# ===============================================================
+# Process-wide registry used by the API
+# ===============================================================
+REGISTRY = MetricsRegistry()
+STARTED = time.time()
+
+REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status.", ("method", "route", "status")))
+ERRORS = REGISTRY.register(Counter(
+    "http_request_errors_total", "HTTP responses with a 4xx/5xx status.", ("method", "route", "status")))
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "End-to-end request latency.", ("route",)))
+STAGE_LATENCY = REGISTRY.register(Histogram(
+    "inference_stage_seconds",
+    "Time per route and inference stage: parse (body + schema), validate (batch rows), features, "
+    "predict (one model call, possibly micro-batched), serialize.", ("route", "stage")))
+REGISTRY.register(Gauge(
+    "process_resident_memory_bytes", "Resident set size of the API process.",
+    collect=lambda: {(): resident_memory_bytes()}))
+REGISTRY.register(Gauge(
+    "process_uptime_seconds", "Seconds since the API process imported its metrics.",
+    collect=lambda: {(): round(time.time() - STARTED, 3)}))
+
+
+def register_model_metrics(registry_stats: Callable[[], dict]) -> None:
+    """Model version / load-time gauges read from the model registry at scrape time."""
+    loaded = lambda: registry_stats()["loaded"]
+    REGISTRY.register(Gauge(
+        "model_info", "Loaded model snapshots (value 1), labelled with their content version.",
+        ("model", "version"), lambda: {(m["name"], m["version"]): 1 for m in loaded()}))
+    REGISTRY.register(Gauge(
+        "model_load_seconds", "Time taken to load each model snapshot.",
+        ("model", "version"), lambda: {(m["name"], m["version"]): m["load_seconds"] for m in loaded()}))
+    REGISTRY.register(Gauge(
+        "model_pool_events", "Model loads, hot reloads and evictions since start.",
+        ("event",), lambda: {(e,): registry_stats()[e] for e in ("loads", "reloads", "evictions")}))
+
+
+# ===============================================================
+# Request instrumentation
+# ===============================================================
+# Route template of the request being served; service code outside a request
+# (bulk scoring, tests) is labelled "internal". Propagates to worker threads
+# started with asyncio.to_thread / Starlette's threadpool.
+_ROUTE: ContextVar[str] = ContextVar("metrics_route", default="internal")
+
+
+def stage_timer(stage: str) -> "_Timer":
+    """Time an inference stage under the route currently being served."""
+    return STAGE_LATENCY.time(_ROUTE.get(), stage)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: counts requests/errors and times each request.
+
+    It also times the two stages that happen outside the endpoint body:
+    "parse" (request start → endpoint entered, i.e. body read and schema
+    validation; for a matched route that rejects the request, e.g. a 422,
+    request start → response started) and "serialize" (endpoint returned →
+    response started). Endpoints mark those points with `endpoint_stages`.
+    """
+
+    def __init__(self, app, skip_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            return await self.app(scope, receive, send)
+
+        state = scope.setdefault("state", {})
+        state["metrics_started"] = started = time.perf_counter()
+        status = 500
+
+        async def send_with_metrics(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                now = time.perf_counter()
+                returned = state.get("metrics_endpoint_returned")
+                if returned is not None:
+                    STAGE_LATENCY.observe(now - returned, _route_template(scope), "serialize")
+                elif "endpoint" in scope and "metrics_endpoint_entered" not in state:
+                    # rejected before the endpoint body ran (body/schema validation)
+                    state["metrics_parse_failed"] = now
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            route = _route_template(scope)
+            parsed = state.get("metrics_endpoint_entered", state.get("metrics_parse_failed"))
+            if parsed is not None:
+                STAGE_LATENCY.observe(parsed - started, route, "parse")
+            labels = (scope["method"], route, str(status))
+            REQUESTS.inc(*labels)
+            if status >= 400:
+                ERRORS.inc(*labels)
+            REQUEST_LATENCY.observe(time.perf_counter() - started, route)
+
+
+def _route_template(scope) -> str:
+    """Matched route with path parameters folded back ("/api/models/{name}"); "unmatched" for 404s."""
+    if "endpoint" not in scope:
+        return "unmatched"
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
+
+
+@contextmanager
+def endpoint_stages(request):
+    """
+    Wrap an endpoint body: marks the end of "parse" on entry and the start of
+    "serialize" on exit, and labels the stages timed inside with the route.
+    """
+    state = request.scope.get("state", {})
+    state["metrics_endpoint_entered"] = time.perf_counter()
+    token = _ROUTE.set(_route_template(request.scope))
+    try:
+        yield
+    finally:
+        _ROUTE.reset(token)
+        state["metrics_endpoint_returned"] = time.perf_counter()
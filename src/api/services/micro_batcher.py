@@ -0,0 +1,122 @@
+"""
+Micro Batcher
+-------------
+Coalesces concurrent single-row prediction requests into one vectorized
+model call.
+
+Requests are collected for a short window (a few milliseconds) or until
+`max_batch_size` rows are waiting, whichever comes first. The batch is then
+scored once in a worker thread and every caller's future is resolved with
+its own probability.
+
+Each row is submitted with a key (the model snapshot it was resolved
+against); rows with different keys are never scored by the same call, so a
+hot reload landing between resolve and flush cannot score a row with a model
+other than the one its caller cached the result under.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+
+# Upper bounds of the batch-size histogram buckets (last bucket is open-ended)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class MicroBatcher:
+    """Asyncio micro-batcher in front of a vectorized `score_fn(X, key) -> probs`."""
+
+    def __init__(self, score_fn: Callable[[np.ndarray, Any], np.ndarray],
+                 max_wait_ms: float = 2.0, max_batch_size: int = 64):
+        self.score_fn = score_fn
+        self.max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self._pending: List[Tuple[np.ndarray, asyncio.Future, float, Any]] = []
+        self._timer = None
+        self._tasks = set()  # keep running batches referenced until done
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.batches = 0
+        self.rows = 0
+        self.batch_size_hist: Dict[str, int] = {
+            **{f"le_{b}": 0 for b in BATCH_SIZE_BUCKETS}, "inf": 0
+        }
+        self.queue_delay_total = 0.0
+        self.queue_delay_max = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch_size > 1 and self.max_wait > 0
+
+    async def submit(self, row: np.ndarray, key: Any = None) -> float:
+        """Queue one feature row and wait for its churn probability, scored with `score_fn(X, key)`."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future, time.perf_counter(), key))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        started = time.perf_counter()
+        self._record(len(batch), [started - queued for _, _, queued, _ in batch])
+
+        # One model call per key (a single group unless a reload landed mid-window)
+        groups: List[Tuple[Any, list]] = []
+        for item in batch:
+            group = next((g for k, g in groups if k is item[3]), None)
+            if group is None:
+                groups.append((item[3], [item]))
+            else:
+                group.append(item)
+
+        for key, items in groups:
+            X = np.vstack([row for row, _, _, _ in items])
+            try:
+                # to_thread keeps the context (metrics route label) of the request that opened the batch
+                probs = await asyncio.to_thread(self.score_fn, X, key)
+            except Exception as e:
+                for _, future, _, _ in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _, _), prob in zip(items, probs):
+                if not future.done():  # caller may have been cancelled meanwhile
+                    future.set_result(float(prob))
+
+    def _record(self, size: int, delays: List[float]):
+        self.batches += 1
+        self.rows += size
+        bucket = next((f"le_{b}" for b in BATCH_SIZE_BUCKETS if size <= b), "inf")
+        self.batch_size_hist[bucket] += 1
+        self.queue_delay_total += sum(delays)
+        self.queue_delay_max = max(self.queue_delay_max, max(delays))
+
+    def stats(self) -> dict:
+        """Counters for batch-size distribution and queueing delay."""
+        return {
+            "window_ms": self.max_wait * 1000.0,
+            "max_batch_size": self.max_batch_size,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "batch_size_histogram": dict(self.batch_size_hist),
+            "queue_delay_ms_mean": 1000.0 * self.queue_delay_total / self.rows if self.rows else 0.0,
+            "queue_delay_ms_max": 1000.0 * self.queue_delay_max,
+        }
@@ -0,0 +1,242 @@
+"""
+Model Registry
+--------------
+Discovers model artifacts under `models/`, loads them lazily on first use and
+keeps them in a bounded, memory-aware pool.
+
+Each loaded model is an immutable `LoadedModel` snapshot. When its file
+changes on disk, a new snapshot is loaded and swapped in atomically; requests
+already holding the old snapshot finish on it undisturbed.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import joblib
+from src.tree_ensemble import TreeEnsemble
+
+MODEL_SUFFIX = ".pkl"
+
+
+class ModelNotFoundError(LookupError):
+    """Raised when no artifact matches the requested model name/version."""
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    name: str
+    version: str
+    path: str
+    model: Any
+    native: Optional[TreeEnsemble]
+    mtime: float
+    size: int
+    load_seconds: float
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "path": self.path,
+            "size_bytes": self.size,
+            "native_trees": self.native is not None,
+            "load_seconds": round(self.load_seconds, 4),
+        }
+
+
+def file_version(path: str) -> str:
+    """Short content hash of an artifact, used as its version."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+class ModelRegistry:
+    """Lazy, hot-reloading pool of models keyed by artifact name (file stem)."""
+
+    def __init__(self, model_dir: str = "models", default_model: str = "best_xgb",
+                 max_models: int = 4, max_bytes: int = 1024 * 1024 * 1024,
+                 native_trees: bool = True, check_interval: float = 2.0):
+        self.model_dir = Path(model_dir)
+        self.default_model = default_model
+        self.max_models = max(int(max_models), 1)
+        self.max_bytes = int(max_bytes)
+        self.native_trees = native_trees
+        self.check_interval = float(check_interval)
+
+        self._pool: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._last_check: Dict[str, float] = {}
+        self._versions: Dict[tuple, str] = {}      # (path, mtime, size) -> version
+        self._lock = threading.Lock()               # guards the pool
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.loads = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------
+    # Discovery
+    # ------------------------------------------------------------
+    def discover(self) -> Dict[str, Path]:
+        """Map of model name → artifact path for every model file in `model_dir`."""
+        if not self.model_dir.exists():
+            return {}
+        return {p.stem: p for p in sorted(self.model_dir.glob(f"*{MODEL_SUFFIX}"))}
+
+    def _version_of(self, path: Path) -> str:
+        stat = path.stat()
+        key = (str(path), stat.st_mtime, stat.st_size)
+        if key not in self._versions:
+            self._versions[key] = file_version(str(path))
+        return self._versions[key]
+
+    def list_models(self) -> List[dict]:
+        """Every discovered artifact with its version and whether it is loaded."""
+        with self._lock:
+            loaded = dict(self._pool)
+        return [
+            {"name": name, "path": str(path), "version": self._version_of(path),
+             "loaded": name in loaded, "default": name == self.default_model}
+            for name, path in self.discover().items()
+        ]
+
+    # ------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------
+    def get(self, name: Optional[str] = None, version: Optional[str] = None) -> LoadedModel:
+        """
+        Return the current snapshot for `name` (default model if None).
+        `version` alone selects whichever artifact currently has that content hash;
+        together with `name` it must match that model's current version.
+        """
+        if name is None and version is not None:
+            name = self._name_for_version(version)
+        name = name or self.default_model
+
+        loaded = self._current(name)
+        if version is not None and not loaded.version.startswith(version):
+            raise ModelNotFoundError(
+                f"Model '{name}' is at version {loaded.version}, not {version}."
+            )
+        return loaded
+
+    def _name_for_version(self, version: str) -> str:
+        for name, path in self.discover().items():
+            if self._version_of(path).startswith(version):
+                return name
+        raise ModelNotFoundError(f"No model artifact with version '{version}'.")
+
+    def _current(self, name: str) -> LoadedModel:
+        with self._lock:
+            loaded = self._pool.get(name)
+            if loaded is not None:
+                self._pool.move_to_end(name)
+
+        if loaded is not None and not self._changed_on_disk(loaded):
+            return loaded
+
+        with self._load_lock(name):
+            # Another thread may have (re)loaded it while we waited
+            with self._lock:
+                current = self._pool.get(name)
+            if current is not None and current is not loaded:
+                return current
+            try:
+                fresh = self._load(name)
+            except (RuntimeError, ModelNotFoundError) as e:
+                if loaded is None:
+                    raise
+                # Half-written or corrupt artifact: keep serving the last good snapshot
+                print(f"⚠️ Reload of model '{name}' failed, keeping {loaded.version}: {e}")
+                return loaded
+            with self._lock:
+                self._pool[name] = fresh
+                self._pool.move_to_end(name)
+                self._evict()
+            if loaded is not None:
+                self.reloads += 1
+                print(f"🔁 Hot-reloaded model '{name}' {loaded.version} → {fresh.version}")
+            return fresh
+
+    def _changed_on_disk(self, loaded: LoadedModel) -> bool:
+        now = time.monotonic()
+        if now - self._last_check.get(loaded.name, 0.0) < self.check_interval:
+            return False
+        self._last_check[loaded.name] = now
+        try:
+            stat = Path(loaded.path).stat()
+        except FileNotFoundError:
+            return False  # keep serving the last good snapshot
+        return (stat.st_mtime, stat.st_size) != (loaded.mtime, loaded.size)
+
+    def _load_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(name, threading.Lock())
+
+    # ------------------------------------------------------------
+    # Loading & eviction
+    # ------------------------------------------------------------
+    def _load(self, name: str) -> LoadedModel:
+        path = self.discover().get(name)
+        if path is None:
+            raise ModelNotFoundError(f"Unknown model '{name}'. Available: {sorted(self.discover())}")
+
+        stat = path.stat()
+        started = time.perf_counter()
+        try:
+            model = joblib.load(path)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load model: {e}")
+        if not hasattr(model, "predict_proba"):
+            raise ModelNotFoundError(f"Artifact '{name}' is not a probabilistic classifier.")
+
+        native = None
+        if self.native_trees:
+            try:
+                native = TreeEnsemble.from_model(model)
+            except (AttributeError, ValueError):
+                native = None
+
+        loaded = LoadedModel(
+            name=name,
+            version=self._version_of(path),
+            path=str(path),
+            model=model,
+            native=native,
+            mtime=stat.st_mtime,
+            size=stat.st_size,
+            load_seconds=time.perf_counter() - started,
+        )
+        self._last_check[name] = time.monotonic()
+        self.loads += 1
+        print(f"✅ Model '{name}' ({loaded.version}) loaded from {path} in {loaded.load_seconds:.2f}s")
+        return loaded
+
+    def _evict(self) -> None:
+        """Drop least-recently-used models beyond the count/byte budget (caller holds the lock)."""
+        while len(self._pool) > 1 and (
+            len(self._pool) > self.max_models
+            or sum(m.size for m in self._pool.values()) > self.max_bytes
+        ):
+            name, _ = self._pool.popitem(last=False)
+            self.evictions += 1
+            print(f"♻️ Evicted model '{name}' from the pool")
+
+    def stats(self) -> dict:
+        with self._lock:
+            pool = [m.describe() for m in self._pool.values()]
+        return {
+            "default_model": self.default_model,
+            "loaded": pool,
+            "loaded_bytes": sum(m["size_bytes"] for m in pool),
+            "max_models": self.max_models,
+            "max_bytes": self.max_bytes,
+            "loads": self.loads,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,84 @@
+"""
+Prediction Cache
+----------------
+Bounded in-process LRU cache with TTL for single-row predictions.
+
+Entries are keyed by a canonical hash of the feature vector plus the model
+version, so a new model file never serves results computed by the old one.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+import numpy as np
+
+
+class PredictionCache:
+    """Thread-safe LRU + TTL cache. `maxsize=0` disables caching."""
+
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 300.0):
+        self.maxsize = max(int(maxsize), 0)
+        self.ttl = float(ttl_seconds)
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @staticmethod
+    def make_key(row: np.ndarray, model_version: str) -> str:
+        """Canonical fingerprint of one feature row (float64, -0.0 folded into 0.0)."""
+        canonical = np.ascontiguousarray(row, dtype=np.float64) + 0.0
+        digest = hashlib.blake2b(canonical.tobytes(), digest_size=16)
+        digest.update(model_version.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
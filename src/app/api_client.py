@@ -0,0 +1,114 @@
+# src/app/api_client.py
+"""
+🔌 API Client for the Telco Customer Churn Dashboard
+-----------------------------------------------------
+One `requests.Session` per API base URL with a pooled, keep-alive
+connection adapter, (connect, read) timeouts and bounded retries with
+exponential backoff on connection errors and 429/502/503/504 responses.
+Scoring is a pure function of the payload, so retrying a POST is safe.
+
+The Streamlit app keeps a single client across reruns (`st.cache_resource`);
+bulk scoring splits a DataFrame into `/api/predict/batch` calls, keeps a
+few of them in flight on the shared pool and reports progress per batch.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config import (
+    API_CONNECT_TIMEOUT,
+    API_MAX_RETRIES,
+    API_POOL_SIZE,
+    API_READ_TIMEOUT,
+    UPLOAD_BATCH_SIZE,
+)
+
+RESULT_COLUMNS = ["churn_probability", "prediction", "error"]
+
+
+class APIError(Exception):
+    """The API answered with an error status (after retries)."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class ChurnAPIClient:
+    """
+    Pooled client for the churn API.
+
+    Args:
+        predict_url (str): The single-prediction endpoint, e.g.
+            http://telco-api:8000/api/predict; the batch endpoint is `<predict_url>/batch`.
+        timeout (tuple): (connect, read) timeouts in seconds.
+        retries (int): Retries per request on connection errors and 429/5xx gateway responses.
+        pool_size (int): Keep-alive connections kept per host.
+    """
+
+    def __init__(self, predict_url: str, timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT),
+                 retries: int = API_MAX_RETRIES, pool_size: int = API_POOL_SIZE):
+        self.predict_url = predict_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        retry = Retry(total=retries, connect=retries, read=retries, backoff_factor=0.3,
+                      status_forcelist=(429, 502, 503, 504), allowed_methods=None,
+                      raise_on_status=False, respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, url: str, payload: Any) -> dict:
+        response = self.session.post(url, json=payload, timeout=self.timeout)
+        if response.status_code != 200:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise APIError(response.status_code, str(detail))
+        return response.json()
+
+    def predict(self, features: Dict[str, Any]) -> dict:
+        """Score one customer: {"churn_probability", "prediction"}."""
+        return self._post(self.predict_url, features)
+
+    def predict_batch(self, records: List[Dict[str, Any]]) -> dict:
+        """Score records in one call: {"count", "failed", "results": [...]} in input order."""
+        return self._post(f"{self.predict_url}/batch", {"records": records})
+
+    def score_frame(self, df: pd.DataFrame, columns: Optional[List[str]] = None,
+                    batch_size: int = UPLOAD_BATCH_SIZE, concurrency: Optional[int] = None,
+                    on_progress: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        """
+        Score every row of `df` through the batch endpoint.
+
+        Only `columns` (default: all) are sent. Returns `df` with
+        churn_probability, prediction and error columns;
+        `on_progress(rows_done, rows_total)` is called after each batch.
+        """
+        features = df[columns] if columns else df
+        records = features.astype(object).where(features.notna(), None).to_dict("records")
+        batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+        results, done = [], 0
+        workers = max(1, min(concurrency or self.pool_size // 2, len(batches)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map keeps batch order; later batches are already in flight while earlier ones finish
+            for batch, response in zip(batches, pool.map(self.predict_batch, batches)):
+                results.extend(response["results"])
+                done += len(batch)
+                if on_progress:
+                    on_progress(done, len(records))
+
+        scored = pd.DataFrame(results, columns=["index", *RESULT_COLUMNS]).drop(columns="index")
+        scored["churn_probability"] = scored["churn_probability"].astype(float)
+        return pd.concat([df.reset_index(drop=True), scored], axis=1)
+
+    def close(self):
+        self.session.close()
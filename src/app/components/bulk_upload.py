@@ -0,0 +1,55 @@
+# src/app/components/bulk_upload.py
+"""
+📤 Bulk Upload Component for Telco Customer Churn Dashboard
+------------------------------------------------------------
+Upload a customer CSV, score it through the API's batch endpoint with a
+progress bar, and download the scored file. Rows that fail validation are
+kept with their error message instead of failing the whole upload.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from src.api.schemas.churn_schema import FEATURE_COLUMNS
+from src.app.api_client import APIError
+
+
+def display_bulk_upload(client):
+    """CSV upload → batched scoring → preview and download of the results."""
+    uploaded = st.file_uploader("Upload a customer CSV", type=["csv"], key="bulk_csv")
+    if uploaded is None:
+        st.caption(f"Expected columns: {', '.join(FEATURE_COLUMNS)} (extra columns such as customerID are kept).")
+        return
+
+    df = pd.read_csv(uploaded)
+    missing = [c for c in FEATURE_COLUMNS if c not in df.columns]
+    if missing:
+        st.error(f"❌ Missing columns: {', '.join(missing)}")
+        return
+    st.write(f"📄 {len(df):,} customers loaded from **{uploaded.name}**")
+
+    # Scored results survive reruns (e.g. clicking download) until a new file is uploaded
+    state_key = f"bulk_scored_{uploaded.file_id}"
+    if state_key not in st.session_state and st.button("🚀 Score uploaded customers"):
+        progress = st.progress(0.0, text="Scoring...")
+        try:
+            st.session_state[state_key] = client.score_frame(
+                df, FEATURE_COLUMNS, on_progress=lambda done, total: progress.progress(done / total, text=f"Scored {done:,} / {total:,}"))
+        except APIError as e:
+            st.error(f"❌ API Error: {e.detail}")
+            return
+        except Exception as e:
+            st.error(f"🚫 Connection failed: {e}")
+            return
+
+    scored = st.session_state.get(state_key)
+    if scored is None:
+        return
+    failed = int(scored["error"].notna().sum())
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Scored", f"{len(scored) - failed:,}")
+    col2.metric("Failed", f"{failed:,}")
+    col3.metric("Predicted churners", f"{(scored['prediction'] == 'Churn').sum():,}")
+    st.dataframe(scored.head(100), use_container_width=True)
+    st.download_button("⬇️ Download scored CSV", scored.to_csv(index=False).encode("utf-8"),
+                       file_name=f"{uploaded.name.rsplit('.', 1)[0]}_scored.csv", mime="text/csv")
@@ -2,44 +2,92 @@
 """
 📊 Charts Component for Telco Customer Churn Dashboard
 -------------------------------------------------------
-This module automatically loads and displays all EDA result images
-from the reports/eda_results folder, ensuring compatibility both
-locally and inside Docker containers.
+This module displays the EDA result images listed in the report manifest
+(reports/eda_results/manifest.json, written by `src.eda.report_generator`),
+ensuring compatibility both locally and inside Docker containers.
+
+Thumbnails are shown in a grid; a figure's full-resolution file is read
+only when its toggle is switched on. Without a manifest (report not built
+yet) the full-resolution figures in the folder are shown directly. The manifest is re-read only when the
+file changes, and image bytes are cached by content hash, so reruns of the
+app do not touch the disk.
 """
 
-import streamlit as st
+import json
 from pathlib import Path
 
+import streamlit as st
 
-def display_eda_charts():
-    """
-    Automatically load and display all EDA result images 
-    from /app/reports/eda_results (in Docker) or reports/eda_results (locally).
-    """
+MANIFEST_NAME = "manifest.json"
+GRID_COLUMNS = 2
+IMAGE_EXTENSIONS = (".png", ".jpg", ".svg", ".pdf")
 
-    # --- Determine base directory ---
+
+def _eda_dir():
     # When running in Docker, /app is the WORKDIR
     possible_paths = [
         Path("/app/reports/eda_results"),   # Docker path
         Path("reports/eda_results")         # Local dev path
     ]
+    return next((p for p in possible_paths if p.exists()), None)
+
 
-    # Choose the first existing directory
-    eda_dir = next((p for p in possible_paths if p.exists()), None)
+@st.cache_data(show_spinner=False)
+def _load_manifest(path: str, mtime_ns: int) -> dict:
+    """Parsed manifest; `mtime_ns` is part of the cache key so a rebuilt report is picked up."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
 
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _read_image(path: str, manifest_hash: str) -> bytes:
+    """Image bytes, cached until the report manifest hash changes."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _figures_without_manifest(eda_dir: Path) -> dict:
+    """Full-resolution figures straight from the folder when the manifest has not been built."""
+    files = sorted(p for p in eda_dir.iterdir() if p.suffix in IMAGE_EXTENSIONS)
+    signature = ",".join(f"{p.name}:{p.stat().st_mtime_ns}" for p in files)
+    return {"hash": signature,
+            "images": [{"file": p.name, "thumb": p.name, "bytes": p.stat().st_size,
+                        "caption": p.stem.replace("_", " ").title()} for p in files]}
+
+
+def display_eda_charts():
+    """
+    Display all EDA result images from /app/reports/eda_results (in Docker)
+    or reports/eda_results (locally), as listed in the report manifest
+    (or every figure in the folder when there is no manifest yet).
+    """
+    eda_dir = _eda_dir()
     if not eda_dir:
         st.error("❌ EDA results folder not found. Expected at /app/reports/eda_results or reports/eda_results.")
         return
 
-    # --- Find and display all .png images ---
-    img_files = sorted(eda_dir.glob("*.png"))
-    if not img_files:
+    manifest_path = eda_dir / MANIFEST_NAME
+    if manifest_path.exists():
+        manifest = _load_manifest(str(manifest_path), manifest_path.stat().st_mtime_ns)
+    else:
+        manifest = _figures_without_manifest(eda_dir)
+    if not manifest["images"]:
         st.warning("⚠️ No EDA plots found in reports/eda_results.")
         return
 
     st.markdown("### 🔍 Exploratory Data Analysis Results")
 
-    for img_path in img_files:
-        # Generate readable caption from file name
-        caption = img_path.stem.replace("_", " ").title()
-        st.image(str(img_path), caption=caption, use_container_width=True)
+    columns = st.columns(GRID_COLUMNS)
+    for i, entry in enumerate(manifest["images"]):
+        with columns[i % GRID_COLUMNS]:
+            if entry["file"].endswith(".pdf"):   # FIGURE_FORMAT=pdf: offer the file instead of an image
+                st.caption(entry["caption"])
+                st.download_button(f"📄 Download PDF ({entry['bytes'] / 1024:.0f} KB)",
+                                   _read_image(str(eda_dir / entry["file"]), manifest["hash"]),
+                                   file_name=entry["file"], mime="application/pdf", key=f"eda_pdf_{entry['file']}")
+                continue
+            st.image(_read_image(str(eda_dir / entry["thumb"]), manifest["hash"]),
+                     caption=entry["caption"], use_container_width=True)
+            has_thumb = entry["thumb"] != entry["file"]
+            if has_thumb and st.toggle(f"Full resolution ({entry['bytes'] / 1024:.0f} KB)", key=f"eda_full_{entry['file']}"):
+                st.image(_read_image(str(eda_dir / entry["file"]), manifest["hash"]), use_container_width=True)
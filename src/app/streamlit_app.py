@@ -1,7 +1,8 @@
 # src/app/streamlit_app.py
 import streamlit as st
-import requests
 import os
+from src.app.api_client import APIError, ChurnAPIClient
+from src.app.components.bulk_upload import display_bulk_upload
 from src.app.components.charts import display_eda_charts
 from src.app.components.layout import set_page_style
 
@@ -26,6 +27,15 @@ st.markdown(
 API_URL = os.getenv("API_URL", "http://telco-api:8000/api/predict")
 
 
+@st.cache_resource
+def get_api_client(predict_url: str) -> ChurnAPIClient:
+    """One pooled keep-alive client per server process, shared by all reruns and sessions."""
+    return ChurnAPIClient(predict_url)
+
+
+client = get_api_client(API_URL)
+
+
 # ===============================
 # SIDEBAR INPUT FORM
 # ===============================
@@ -73,34 +83,39 @@ input_data = {
 # ===============================
 if st.button("🔮 Predict Churn"):
     try:
-        response = requests.post(API_URL, json=input_data)
-        if response.status_code == 200:
-            result = response.json()
-
-            # Support both naming conventions from backend:
-            # Prefer 'churn_probability', fallback to 'probability'
-            prob = result.get("churn_probability", result.get("probability"))
-            prediction = result.get("prediction", "Unknown")
-
-            st.success(f"Prediction: **{prediction}**")
-
-            # If probability exists, display it as a percentage
-            if prob is not None:
-                try:
-                    prob = float(prob)
-                    if prob > 1:  # Convert from 0–100 scale if necessary
-                        prob = prob / 100.0
-                    st.metric(label="Churn Probability", value=f"{prob:.2%}")
-                except Exception:
-                    st.warning("⚠️ Churn probability format is invalid.")
-            else:
-                st.warning("⚠️ Churn probability not available.")
+        result = client.predict(input_data)
+        # Support both naming conventions from backend:
+        # Prefer 'churn_probability', fallback to 'probability'
+        prob = result.get("churn_probability", result.get("probability"))
+        prediction = result.get("prediction", "Unknown")
+
+        st.success(f"Prediction: **{prediction}**")
+
+        # If probability exists, display it as a percentage
+        if prob is not None:
+            try:
+                prob = float(prob)
+                if prob > 1:  # Convert from 0–100 scale if necessary
+                    prob = prob / 100.0
+                st.metric(label="Churn Probability", value=f"{prob:.2%}")
+            except Exception:
+                st.warning("⚠️ Churn probability format is invalid.")
         else:
-            st.error(f"❌ API Error: {response.text}")
+            st.warning("⚠️ Churn probability not available.")
+    except APIError as e:
+        st.error(f"❌ API Error: {e.detail}")
     except Exception as e:
         st.error(f"🚫 Connection failed: {e}")
 
 
+# ===============================
+# BULK SCORING SECTION
+# ===============================
+st.markdown("---")
+st.subheader("📤 Bulk Scoring")
+display_bulk_upload(client)
+
+
 # ===============================
 # EDA VISUALIZATION SECTION
 # ===============================
@@ -0,0 +1,323 @@
+"""
+benchmark.py
+------------
+Load-testing and latency benchmark for the churn API.
+
+Runs `src.api.main:app` in-process (httpx ASGI transport, no network), starts
+a local uvicorn server, or targets an already running URL, then replays
+payloads at a fixed concurrency (closed loop: each worker sends its next
+request as soon as the previous one returns) and reports throughput and
+p50/p95/p99 latency.
+
+Payloads come from a JSONL file (one `CustomerFeatures` body per line, e.g.
+a request log) or are sampled from the processed dataset, one distinct row per
+request so the prediction cache cannot hide model latency; the result records
+the server's cache hit rate during the measured phase. Results are saved
+as JSON baselines; `--compare` checks a run against a saved baseline and
+exits with status 1 on a regression beyond the tolerance.
+
+Run with:
+    python -m src.benchmark --requests 2000 --concurrency 16 --save reports/benchmarks/predict_c16.json
+    python -m src.benchmark --serve --endpoint batch --batch-size 100 --compare reports/benchmarks/batch.json
+    python -m src.benchmark --url http://localhost:8000 --payloads logs/requests.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from itertools import cycle
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+from src.api.schemas.churn_schema import FEATURE_COLUMNS
+
+PROCESSED_DATA_PATH = "data/processed/telco_processed.csv"
+BASELINE_DIR = "reports/benchmarks"
+ENDPOINTS = {"predict": "/api/predict", "batch": "/api/predict/batch"}
+PERCENTILES = (50, 90, 95, 99)
+TOLERANCE = 0.20    # allowed relative slowdown before a run counts as a regression
+
+
+# ============================================================
+# 1. Payloads
+# ============================================================
+def load_payloads(path: Optional[str] = None, n: int = 1000, seed: int = 42) -> List[dict]:
+    """
+    Request bodies for /api/predict: every line of a JSONL file, or `n`
+    rows sampled from the processed dataset. Sampled rows are made distinct
+    (a sub-cent TotalCharges offset per row, also past the dataset size, plus
+    a random per-call shift so repeated runs against one server differ too),
+    so the prediction cache does not hide model latency.
+    """
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    df = pd.read_csv(PROCESSED_DATA_PATH, usecols=FEATURE_COLUMNS)[FEATURE_COLUMNS]
+    df = df.sample(n=n, replace=n > len(df), random_state=seed).reset_index(drop=True)
+    df["TotalCharges"] = df["TotalCharges"] + (np.arange(n) + np.random.default_rng().random()) * 1e-4
+    return json.loads(df.to_json(orient="records", double_precision=15))
+
+
+def _bodies(payloads: List[dict], endpoint: str, batch_size: int):
+    if endpoint == "batch":
+        stream = cycle(payloads)
+        return cycle([{"records": [next(stream) for _ in range(batch_size)]}
+                      for _ in range(max(1, len(payloads) // batch_size))])
+    return cycle(payloads)
+
+
+# ============================================================
+# 2. Targets
+# ============================================================
+def inprocess_client(concurrency: int) -> httpx.AsyncClient:
+    from src.api.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+
+def url_client(url: str, concurrency: int) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return httpx.AsyncClient(base_url=url.rstrip("/"), limits=limits, timeout=30.0)
+
+
+class LocalServer:
+    """`uvicorn src.api.main:app` in a child process on a free local port."""
+
+    def __init__(self, workers: int = 1):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.workers = workers
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.api.main:app", "--host", "127.0.0.1",
+             "--port", str(self.port), "--workers", str(self.workers), "--log-level", "warning"])
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{self.url}/api/healthcheck", timeout=1).status_code == 200:
+                    return self
+            except httpx.TransportError:
+                time.sleep(0.2)
+        self.process.terminate()
+        raise RuntimeError("uvicorn did not become healthy within 60s")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait(timeout=10)
+
+
+# ============================================================
+# 3. Load generation
+# ============================================================
+async def _drive(client: httpx.AsyncClient, path: str, bodies, n_requests: int,
+                 concurrency: int, duration: Optional[float]):
+    latencies, statuses = [], {}
+    remaining = n_requests
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0 and (deadline is None or time.perf_counter() < deadline):
+            remaining -= 1
+            body = next(bodies)
+            started = time.perf_counter()
+            try:
+                status = (await client.post(path, json=body)).status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return np.asarray(latencies), statuses, time.perf_counter() - started
+
+
+async def _run(client, endpoint, payloads, n_requests, concurrency, warmup, duration, batch_size):
+    path = ENDPOINTS[endpoint]
+    bodies = _bodies(payloads, endpoint, batch_size)
+    async with client:
+        if warmup:
+            await _drive(client, path, bodies, warmup, min(concurrency, warmup), None)
+        before = await _server_stats(client)
+        latencies, statuses, elapsed = await _drive(client, path, bodies, n_requests, concurrency, duration)
+        after = await _server_stats(client)
+    cache = None
+    if before and after:
+        hits = after["cache"]["hits"] - before["cache"]["hits"]
+        misses = after["cache"]["misses"] - before["cache"]["misses"]
+        cache = {"hits": hits, "misses": misses,
+                 "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0}
+    return latencies, statuses, elapsed, (after or {}).get("model_version"), cache
+
+
+async def _server_stats(client: httpx.AsyncClient) -> Optional[dict]:
+    response = await client.get("/api/predict/stats")
+    return response.json() if response.status_code == 200 else None
+
+
+def summarize(latencies: np.ndarray, statuses: Dict, elapsed: float) -> dict:
+    if not len(latencies):
+        raise ValueError("No requests completed; increase --duration or --requests.")
+    ok = sum(n for s, n in statuses.items() if s == 200)
+    ms = latencies * 1000
+    return {
+        "requests": int(len(latencies)),
+        "errors": int(len(latencies) - ok),
+        "status_counts": {str(s): n for s, n in sorted(statuses.items(), key=str)},
+        "duration_s": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {"mean": round(float(ms.mean()), 3), "max": round(float(ms.max()), 3),
+                       **{f"p{q}": round(float(np.percentile(ms, q)), 3) for q in PERCENTILES}},
+    }
+
+
+def run_benchmark(target: str = "inprocess", url: Optional[str] = None, endpoint: str = "predict",
+                  payloads: Optional[List[dict]] = None, n_requests: int = 1000, concurrency: int = 8,
+                  warmup: int = 20, duration: Optional[float] = None, batch_size: int = 100,
+                  server_workers: int = 1, name: Optional[str] = None) -> dict:
+    """
+    Run one benchmark and return its result document.
+
+    Args:
+        target (str): "inprocess" (ASGI transport), "serve" (local uvicorn) or "url".
+        url (str): Base URL for target="url".
+        endpoint (str): "predict" (one customer per request) or "batch" (`batch_size` per request).
+        n_requests (int): Measured requests (after `warmup`); `duration` caps the run in seconds.
+    """
+    rows_per_request = batch_size if endpoint == "batch" else 1
+    payloads = payloads or load_payloads(n=(warmup + n_requests) * rows_per_request)
+
+    def execute(client):
+        return asyncio.run(_run(client, endpoint, payloads, n_requests, concurrency, warmup, duration, batch_size))
+
+    if target == "inprocess":
+        latencies, statuses, elapsed, version, cache = execute(inprocess_client(concurrency))
+    elif target == "serve":
+        with LocalServer(server_workers) as server:
+            latencies, statuses, elapsed, version, cache = execute(url_client(server.url, concurrency))
+    elif target == "url":
+        latencies, statuses, elapsed, version, cache = execute(url_client(url, concurrency))
+    else:
+        raise ValueError(f"Unknown target: {target}")
+
+    result = {
+        "name": name or f"{endpoint}_c{concurrency}",
+        "target": target if target != "url" else url,
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "batch_size": batch_size if endpoint == "batch" else 1,
+        **summarize(latencies, statuses, elapsed),
+        "model_version": version,
+        "distinct_payloads": len(payloads),
+        "cache": cache,
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+    result["rows_per_s"] = round(result["throughput_rps"] * result["batch_size"], 2)
+    return result
+
+
+# ============================================================
+# 4. Baselines
+# ============================================================
+def save_baseline(result: dict, path: str) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"✅ Benchmark baseline saved to {path}")
+    return path
+
+
+def compare_to_baseline(result: dict, baseline: dict, tolerance: float = TOLERANCE) -> List[str]:
+    """Regressions of `result` against `baseline`: slower percentiles, lower throughput, more errors."""
+    regressions = []
+    for key in ("p50", "p95", "p99"):
+        old, new = baseline["latency_ms"][key], result["latency_ms"][key]
+        if new > old * (1 + tolerance):
+            regressions.append(f"{key} latency {old:.2f} → {new:.2f} ms (+{(new / old - 1):.0%})")
+    old, new = baseline["throughput_rps"], result["throughput_rps"]
+    if new < old * (1 - tolerance):
+        regressions.append(f"throughput {old:.1f} → {new:.1f} req/s ({(new / old - 1):.0%})")
+    old_rate = baseline["errors"] / max(baseline["requests"], 1)
+    new_rate = result["errors"] / max(result["requests"], 1)
+    if new_rate > old_rate:
+        regressions.append(f"error rate {old_rate:.2%} → {new_rate:.2%}")
+    return regressions
+
+
+def print_report(result: dict):
+    lat = result["latency_ms"]
+    print(f"\n📊 {result['name']} — {result['endpoint']} via {result['target']}, "
+          f"concurrency {result['concurrency']}, batch {result['batch_size']}")
+    print(f"   {result['requests']} requests in {result['duration_s']:.2f}s → "
+          f"{result['throughput_rps']:.1f} req/s ({result['rows_per_s']:.0f} rows/s), {result['errors']} errors")
+    print(f"   latency ms: p50 {lat['p50']:.2f} | p95 {lat['p95']:.2f} | p99 {lat['p99']:.2f} | max {lat['max']:.2f}")
+    if result["cache"] and result["cache"]["hits"]:
+        print(f"⚠️ Prediction cache hit rate {result['cache']['hit_rate']:.0%}: latencies partly measure cache "
+              f"hits ({result['distinct_payloads']} distinct payloads)")
+
+
+# ============================================================
+# 5. CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Churn API load test and latency benchmark")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--serve", action="store_true", help="Start a local uvicorn server for the run")
+    target.add_argument("--url", help="Benchmark an already running API at this base URL")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn workers with --serve")
+    parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="predict")
+    parser.add_argument("--payloads", help="JSONL file with one /api/predict body per line")
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=100, help="Records per request for --endpoint batch")
+    parser.add_argument("--name", help="Result name (default: <endpoint>_c<concurrency>)")
+    parser.add_argument("--save", nargs="?", const="", default=None,
+                        help=f"Save the result as a baseline (default path: {BASELINE_DIR}/<name>.json)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    try:
+        result = run_benchmark(
+            target="serve" if args.serve else "url" if args.url else "inprocess", url=args.url,
+            endpoint=args.endpoint, payloads=load_payloads(args.payloads) if args.payloads else None,
+            n_requests=args.requests,
+            concurrency=args.concurrency, warmup=args.warmup, duration=args.duration,
+            batch_size=args.batch_size, server_workers=args.server_workers, name=args.name)
+    except ValueError as e:
+        parser.error(str(e))
+    print_report(result)
+
+    if args.save is not None:
+        save_baseline(result, args.save or os.path.join(BASELINE_DIR, f"{result['name']}.json"))
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for key in ("endpoint", "concurrency", "batch_size"):
+            if baseline.get(key) != result[key]:
+                print(f"⚠️ Baseline {key} is {baseline.get(key)!r}, this run used {result[key]!r}")
+        regressions = compare_to_baseline(result, baseline, args.tolerance)
+        if regressions:
+            print("❌ Regression vs baseline:\n   " + "\n   ".join(regressions))
+            sys.exit(1)
+        print(f"✅ Within {args.tolerance:.0%} of baseline {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
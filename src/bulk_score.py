@@ -0,0 +1,200 @@
+"""
+bulk_score.py
+-------------
+Streaming bulk scoring for customer files larger than memory.
+
+Input is read in bounded-size chunks (CSV in the raw `Telco-Customer-Churn.csv`
+layout or already-encoded, or JSONL request logs with one `CustomerFeatures`
+payload per line). Each chunk is cleaned, encoded, scored with one vectorized
+`predict_proba` call and written out immediately, so memory use stays flat
+whatever the input size.
+
+Run with:
+    python -m src.bulk_score data/raw/Telco-Customer-Churn.csv scores.csv --chunksize 50000
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from functools import lru_cache
+from typing import Callable, IO, Iterator, Optional
+import joblib
+import numpy as np
+import pandas as pd
+from src.api.schemas.churn_schema import FEATURE_COLUMNS
+from src.encoder import CategoricalEncoder, ENCODER_PATH
+from src.preprocess import fill_total_charges, fit_encoder_in_chunks
+
+RAW_DATA_PATH = "data/raw/Telco-Customer-Churn.csv"
+MODEL_PATH = "models/best_xgb.pkl"
+ID_COLUMN = "customerID"
+DEFAULT_CHUNKSIZE = 50_000
+THRESHOLD = 0.5
+
+
+# ============================================================
+# 1. Categorical encoder (fitted artifact saved next to the model)
+# ============================================================
+@lru_cache(maxsize=4)
+def load_encoder(encoder_path: str = ENCODER_PATH,
+                 reference_path: str = RAW_DATA_PATH) -> CategoricalEncoder:
+    """
+    Load the persisted encoder; if it has not been exported yet, fit one
+    chunk by chunk on the training data. Unseen categories map to NaN.
+    """
+    if os.path.exists(encoder_path):
+        return CategoricalEncoder.load(encoder_path, handle_unknown="missing")
+    print(f"⚠️ {encoder_path} not found — fitting categories from {reference_path}")
+    encoder = fit_encoder_in_chunks(reference_path)
+    encoder.handle_unknown = "missing"
+    return encoder
+
+
+# ============================================================
+# 2. Chunk reading & preparation
+# ============================================================
+def detect_format(path: str) -> str:
+    """'jsonl' for .jsonl/.ndjson/.json files, otherwise 'csv'."""
+    return "jsonl" if str(path).lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def iter_chunks(source, fmt: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most `chunksize` rows from a path or file object."""
+    if fmt == "jsonl":
+        reader = pd.read_json(source, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        reader = pd.read_csv(source, chunksize=chunksize)
+    with reader:
+        yield from reader
+
+
+def prepare_chunk(chunk: pd.DataFrame, state: dict, encoder: CategoricalEncoder) -> np.ndarray:
+    """
+    Clean and encode one chunk into a float64 matrix in model column order.
+
+    `state` carries the last valid TotalCharges across chunk boundaries so the
+    forward-fill of blank values matches `clean_total_charges`. Unknown
+    categories become NaN, which XGBoost routes along its missing-value branch.
+    """
+    missing = [c for c in FEATURE_COLUMNS if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {missing}")
+
+    df = chunk[FEATURE_COLUMNS].copy()
+
+    total = df["TotalCharges"]
+    if not pd.api.types.is_numeric_dtype(total):
+        total = total.astype(str)
+    df["TotalCharges"] = fill_total_charges(total, state)
+
+    for col in FEATURE_COLUMNS:
+        if col in encoder and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = encoder.encode_column(col, df[col].to_numpy(dtype=object))
+
+    return np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+
+
+# ============================================================
+# 3. Streaming scorer
+# ============================================================
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def iter_scored_chunks(source, fmt: str, score_fn: Callable[[np.ndarray], np.ndarray],
+                       chunksize: int = DEFAULT_CHUNKSIZE,
+                       reference_path: str = RAW_DATA_PATH) -> Iterator[pd.DataFrame]:
+    """Yield one result frame (row, [customerID], churn_probability, prediction) per chunk."""
+    encoder = load_encoder(reference_path=reference_path)
+    state, offset = {}, 0
+    for chunk in iter_chunks(source, fmt, chunksize):
+        probs = score_fn(prepare_chunk(chunk, state, encoder))
+        out = pd.DataFrame({"row": np.arange(offset, offset + len(chunk))})
+        if ID_COLUMN in chunk.columns:
+            out[ID_COLUMN] = chunk[ID_COLUMN].to_numpy()
+        out["churn_probability"] = np.round(probs.astype(np.float64), 3)
+        out["prediction"] = np.where(probs >= THRESHOLD, "Churn", "No Churn")
+        offset += len(chunk)
+        yield out
+
+
+def iter_ndjson(source, fmt: str, score_fn: Callable[[np.ndarray], np.ndarray],
+                chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[str]:
+    """
+    NDJSON lines for HTTP streaming; the final line carries the run summary.
+    Errors raised after streaming has started are reported as an `error` line.
+    """
+    started, rows = time.perf_counter(), 0
+    try:
+        for out in iter_scored_chunks(source, fmt, score_fn, chunksize):
+            rows += len(out)
+            yield _to_ndjson(out)
+    except Exception as e:
+        yield json.dumps({"error": str(e), "rows_scored": rows}) + "\n"
+        return
+    yield json.dumps({"summary": _summary(rows, time.perf_counter() - started)}) + "\n"
+
+
+def _summary(rows: int, seconds: float) -> dict:
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def score_file(input_path: str, output_path: str, model_path: str = MODEL_PATH,
+               chunksize: int = DEFAULT_CHUNKSIZE, model=None) -> dict:
+    """
+    Score `input_path` chunk by chunk and stream results to `output_path`
+    (CSV, or NDJSON if the output ends with .jsonl/.ndjson/.json).
+
+    Returns:
+        dict: rows, seconds, rows_per_second, peak_rss_mb
+    """
+    model = model if model is not None else joblib.load(model_path)
+    score_fn = lambda X: model.predict_proba(X)[:, 1]
+    out_fmt = detect_format(output_path)
+
+    started, rows = time.perf_counter(), 0
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        for i, out in enumerate(iter_scored_chunks(input_path, detect_format(input_path), score_fn, chunksize)):
+            _write_chunk(out, f, out_fmt, header=(i == 0))
+            rows += len(out)
+
+    summary = _summary(rows, time.perf_counter() - started)
+    print(f"✅ Scored {summary['rows']} rows in {summary['seconds']}s "
+          f"({summary['rows_per_second']} rows/s, peak RSS {summary['peak_rss_mb']} MB) → {output_path}")
+    return summary
+
+
+def _to_ndjson(out: pd.DataFrame) -> str:
+    text = out.to_json(orient="records", lines=True)
+    return text if text.endswith("\n") else text + "\n"
+
+
+def _write_chunk(out: pd.DataFrame, f: IO[str], fmt: str, header: bool) -> None:
+    if fmt == "jsonl":
+        f.write(_to_ndjson(out))
+    else:
+        out.to_csv(f, index=False, header=header)
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Stream-score a customer CSV/JSONL file.")
+    parser.add_argument("input", help="CSV (raw or encoded Telco layout) or JSONL file")
+    parser.add_argument("output", help="Output .csv or .jsonl path")
+    parser.add_argument("--model", default=MODEL_PATH, help="Model artifact to score with")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk")
+    args = parser.parse_args(argv)
+    score_file(args.input, args.output, args.model, args.chunksize)
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,38 @@ MODEL_PARAMS = {
 # ====== API Settings ======
 FASTAPI_PORT = 8000
 STREAMLIT_PORT = 8501
+BATCH_MAX_RECORDS = 50_000   # upper bound for /api/predict/batch
+
+# Micro-batching of concurrent /api/predict calls (window 0 or size 1 disables it)
+MICROBATCH_WINDOW_MS = float(os.getenv("MICROBATCH_WINDOW_MS", "2"))
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "64"))
+
+# Native NumPy tree evaluation (src/tree_ensemble.py) for small batches;
+# larger batches go to XGBoost's multi-threaded predict_proba.
+NATIVE_TREES = os.getenv("NATIVE_TREES", "1") == "1"
+NATIVE_TREES_MAX_ROWS = int(os.getenv("NATIVE_TREES_MAX_ROWS", "256"))
+
+# Model registry: artifacts under the serving model's folder are loaded lazily,
+# pooled within the count/size budget and hot-reloaded when their file changes
+SERVING_MODEL_PATH = os.getenv("MODEL_PATH", "models/best_xgb.pkl")
+MODEL_POOL_MAX_MODELS = int(os.getenv("MODEL_POOL_MAX_MODELS", "4"))
+MODEL_POOL_MAX_MB = int(os.getenv("MODEL_POOL_MAX_MB", "1024"))
+MODEL_RELOAD_CHECK_SECONDS = float(os.getenv("MODEL_RELOAD_CHECK_SECONDS", "2"))
+
+# Fitted category tables used to encode raw string values at serving time
+SERVING_ENCODER_PATH = os.getenv("ENCODER_PATH", "models/categorical_encoder.joblib")
+
+# LRU + TTL cache in front of single-row predictions (size 0 disables it)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "300"))
+
+# Dashboard → API client: pooled keep-alive connections, (connect, read)
+# timeouts in seconds and bounded retries with exponential backoff
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3"))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "30"))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "8"))
+UPLOAD_BATCH_SIZE = int(os.getenv("UPLOAD_BATCH_SIZE", "500"))   # rows per /api/predict/batch call from the dashboard
 
 # ====== Logging ======
 LOG_LEVEL = "INFO"
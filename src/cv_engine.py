@@ -0,0 +1,156 @@
+# src/cv_engine.py
+"""
+Shared Cross-Validation Engine
+------------------------------
+Fold indices are computed once per (labels, split spec) and shared by every
+model trained on the same split. Each run keeps its out-of-fold (OOF)
+probabilities, so evaluation, threshold selection and model comparison can
+reuse them instead of refitting a model just to obtain scores.
+
+Usage:
+    engine = CVEngine(y_train)
+    result = engine.run("RandomForest", clf, x_train)
+    result.save()                       # models/oof/RandomForest.joblib
+    CVResult.load("RandomForest").best_threshold()
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import average_precision_score, roc_auc_score
+from sklearn.model_selection import RepeatedStratifiedKFold, StratifiedKFold
+
+from src.utils import ensure_dir
+
+OOF_DIR = "models/oof"
+CV_SPLITS = 5
+CV_REPEATS = 1
+CV_SEED = 42
+
+
+# ============================================================
+# 1. Fold indices (computed once per label vector + spec)
+# ============================================================
+@lru_cache(maxsize=16)
+def _fold_indices(labels: bytes, dtype: str, n_splits: int, n_repeats: int, random_state: int):
+    y = np.frombuffer(labels, dtype=dtype)
+    if n_repeats > 1:
+        splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    else:
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    folds = []
+    for train_idx, val_idx in splitter.split(np.zeros(len(y)), y):
+        train_idx.setflags(write=False)
+        val_idx.setflags(write=False)
+        folds.append((train_idx, val_idx))
+    return tuple(folds)
+
+
+# ============================================================
+# 2. Per-model result
+# ============================================================
+@dataclass
+class CVResult:
+    name: str
+    y: np.ndarray
+    oof: np.ndarray
+    fold_scores: list
+    seconds: float
+
+    @property
+    def mean_auc(self) -> float:
+        """Mean of the per-fold ROC AUCs."""
+        return float(np.mean(self.fold_scores))
+
+    @property
+    def oof_auc(self) -> float:
+        return float(roc_auc_score(self.y, self.oof))
+
+    @property
+    def oof_pr_auc(self) -> float:
+        return float(average_precision_score(self.y, self.oof))
+
+    def best_threshold(self) -> float:
+        """Probability threshold maximising F1 on the OOF predictions."""
+        order = np.argsort(-self.oof, kind="mergesort")
+        scores, y = self.oof[order], self.y[order]
+        tp = np.cumsum(y)
+        fp = np.cumsum(1 - y)
+        # one candidate per distinct score: the last row of each tie block
+        last = np.r_[np.nonzero(np.diff(scores))[0], len(scores) - 1]
+        f1 = 2 * tp[last] / (tp[last] + fp[last] + y.sum())
+        return float(scores[last[np.argmax(f1)]])
+
+    def save(self, path=None) -> str:
+        path = path or os.path.join(OOF_DIR, f"{self.name}.joblib")
+        ensure_dir(os.path.dirname(path))
+        joblib.dump(self, path)
+        return path
+
+    @staticmethod
+    def load(name_or_path) -> "CVResult":
+        path = name_or_path if os.path.exists(name_or_path) else os.path.join(OOF_DIR, f"{name_or_path}.joblib")
+        return joblib.load(path)
+
+
+# ============================================================
+# 3. Engine
+# ============================================================
+def _fit_predict(estimator, x, y, train_idx, val_idx, fit_params):
+    model = clone(estimator).fit(x.iloc[train_idx], y[train_idx], **(fit_params or {}))
+    return model.predict_proba(x.iloc[val_idx])[:, 1]
+
+
+class CVEngine:
+    def __init__(self, y, n_splits=CV_SPLITS, n_repeats=CV_REPEATS, random_state=CV_SEED):
+        self.y = np.ascontiguousarray(np.asarray(y))
+        self.n_splits = n_splits
+        self.n_repeats = n_repeats
+        self.folds = _fold_indices(self.y.tobytes(), self.y.dtype.str, n_splits, n_repeats, random_state)
+        self.results = {}
+
+    def run(self, name, estimator, x, fit_params=None, n_jobs=1) -> CVResult:
+        """
+        Fit a clone of `estimator` on every fold and keep its OOF probabilities.
+        Folds run as `n_jobs` parallel jobs (see `src.resources.allocate`).
+        """
+        started = time.perf_counter()
+        total = np.zeros(len(self.y))
+        counts = np.zeros(len(self.y))
+        scores = []
+        probs = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_predict)(estimator, x, self.y, train_idx, val_idx, fit_params)
+            for train_idx, val_idx in self.folds
+        )
+        for (_, val_idx), prob in zip(self.folds, probs):
+            total[val_idx] += prob
+            counts[val_idx] += 1
+            scores.append(roc_auc_score(self.y[val_idx], prob))
+
+        result = CVResult(name, self.y, total / counts, scores, time.perf_counter() - started)
+        self.results[name] = result
+        print(f"[CV] {name}: ROC AUC {result.mean_auc:.3f} ± {np.std(scores):.3f} "
+              f"over {len(self.folds)} folds ({result.seconds:.1f}s)")
+        return result
+
+
+def compare_results(*results) -> list:
+    """
+    Paired comparison of models evaluated on the same folds.
+
+    Returns rows of (name, mean fold AUC, OOF AUC, OOF PR AUC, folds won vs the first model).
+    """
+    base = results[0]
+    rows = []
+    for r in results:
+        if len(r.fold_scores) != len(base.fold_scores) or not np.array_equal(r.y, base.y):
+            raise ValueError(f"{r.name} was not cross-validated on the same folds as {base.name}")
+        wins = int(np.sum(np.asarray(r.fold_scores) > np.asarray(base.fold_scores)))
+        rows.append((r.name, r.mean_auc, r.oof_auc, r.oof_pr_auc, wins))
+    return rows
@@ -9,11 +9,17 @@ from .categorical_analysis import plot_categorical_features
 from .numerical_analysis import plot_numerical_features
 from .correlation_analysis import plot_correlations
 from .report_generator import generate_eda_report
+from .summary import compute_summary, save_summary, load_summary
+from .streaming import summarize_csv
 
 __all__ = [
     "plot_overview",
     "plot_categorical_features",
     "plot_numerical_features",
     "plot_correlations",
-    "generate_eda_report"
+    "generate_eda_report",
+    "compute_summary",
+    "save_summary",
+    "load_summary",
+    "summarize_csv"
 ]
@@ -0,0 +1,224 @@
+# src/eda/associations.py
+"""
+Incremental association engine for the correlation heatmap.
+
+Label-encoded categoricals make `df.corr()` misleading: the Pearson
+correlation of nominal codes depends on the arbitrary code order. The engine
+keeps mergeable sufficient statistics instead and picks a measure per pair:
+
+    numeric     × numeric       Pearson r           (running co-moments)
+    categorical × categorical   Cramér's V or MI    (contingency tables)
+    categorical × numeric       correlation ratio η (per-level counts and sums)
+
+All state is additive: `update(chunk)` folds in new rows, `merge(other)`
+combines partial engines built on different chunks, and `to_dict` /
+`from_dict` persist it in the EDA summary so the heatmap can be refreshed
+with new rows without rescanning the history (`refresh_associations`).
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from src.eda.sketches import Moments
+
+
+def split_columns(columns: dict, max_levels: int):
+    """(numeric, categorical) from the summary's column metadata; wide text columns are skipped."""
+    categorical = [c for c, meta in columns.items() if meta["nunique"] <= max_levels]
+    numeric = [c for c, meta in columns.items() if not meta["is_object"] and meta["nunique"] > max_levels]
+    return numeric, categorical
+
+
+class AssociationEngine:
+    def __init__(self, numeric, categorical, columns=None):
+        self.numeric = list(numeric)
+        self.categorical = list(categorical)
+        self.columns = list(columns) if columns is not None else self.numeric + self.categorical
+        self.moments = Moments(self.numeric)
+        self.levels = {c: [] for c in self.categorical}
+        self._index = {c: {} for c in self.categorical}
+        self.tables = {pair: np.zeros((0, 0), dtype=np.int64) for pair in combinations(self.categorical, 2)}
+        self.level_counts = {c: np.zeros(0, dtype=np.int64) for c in self.categorical}
+        # per (categorical, numeric): non-missing rows and value sums per level
+        self.level_n = {(c, x): np.zeros(0, dtype=np.int64) for c in self.categorical for x in self.numeric}
+        self.level_sum = {(c, x): np.zeros(0) for c in self.categorical for x in self.numeric}
+
+    # ------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------
+    def _codes(self, col, values):
+        """Level codes for `values` (-1 for missing); unseen levels are appended."""
+        codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+        index = self._index[col]
+        for u in uniques:
+            u = u.item() if hasattr(u, "item") else u
+            if u not in index:
+                index[u] = len(self.levels[col])
+                self.levels[col].append(u)
+        mapping = np.array([index[u.item() if hasattr(u, "item") else u] for u in uniques], dtype=np.int64)
+        return np.where(codes >= 0, mapping[np.maximum(codes, 0)] if len(mapping) else -1, -1)
+
+    def _fit_shapes(self):
+        """Pad every table to the current number of levels."""
+        size = {c: len(self.levels[c]) for c in self.categorical}
+        pad = lambda a, *shape: np.pad(a, [(0, s - d) for s, d in zip(shape, a.shape)])
+        for (a, b), table in self.tables.items():
+            self.tables[(a, b)] = pad(table, size[a], size[b])
+        for c in self.categorical:
+            self.level_counts[c] = pad(self.level_counts[c], size[c])
+        for (c, x) in self.level_n:
+            self.level_n[(c, x)] = pad(self.level_n[(c, x)], size[c])
+            self.level_sum[(c, x)] = pad(self.level_sum[(c, x)], size[c])
+
+    def update(self, frame: pd.DataFrame):
+        if self.numeric:
+            self.moments.update(frame[self.numeric])
+        codes = {c: self._codes(c, frame[c].to_numpy()) for c in self.categorical}
+        self._fit_shapes()
+        for c, code in codes.items():
+            n_levels = len(self.levels[c])
+            self.level_counts[c] += np.bincount(code[code >= 0], minlength=n_levels)
+            for x in self.numeric:
+                v = frame[x].to_numpy(dtype=float)
+                ok = (code >= 0) & ~np.isnan(v)
+                self.level_n[(c, x)] += np.bincount(code[ok], minlength=n_levels)
+                self.level_sum[(c, x)] += np.bincount(code[ok], weights=v[ok], minlength=n_levels)
+        for (a, b), table in self.tables.items():
+            ok = (codes[a] >= 0) & (codes[b] >= 0)
+            flat = codes[a][ok] * table.shape[1] + codes[b][ok]
+            table += np.bincount(flat, minlength=table.size).reshape(table.shape)
+        return self
+
+    def merge(self, other: "AssociationEngine"):
+        self.moments.merge(other.moments)
+        remap = {}
+        for c in self.categorical:
+            for level in other.levels[c]:
+                if level not in self._index[c]:
+                    self._index[c][level] = len(self.levels[c])
+                    self.levels[c].append(level)
+            remap[c] = np.array([self._index[c][level] for level in other.levels[c]], dtype=np.int64)
+        self._fit_shapes()
+        for (a, b), table in other.tables.items():
+            np.add.at(self.tables[(a, b)], np.ix_(remap[a], remap[b]), table)
+        for c in self.categorical:
+            np.add.at(self.level_counts[c], remap[c], other.level_counts[c])
+        for key in self.level_n:
+            np.add.at(self.level_n[key], remap[key[0]], other.level_n[key])
+            np.add.at(self.level_sum[key], remap[key[0]], other.level_sum[key])
+        return self
+
+    # ------------------------------------------------------------
+    # Measures
+    # ------------------------------------------------------------
+    def table(self, a, b) -> np.ndarray:
+        return self.tables[(a, b)] if (a, b) in self.tables else self.tables[(b, a)].T
+
+    def pearson(self) -> pd.DataFrame:
+        return pd.DataFrame(self.moments.corr(), index=self.numeric, columns=self.numeric)
+
+    @staticmethod
+    def _cramers_v(table):
+        table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+        n = table.sum()
+        if n == 0 or min(table.shape) < 2:
+            return np.nan
+        expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / n
+        chi2 = ((table - expected) ** 2 / expected).sum()
+        return float(np.sqrt(chi2 / n / (min(table.shape) - 1)))
+
+    @staticmethod
+    def _mutual_information(table, normalized):
+        n = table.sum()
+        if n == 0:
+            return np.nan
+        p = table / n
+        pa, pb = p.sum(axis=1), p.sum(axis=0)
+        nz = p > 0
+        mi = float((p[nz] * np.log(p[nz] / np.outer(pa, pb)[nz])).sum())
+        if not normalized:
+            return mi
+        entropy = lambda q: -float((q[q > 0] * np.log(q[q > 0])).sum())
+        scale = np.sqrt(entropy(pa) * entropy(pb))
+        return mi / scale if scale > 0 else np.nan
+
+    def categorical_matrix(self, measure: str = "cramers_v") -> pd.DataFrame:
+        """Pairwise Cramér's V (`cramers_v`), mutual information in nats (`mi`) or MI / sqrt(H_a H_b) (`nmi`)."""
+        out = pd.DataFrame(np.eye(len(self.categorical)), index=self.categorical, columns=self.categorical)
+        for a, b in combinations(self.categorical, 2):
+            table = self.table(a, b)
+            if measure == "cramers_v":
+                value = self._cramers_v(table)
+            elif measure in ("mi", "nmi"):
+                value = self._mutual_information(table, normalized=measure == "nmi")
+            else:
+                raise ValueError(f"Unknown categorical measure: {measure}")
+            out.loc[a, b] = out.loc[b, a] = value
+        if measure == "mi":
+            for c in self.categorical:
+                out.loc[c, c] = self._mutual_information(np.diag(self.level_counts[c]), normalized=False)
+        return out
+
+    def correlation_ratio(self) -> pd.DataFrame:
+        """η = sqrt(between-level / total sum of squares) for every categorical × numeric pair."""
+        out = pd.DataFrame(np.nan, index=self.categorical, columns=self.numeric)
+        for (c, x), n in self.level_n.items():
+            total_n, total_sum = n.sum(), self.level_sum[(c, x)].sum()
+            i = self.numeric.index(x)
+            ss_total = self.moments.m2[i, i]
+            if total_n < 2 or ss_total <= 0:
+                continue
+            nz = n > 0
+            ss_between = (self.level_sum[(c, x)][nz] ** 2 / n[nz]).sum() - total_sum ** 2 / total_n
+            out.loc[c, x] = float(np.sqrt(np.clip(ss_between / ss_total, 0, 1)))
+        return out
+
+    def matrix(self, categorical: str = "cramers_v") -> pd.DataFrame:
+        """One square matrix over `columns` mixing the three measures (Pearson is signed, the others in [0, 1])."""
+        out = pd.DataFrame(np.nan, index=self.columns, columns=self.columns)
+        pearson, cat, eta = self.pearson(), self.categorical_matrix(categorical), self.correlation_ratio()
+        out.loc[self.numeric, self.numeric] = pearson
+        out.loc[self.categorical, self.categorical] = cat
+        out.loc[self.categorical, self.numeric] = eta
+        out.loc[self.numeric, self.categorical] = eta.T
+        return out
+
+    # ------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------
+    def to_dict(self) -> dict:
+        return {
+            "columns": self.columns, "numeric": self.numeric, "categorical": self.categorical,
+            "levels": {c: list(v) for c, v in self.levels.items()},
+            "moments": {"n": int(self.moments.n), "mean": self.moments.mean.tolist(), "m2": self.moments.m2.tolist()},
+            "tables": [[a, b, t.tolist()] for (a, b), t in self.tables.items()],
+            "level_counts": {c: v.tolist() for c, v in self.level_counts.items()},
+            "level_stats": [[c, x, self.level_n[(c, x)].tolist(), self.level_sum[(c, x)].tolist()]
+                            for (c, x) in self.level_n],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "AssociationEngine":
+        engine = cls(state["numeric"], state["categorical"], state["columns"])
+        for c, levels in state["levels"].items():
+            engine.levels[c] = list(levels)
+            engine._index[c] = {level: i for i, level in enumerate(levels)}
+        m = state["moments"]
+        engine.moments.n, engine.moments.mean, engine.moments.m2 = m["n"], np.array(m["mean"]), np.array(m["m2"])
+        engine._fit_shapes()
+        for a, b, table in state["tables"]:
+            engine.tables[(a, b)] = np.array(table, dtype=np.int64).reshape(engine.tables[(a, b)].shape)
+        for c, counts in state["level_counts"].items():
+            engine.level_counts[c] = np.array(counts, dtype=np.int64)
+        for c, x, n, sums in state["level_stats"]:
+            engine.level_n[(c, x)] = np.array(n, dtype=np.int64)
+            engine.level_sum[(c, x)] = np.array(sums, dtype=float)
+        return engine
+
+
+def refresh_associations(summary: dict, new_rows: pd.DataFrame) -> dict:
+    """Fold newly arrived rows into the summary's association state (no rescan of past data)."""
+    engine = AssociationEngine.from_dict(summary["associations"]).update(new_rows)
+    return {**summary, "associations": engine.to_dict()}
@@ -3,26 +3,46 @@
 Categorical analysis — visualizes churn distribution across categorical features.
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
+import numpy as np
+from src.eda.summary import MAX_LEVELS, ensure_summary
 from src.eda.utils_eda import save_fig
+from src.rendering import new_figure
 
 
-def plot_categorical_features(df: pd.DataFrame, colors: list, save_path: str = "reports/eda_results/"):
-    """
-    Plot churn distributions across categorical features (e.g., gender, contract type).
-    """
-    categorical_features = [c for c in df.columns if df[c].dtype == "object" or df[c].nunique() <= 6]
-    if "Churn" in categorical_features:
-        categorical_features.remove("Churn")
+def draw_grouped_counts(ax, crosstab: dict, colors: list, target: str = "Churn"):
+    """Bars per level, one per target class (seaborn countplot with hue, from counts)."""
+    counts = np.asarray(crosstab["counts"])
+    n_levels, n_classes = counts.shape
+    width = 0.8 / n_classes
+    x = np.arange(n_levels)
+    for j, cls in enumerate(crosstab["classes"]):
+        ax.bar(x - 0.4 + width * (j + 0.5), counts[:, j], width=width, label=cls,
+               color=colors[j % len(colors)], edgecolor="black", alpha=0.85)
+    ax.set_xticks(x, crosstab["levels"])
+    ax.set_ylabel("count")
+    ax.legend(title=target)
 
-    fig, axs = plt.subplots(2, 2, figsize=(16, 10))
+
+def render_categorical(crosstabs: dict, colors: list, save_path: str) -> str:
+    fig, axs = new_figure(2, 2, figsize=(16, 10))
     axs = axs.flatten()
-    for i, feature in enumerate(categorical_features[:4]):
-        sns.countplot(x=feature, data=df, hue="Churn", palette=colors, edgecolor="black", ax=axs[i])
+    for i, (feature, crosstab) in enumerate(crosstabs.items()):
+        draw_grouped_counts(axs[i], crosstab, colors)
+        axs[i].set_xlabel(feature)
         axs[i].set_title(f"{feature} vs Churn", fontsize=11)
         axs[i].tick_params(axis="x", rotation=30)
-    plt.tight_layout()
-    save_fig(fig, save_path, "categorical_overview.png")
-    plt.close(fig)
+    fig.tight_layout()
+    return save_fig(fig, save_path, "categorical_overview.png")
+
+
+def plot_categorical_features(df, colors: list, save_path: str = "reports/eda_results/"):
+    """
+    Plot churn distributions across categorical features (e.g., gender, contract type).
+    `df` is the processed DataFrame or its precomputed summary (`src.eda.summary`).
+    """
+    summary = ensure_summary(df)
+    categorical_features = [c for c, meta in summary["columns"].items()
+                            if (meta["is_object"] or meta["nunique"] <= MAX_LEVELS) and c != summary["target"]]
+
+    features = categorical_features[:4]
+    render_categorical({f: summary["crosstabs"][f] for f in features}, colors, save_path)
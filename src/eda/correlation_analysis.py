@@ -1,22 +1,35 @@
 # src/eda/correlation_analysis.py
 """
-Correlation analysis — correlation heatmap and feature relationships.
+Correlation analysis — association heatmap and feature relationships.
+Pearson r between numeric features, Cramér's V (or mutual information)
+between categoricals and the correlation ratio η between the two kinds,
+all from the mergeable state of `src.eda.associations`.
 """
 
-import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+from src.eda.associations import AssociationEngine
+from src.eda.summary import ensure_summary
 from src.eda.utils_eda import save_fig
+from src.rendering import new_figure
 
+MEASURE_LABELS = {"cramers_v": "Cramér's V", "mi": "mutual information", "nmi": "normalized MI"}
 
-def plot_correlations(df: pd.DataFrame, colors: list, save_path: str = "reports/eda_results/"):
+
+def render_correlation_heatmap(corr: pd.DataFrame, save_path: str, title: str = "Feature Correlation Matrix") -> str:
+    fig, ax = new_figure(figsize=(8, 6))
+    sns.heatmap(corr, cmap="coolwarm", vmin=-1, vmax=1, center=0, annot=False, linewidths=0.3, ax=ax)
+    ax.set_title(title)
+    fig.tight_layout()
+    return save_fig(fig, save_path, "correlation_heatmap.png")
+
+
+def plot_correlations(df, colors: list, save_path: str = "reports/eda_results/", categorical: str = "cramers_v"):
     """
-    Plot correlation matrix for numerical features.
+    Plot the feature association matrix.
+    `df` is the processed DataFrame or its precomputed summary (`src.eda.summary`);
+    `categorical` picks the categorical measure: cramers_v | mi | nmi.
     """
-    corr = df.corr()
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.heatmap(corr, cmap="coolwarm", annot=False, linewidths=0.3, ax=ax)
-    ax.set_title("Feature Correlation Matrix")
-    plt.tight_layout()
-    save_fig(fig, save_path, "correlation_heatmap.png")
-    plt.close(fig)
+    engine = AssociationEngine.from_dict(ensure_summary(df)["associations"])
+    title = f"Feature Associations (Pearson r · {MEASURE_LABELS[categorical]} · η)"
+    render_correlation_heatmap(engine.matrix(categorical), save_path, title)
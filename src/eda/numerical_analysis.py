@@ -3,63 +3,91 @@
 Numerical feature analysis module.
 Includes distribution plots and boxplots for churn comparison.
 Automatically splits results into multiple pages if too many features exist.
+Each page is an independent figure, rendered in parallel by `src.rendering`
+from the precomputed histogram / KDE / box statistics in `src.eda.summary`.
 """
 
 import math
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
+import numpy as np
+from src.eda.summary import ensure_summary
 from src.eda.utils_eda import save_fig
+from src.rendering import RenderJob, new_figure, render_jobs
 
+N_COLS = 3           # number of plots per row
+N_PER_PAGE = 6       # number of features per page (2 rows × 3 columns)
 
-def plot_numerical_features(df: pd.DataFrame, colors: list, save_path: str = "reports/eda_results/"):
+
+def draw_histogram(ax, stats: dict, color: str, feature: str):
+    """Histogram bars plus the KDE curve scaled to counts (seaborn histplot(kde=True) look)."""
+    edges = np.asarray(stats["hist"]["edges"])
+    widths = np.diff(edges)
+    ax.bar(edges[:-1], stats["hist"]["counts"], width=widths, align="edge",
+           color=color, alpha=0.75, edgecolor="white", linewidth=0.5)
+    if stats["kde"]:
+        scale = stats["count"] * widths.mean()
+        ax.plot(stats["kde"]["x"], np.asarray(stats["kde"]["y"]) * scale, color=color)
+    ax.set_xlabel(feature)
+    ax.set_ylabel("Count")
+
+
+def draw_boxplot(ax, boxes: dict, colors: list, feature: str, target: str = "Churn"):
+    """Box per target class from precomputed quartiles, whiskers and outliers."""
+    classes = list(boxes)
+    artists = ax.bxp([dict(boxes[c], label=c) for c in classes], positions=range(len(classes)),
+                     widths=0.8, patch_artist=True, showfliers=True,
+                     medianprops={"color": "0.25"}, flierprops={"marker": "o", "markersize": 5})
+    for patch, color in zip(artists["boxes"], colors):
+        patch.set_facecolor(color)
+        patch.set_edgecolor("0.25")
+    ax.set_xlabel(target)
+    ax.set_ylabel(feature)
+
+
+def render_numerical_page(numeric: dict, subset: list, colors: list, kind: str,
+                          page: int, save_path: str) -> str:
+    """Draw one page of distribution plots (`kind="distributions"`) or boxplots vs churn."""
+    n_rows = math.ceil(len(subset) / N_COLS)
+    fig, axes = new_figure(n_rows, N_COLS, figsize=(6 * N_COLS, 4 * n_rows), squeeze=False)
+    axes = axes.flatten()
+
+    for i, feature in enumerate(subset):
+        if kind == "distributions":
+            draw_histogram(axes[i], numeric[feature], colors[0], feature)
+            axes[i].set_title(f"Distribution: {feature}", fontsize=11)
+        else:
+            draw_boxplot(axes[i], numeric[feature]["box"], colors, feature)
+            axes[i].set_title(f"{feature} vs Churn", fontsize=11)
+    for j in range(len(subset), len(axes)):
+        axes[j].axis("off")
+
+    fig.tight_layout()
+    return save_fig(fig, save_path, f"numerical_{kind}_p{page + 1}.png")
+
+
+def plot_numerical_features(df, colors: list, save_path: str = "reports/eda_results/",
+                            workers: int = None):
     """
     Visualize numerical feature distributions and their relationship with churn.
     Automatically paginates output if the number of features exceeds a given limit.
 
     Args:
-        df (pd.DataFrame): The processed Telco dataset.
+        df (pd.DataFrame | dict): The processed Telco dataset or its summary (`src.eda.summary`).
         colors (list): Color palette for plots.
         save_path (str): Directory path to save figures.
+        workers (int, optional): Rendering processes (default: the stage CPU budget).
 
     Returns:
         None. Figures are saved to `reports/eda_results/`.
     """
-    numerical_features = [c for c in df.columns if df[c].dtype != "object" and c != "Churn"]
-    n_cols = 3           # number of plots per row
-    n_per_page = 6       # number of features per page (2 rows × 3 columns)
-    total_pages = math.ceil(len(numerical_features) / n_per_page)
-
-    # === Page 1..N: Distribution plots ===
-    for page in range(total_pages):
-        subset = numerical_features[page * n_per_page : (page + 1) * n_per_page]
-        n_rows = math.ceil(len(subset) / n_cols)
-        fig, axes = plt.subplots(n_rows, n_cols, figsize=(6 * n_cols, 4 * n_rows))
-        axes = axes.flatten()
-
-        for i, feature in enumerate(subset):
-            sns.histplot(df[feature], color=colors[0], kde=True, ax=axes[i])
-            axes[i].set_title(f"Distribution: {feature}", fontsize=11)
-        for j in range(len(subset), len(axes)):
-            axes[j].axis("off")
-
-        plt.tight_layout()
-        save_fig(fig, save_path, f"numerical_distributions_p{page + 1}.png")
-        plt.close(fig)
-
-    # === Page 1..N: Boxplots vs Churn ===
-    for page in range(total_pages):
-        subset = numerical_features[page * n_per_page : (page + 1) * n_per_page]
-        n_rows = math.ceil(len(subset) / n_cols)
-        fig, axes = plt.subplots(n_rows, n_cols, figsize=(6 * n_cols, 4 * n_rows))
-        axes = axes.flatten()
-
-        for i, feature in enumerate(subset):
-            sns.boxplot(x="Churn", y=feature, data=df, palette=colors, ax=axes[i])
-            axes[i].set_title(f"{feature} vs Churn", fontsize=11)
-        for j in range(len(subset), len(axes)):
-            axes[j].axis("off")
+    summary = ensure_summary(df)
+    numerical_features = list(summary["numeric"])
+    total_pages = math.ceil(len(numerical_features) / N_PER_PAGE)
 
-        plt.tight_layout()
-        save_fig(fig, save_path, f"numerical_boxplots_p{page + 1}.png")
-        plt.close(fig)
+    # === Page 1..N: distribution plots, then boxplots vs Churn ===
+    jobs = []
+    for kind in ("distributions", "boxplots"):
+        for page in range(total_pages):
+            subset = numerical_features[page * N_PER_PAGE : (page + 1) * N_PER_PAGE]
+            numeric = {f: summary["numeric"][f] for f in subset}
+            jobs.append(RenderJob(render_numerical_page, (numeric, subset, colors, kind, page, save_path)))
+    render_jobs(jobs, workers)
@@ -3,28 +3,18 @@
 Overview module for basic dataset insights and churn rate visualization.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from src.eda.summary import MAX_LEVELS, ensure_summary
 from src.eda.utils_eda import save_fig
+from src.rendering import new_figure
 
 
-def plot_overview(df: pd.DataFrame, colors: list, save_path: str = "reports/eda_results/"):
-    """
-    Plot general churn distribution and print feature types.
-    """
-    # Identify categorical vs numerical
-    cols = list(df.columns)
-    categorical_features = [c for c in cols if len(df[c].unique()) <= 6]
-    numerical_features = [c for c in cols if len(df[c].unique()) > 6]
-    print("Categorical Features:", *categorical_features)
-    print("Numerical Features:", *numerical_features)
-
-    churn_rates = df["Churn"].value_counts(normalize=True) * 100
-    fig, axs = plt.subplots(1, 2, figsize=(14, 5))
+def render_overview(target_counts: dict, colors: list, save_path: str) -> str:
+    counts = list(target_counts.values())
+    total = sum(counts)
+    fig, axs = new_figure(1, 2, figsize=(14, 5))
 
     axs[0].pie(
-        churn_rates,
+        [100 * c / total for c in counts],
         labels=["Not-Churn", "Churn"],
         autopct="%1.1f%%",
         startangle=90,
@@ -34,14 +24,33 @@ def plot_overview(df: pd.DataFrame, colors: list, save_path: str = "reports/eda_
     )
     axs[0].set_title("Churn Rate (%)")
 
-    ax = sns.countplot(x="Churn", data=df, palette=colors, edgecolor="black", ax=axs[1])
-    for rect in ax.patches:
+    ax = axs[1]
+    bars = ax.bar(range(len(counts)), counts, width=0.8, color=colors, edgecolor="black", alpha=0.85)
+    for rect in bars:
         ax.text(rect.get_x() + rect.get_width() / 2, rect.get_height() + 2,
                 f"{int(rect.get_height())}", ha="center", fontsize=10)
-    ax.set_xticklabels(["Not-Churn", "Churn"])
-    axs[1].set_title("Customer Counts")
+    ax.set_xticks(range(len(counts)), ["Not-Churn", "Churn"])
+    ax.set_xlabel("Churn")
+    ax.set_ylabel("count")
+    ax.set_title("Customer Counts")
+
+    fig.tight_layout()
+    return save_fig(fig, save_path, "overview_churn_distribution.png")
+
+
+def plot_overview(df, colors: list, save_path: str = "reports/eda_results/"):
+    """
+    Plot general churn distribution and print feature types.
+    `df` is the processed DataFrame or its precomputed summary (`src.eda.summary`).
+    """
+    summary = ensure_summary(df)
+
+    # Identify categorical vs numerical
+    columns = summary["columns"]
+    categorical_features = [c for c, meta in columns.items() if meta["nunique"] <= MAX_LEVELS]
+    numerical_features = [c for c, meta in columns.items() if meta["nunique"] > MAX_LEVELS]
+    print("Categorical Features:", *categorical_features)
+    print("Numerical Features:", *numerical_features)
 
-    plt.tight_layout()
-    save_fig(fig, save_path, "overview_churn_distribution.png")
-    plt.close(fig)
+    render_overview(summary["target_counts"], colors, save_path)
     return categorical_features, numerical_features
@@ -1,23 +1,131 @@
 # src/eda/report_generator.py
 """
 EDA Report Generator — combines all EDA plots into one HTML summary.
+
+The report build step also writes, next to the figures:
+    thumbs/<figure>.webp   compact previews (THUMB_WIDTH px wide)
+    manifest.json          per-figure size, dimensions and SHA-256, plus a
+                           manifest hash that changes whenever any figure does
+
+The HTML page shows lazy-loaded thumbnails that link to the full-resolution
+figure, so the full image is only fetched on demand. The Streamlit dashboard
+reads the manifest and caches image bytes keyed by the content hashes.
+
+Usage:
+    python -m src.eda.report_generator [output_dir]
 """
 
+import hashlib
+import html
+import json
 import os
+import sys
 from datetime import datetime
 
+from PIL import Image, features
+
+MANIFEST_NAME = "manifest.json"
+THUMB_DIR = "thumbs"
+THUMB_WIDTH = int(os.getenv("EDA_THUMB_WIDTH", "480"))
+THUMB_FORMAT = "webp" if features.check("webp") else "jpeg"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".svg", ".pdf")
+VECTOR_EXTENSIONS = (".svg", ".pdf")   # listed as-is, no raster thumbnail
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _caption(filename: str) -> str:
+    return os.path.splitext(filename)[0].replace("_", " ").title()
+
+
+def _make_thumbnail(src: str, dst: str):
+    with Image.open(src) as img:
+        img = img.convert("RGB")
+        img.thumbnail((THUMB_WIDTH, THUMB_WIDTH * 4), Image.Resampling.LANCZOS)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if THUMB_FORMAT == "webp":
+            img.save(dst, format="webp", quality=82, method=4)
+        else:
+            img.save(dst, format="jpeg", quality=82, optimize=True)
+        return img.size
+
+
+def build_manifest(output_dir="reports/eda_results/") -> dict:
+    """
+    Write thumbnails and manifest.json for every figure in `output_dir`.
+    Thumbnails of figures whose content hash is unchanged are reused.
+    """
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = {e["file"]: e for e in json.load(f).get("images", [])}
+
+    entries = []
+    for name in sorted(f for f in os.listdir(output_dir) if f.endswith(IMAGE_EXTENSIONS)):
+        path = os.path.join(output_dir, name)
+        sha = _sha256(path)
+        old = previous.get(name)
+        if name.endswith(VECTOR_EXTENSIONS):   # vector figures are already small and scale themselves
+            entry = {"file": name, "thumb": name, "bytes": os.path.getsize(path), "sha256": sha}
+        elif old and old["sha256"] == sha and os.path.exists(os.path.join(output_dir, old["thumb"])):
+            entry = old
+        else:
+            thumb = f"{THUMB_DIR}/{os.path.splitext(name)[0]}.{THUMB_FORMAT.replace('jpeg', 'jpg')}"
+            thumb_path = os.path.join(output_dir, thumb)
+            with Image.open(path) as img:
+                width, height = img.size
+            thumb_width, thumb_height = _make_thumbnail(path, thumb_path)
+            entry = {"file": name, "thumb": thumb, "bytes": os.path.getsize(path), "sha256": sha,
+                     "width": width, "height": height, "thumb_bytes": os.path.getsize(thumb_path),
+                     "thumb_width": thumb_width, "thumb_height": thumb_height}
+        entries.append(dict(entry, caption=_caption(name)))
+
+    manifest = {"hash": hashlib.sha256("".join(e["sha256"] for e in entries).encode()).hexdigest()[:16],
+                "generated": datetime.now().isoformat(timespec="seconds"), "images": entries}
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    full = sum(e["bytes"] for e in entries) / 1024
+    thumbs = sum(e.get("thumb_bytes", e["bytes"]) for e in entries) / 1024
+    print(f"✅ EDA manifest saved to {manifest_path} ({len(entries)} figures, {full:.0f} KB → {thumbs:.0f} KB thumbnails)")
+    return manifest
+
+
 def generate_eda_report(output_dir="reports/eda_results/"):
     """
-    Generate simple HTML report summarizing saved EDA figures.
+    Generate simple HTML report summarizing saved EDA figures: lazy-loaded
+    thumbnails, each linking to its full-resolution figure.
     """
-    images = [f for f in os.listdir(output_dir) if f.endswith(".png")]
+    manifest = build_manifest(output_dir)
     html_path = os.path.join(output_dir, "eda_summary.html")
 
     with open(html_path, "w", encoding="utf-8") as f:
-        f.write("<html><head><title>EDA Summary</title></head><body>")
+        f.write("<html><head><meta charset='utf-8'><title>EDA Summary</title></head><body>")
         f.write(f"<h1>EDA Summary Report</h1><p>Generated: {datetime.now()}</p>")
-        for img in images:
-            f.write(f"<h3>{img}</h3><img src='{img}' width='600'><hr>")
+        for e in manifest["images"]:
+            if e["file"].endswith(".pdf"):   # browsers cannot inline a PDF as <img>
+                f.write(f"<h3>{html.escape(e['caption'])}</h3>"
+                        f"<p><a href='{e['file']}?v={e['sha256'][:12]}'>Open figure (PDF, "
+                        f"{e['bytes'] / 1024:.0f} KB)</a></p><hr>")
+                continue
+            size = f" width='{e['thumb_width']}' height='{e['thumb_height']}'" if "thumb_width" in e else " width='600'"
+            f.write(f"<h3>{html.escape(e['caption'])}</h3>"
+                    f"<a href='{e['file']}?v={e['sha256'][:12]}'>"
+                    f"<img src='{e['thumb']}?v={e['sha256'][:12]}' alt='{html.escape(e['caption'])}'"
+                    f"{size} loading='lazy' decoding='async'></a>"
+                    f"<p><small>{e['bytes'] / 1024:.0f} KB full resolution</small></p><hr>")
         f.write("</body></html>")
 
     print(f"✅ EDA summary saved to {html_path}")
+    return html_path
+
+
+if __name__ == "__main__":
+    generate_eda_report(*sys.argv[1:])
@@ -0,0 +1,211 @@
+# src/eda/sketches.py
+"""
+Mergeable streaming sketches for EDA over data that does not fit in memory.
+
+Every sketch supports `update(chunk)` and `merge(other)`, so partial sketches
+built by parallel workers over different chunks combine into the same
+result as a single sequential pass.
+
+    QuantileSketch    KLL-style compactor sketch (quantiles / box plots, ~1% rank error)
+    FixedHistogram    counts over fixed bin edges
+    CategoryCounter   exact (value, class) counts for low-cardinality columns
+    Moments           running mean / co-moment matrix (Chan et al.) for covariance and correlation
+    BoxTails          whisker extremes and outliers once the box fences are known
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """
+    KLL-style quantile sketch: items live in levels of weight 2**h; a level
+    over capacity is sorted and every other item is promoted one level up.
+    Memory is O(k log(n / k)).
+    """
+
+    def __init__(self, k: int = 512, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        compacted = True
+        while compacted:
+            compacted = False
+            for h in range(len(self.levels)):
+                level = self.levels[h]
+                if len(level) <= self._capacity(h):
+                    continue
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                level = np.sort(level)
+                even = len(level) - len(level) % 2
+                promoted = level[self._rng.integers(2):even:2]
+                self.levels[h] = level[even:]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                compacted = True
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self.n += len(values)
+            self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        """Approximate quantiles for `qs` in [0, 1]."""
+        items = np.concatenate(self.levels)
+        if not len(items):
+            return np.full(len(np.atleast_1d(qs)), np.nan)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cum = items[order], np.cumsum(weights[order])
+        # an item of weight w stands for w consecutive ranks; interpolating at
+        # their centre reduces to np.percentile's default while nothing is compacted
+        ranks = cum - (weights[order] + 1) / 2
+        return np.interp(np.atleast_1d(qs) * (cum[-1] - 1), ranks, items)
+
+
+class FixedHistogram:
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        self.counts += np.histogram(values[~np.isnan(values)], bins=self.edges)[0]
+        return self
+
+    def merge(self, other: "FixedHistogram"):
+        self.counts += other.counts
+        return self
+
+
+class CategoryCounter:
+    """Exact (value, class) counts; stops counting once more than `cap` distinct values are seen."""
+
+    def __init__(self, cap: int):
+        self.cap = cap
+        self.counts = {}
+        self.overflow = False
+
+    def update(self, values, classes):
+        if self.overflow:
+            return self
+        frame = pd.DataFrame({"v": np.asarray(values), "c": np.asarray(classes)}).dropna()
+        for (v, c), n in frame.groupby(["v", "c"], sort=False).size().items():
+            key = (v.item() if hasattr(v, "item") else v, c.item() if hasattr(c, "item") else c)
+            self.counts[key] = self.counts.get(key, 0) + int(n)
+        self._check()
+        return self
+
+    def merge(self, other: "CategoryCounter"):
+        self.overflow |= other.overflow
+        if not self.overflow:
+            for key, n in other.counts.items():
+                self.counts[key] = self.counts.get(key, 0) + n
+            self._check()
+        return self
+
+    def _check(self):
+        if len({v for v, _ in self.counts}) > self.cap:
+            self.overflow, self.counts = True, {}
+
+    @property
+    def nunique(self) -> int:
+        return self.cap + 1 if self.overflow else len({v for v, _ in self.counts})
+
+    def table(self, classes):
+        """(levels, counts[level][class]) sorted by level."""
+        levels = sorted({v for v, _ in self.counts})
+        return levels, [[self.counts.get((v, c), 0) for c in classes] for v in levels]
+
+
+class Moments:
+    """Running means and co-moments of several columns; rows with a missing value are skipped."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.n = 0
+        self.mean = np.zeros(len(self.columns))
+        self.m2 = np.zeros((len(self.columns), len(self.columns)))
+
+    def _combine(self, n_b, mean_b, m2_b):
+        n = self.n + n_b
+        if n_b == 0:
+            return self
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * n_b / n
+        self.m2 = self.m2 + m2_b + np.outer(delta, delta) * self.n * n_b / n
+        self.n = n
+        return self
+
+    def update(self, frame):
+        x = np.asarray(frame, dtype=float)
+        x = x[~np.isnan(x).any(axis=1)]
+        if not len(x):
+            return self
+        mean_b = x.mean(axis=0)
+        d = x - mean_b
+        return self._combine(len(x), mean_b, d.T @ d)
+
+    def merge(self, other: "Moments"):
+        return self._combine(other.n, other.mean, other.m2)
+
+    def std(self):
+        return np.sqrt(np.diag(self.m2) / max(self.n - 1, 1))
+
+    def corr(self):
+        scale = np.sqrt(np.diag(self.m2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.m2 / np.outer(scale, scale)
+
+
+class BoxTails:
+    """Whisker ends (most extreme values inside the fences) and distinct outliers."""
+
+    def __init__(self, lo_fence: float, hi_fence: float, max_fliers: int):
+        self.lo, self.hi = lo_fence, hi_fence
+        self.max_fliers = max_fliers
+        self.whislo, self.whishi = np.inf, -np.inf
+        self.fliers = np.empty(0)
+
+    def _thin(self):
+        if len(self.fliers) > 4 * self.max_fliers:
+            idx = np.linspace(0, len(self.fliers) - 1, 2 * self.max_fliers).round().astype(int)
+            self.fliers = self.fliers[idx]
+
+    def update(self, values):
+        v = np.asarray(values, dtype=float)
+        v = v[~np.isnan(v)]
+        inside = v[(v >= self.lo) & (v <= self.hi)]
+        if len(inside):
+            self.whislo = min(self.whislo, inside.min())
+            self.whishi = max(self.whishi, inside.max())
+        self.fliers = np.unique(np.concatenate([self.fliers, v[(v < self.lo) | (v > self.hi)]]))
+        self._thin()
+        return self
+
+    def merge(self, other: "BoxTails"):
+        self.whislo = min(self.whislo, other.whislo)
+        self.whishi = max(self.whishi, other.whishi)
+        self.fliers = np.unique(np.concatenate([self.fliers, other.fliers]))
+        self._thin()
+        return self
@@ -0,0 +1,328 @@
+# src/eda/streaming.py
+"""
+Streaming EDA summary for datasets larger than memory.
+
+`summarize_csv` reads a CSV in chunks and builds the same summary schema as
+`src.eda.summary.compute_summary`, so every EDA figure renders unchanged.
+Memory is bounded by the chunk size plus the sketches in `src.eda.sketches`.
+
+Two passes over the file:
+    1. row counts, min/max, moments, quantile sketches (overall and per churn
+       class) and exact (value, churn) counters for low-cardinality columns
+       (crosstabs, and exact quantiles for columns such as tenure)
+    2. histograms on the bin edges fixed by pass 1, the fine histogram the KDE
+       is smoothed from, whisker ends / outliers outside the box fences, and
+       the association engine (column kinds need the pass-1 distinct counts)
+
+Each chunk produces a partial state; partial states merge, so chunks are
+processed by a process pool sized by the stage CPU budget and combined in
+any order.
+
+Usage:
+    python -m src.eda.streaming data/processed/telco_processed.csv --chunksize 200000
+"""
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from src.eda.associations import AssociationEngine
+from src.eda.sketches import BoxTails, CategoryCounter, FixedHistogram, Moments, QuantileSketch
+from src.eda.summary import (
+    KDE_FINE_BINS,
+    MAX_FLIERS,
+    MAX_LEVELS,
+    NUNIQUE_CAP,
+    SUMMARY_PATH,
+    TARGET,
+    _compact,
+    _json_key,
+    association_engine,
+    auto_bin_edges,
+    box_stats,
+    kde_from_histogram,
+    save_summary,
+)
+from src.resources import stage_budget
+
+CHUNKSIZE = 100_000
+SKETCH_K = 512
+EXACT_VALUES = 1024     # columns with at most this many distinct values get exact quantiles
+
+
+# ============================================================
+# 1. Partial states (one per chunk, mergeable)
+# ============================================================
+class FirstPass:
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self.dtypes = {}
+        self.counters = {col: CategoryCounter(EXACT_VALUES) for col in schema["columns"]}
+        self.target_counts = {}
+        self.minmax = {col: [np.inf, -np.inf] for col in schema["numeric"]}
+        self.moments = {col: Moments([col]) for col in schema["numeric"]}
+        self.quantiles = {col: QuantileSketch(SKETCH_K) for col in schema["numeric"]}
+        self.class_quantiles = {col: {} for col in schema["numeric"]}
+
+    def update(self, chunk: pd.DataFrame):
+        chunk = _coerce(chunk, self.schema)
+        y = chunk[self.schema["target"]].to_numpy()
+        for c, n in zip(*np.unique(y, return_counts=True)):
+            c = c.item() if hasattr(c, "item") else c
+            self.target_counts[c] = self.target_counts.get(c, 0) + int(n)
+        for col in self.schema["columns"]:
+            self.dtypes[col] = chunk[col].dtype
+            self.counters[col].update(chunk[col].to_numpy(), y)
+        for col in self.schema["numeric"]:
+            x = chunk[col].to_numpy(dtype=float)
+            if np.isnan(x).all():
+                continue
+            self.minmax[col] = [min(self.minmax[col][0], np.nanmin(x)), max(self.minmax[col][1], np.nanmax(x))]
+            self.moments[col].update(x[:, None])
+            self.quantiles[col].update(x)
+            for c in np.unique(y):
+                sketch = self.class_quantiles[col].setdefault(c.item() if hasattr(c, "item") else c, QuantileSketch(SKETCH_K))
+                sketch.update(x[y == c])
+        return self
+
+    def merge(self, other: "FirstPass"):
+        for col, dtype in other.dtypes.items():
+            self.dtypes[col] = _merge_dtype(self.dtypes.get(col), dtype)
+        for c, n in other.target_counts.items():
+            self.target_counts[c] = self.target_counts.get(c, 0) + n
+        for col in self.schema["columns"]:
+            self.counters[col].merge(other.counters[col])
+        for col in self.schema["numeric"]:
+            lo, hi = other.minmax[col]
+            self.minmax[col] = [min(self.minmax[col][0], lo), max(self.minmax[col][1], hi)]
+            self.moments[col].merge(other.moments[col])
+            self.quantiles[col].merge(other.quantiles[col])
+            for c, sketch in other.class_quantiles[col].items():
+                if c in self.class_quantiles[col]:
+                    self.class_quantiles[col][c].merge(sketch)
+                else:
+                    self.class_quantiles[col][c] = sketch
+        return self
+
+
+class SecondPass:
+    def __init__(self, plan: dict):
+        self.schema = plan["schema"]
+        self.hist = {col: FixedHistogram(p["edges"]) for col, p in plan["numeric"].items()}
+        self.fine = {col: FixedHistogram(p["fine_edges"]) for col, p in plan["numeric"].items()}
+        self.tails = {col: {c: BoxTails(*fences, MAX_FLIERS) for c, fences in p["fences"].items()}
+                      for col, p in plan["numeric"].items()}
+        self.associations = AssociationEngine(**plan["associations"])
+
+    def update(self, chunk: pd.DataFrame):
+        chunk = _coerce(chunk, self.schema)
+        y = chunk[self.schema["target"]].to_numpy()
+        for col in self.hist:
+            x = chunk[col].to_numpy(dtype=float)
+            self.hist[col].update(x)
+            self.fine[col].update(x)
+            for c, tails in self.tails[col].items():
+                tails.update(x[y == c])
+        self.associations.update(chunk)
+        return self
+
+    def merge(self, other: "SecondPass"):
+        for col in self.hist:
+            self.hist[col].merge(other.hist[col])
+            self.fine[col].merge(other.fine[col])
+            for c, tails in self.tails[col].items():
+                tails.merge(other.tails[col][c])
+        self.associations.merge(other.associations)
+        return self
+
+
+def _coerce(chunk, schema):
+    """Pin numeric columns to numbers even if a later chunk parses them differently."""
+    chunk = chunk[schema["columns"]]
+    bad = [col for col in schema["numeric"] if not pd.api.types.is_numeric_dtype(chunk[col])]
+    if bad:
+        chunk = chunk.assign(**{col: pd.to_numeric(chunk[col], errors="coerce") for col in bad})
+    return chunk
+
+
+def _merge_dtype(a, b):
+    if a is None or a == b:
+        return b
+    if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+        return np.result_type(a, b)
+    return a
+
+
+def _first_pass(chunk, schema):
+    return FirstPass(schema).update(chunk)
+
+
+def _second_pass(chunk, plan):
+    return SecondPass(plan).update(chunk)
+
+
+# ============================================================
+# 2. Chunk map / merge
+# ============================================================
+def map_merge(fn, chunks, workers: int = 1):
+    """
+    Apply `fn` to every chunk and merge the partial states.
+
+    With several workers, at most 2 × workers chunks are in flight, so
+    memory stays bounded however long the input is.
+    """
+    merged = None
+
+    def fold(part):
+        nonlocal merged
+        merged = part if merged is None else merged.merge(part)
+
+    if workers <= 1:
+        for chunk in chunks:
+            fold(fn(chunk))
+        return merged
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(fn, chunk))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fold(future.result())
+        for future in pending:
+            fold(future.result())
+    return merged
+
+
+# ============================================================
+# 3. Summary
+# ============================================================
+def _quantiles(first: FirstPass, col: str, qs, cls=None):
+    """
+    Exact percentiles from the (value, class) counter while the column has few
+    distinct values, the quantile sketch otherwise.
+    """
+    counter = first.counters[col]
+    if counter.overflow:
+        sketch = first.quantiles[col] if cls is None else first.class_quantiles[col][cls]
+        return sketch.quantiles(qs)
+    weights = {}
+    for (v, c), n in counter.counts.items():
+        if cls is None or c == cls:
+            weights[v] = weights.get(v, 0) + n
+    values = np.array(sorted(weights), dtype=float)
+    cum = np.cumsum([weights[v] for v in sorted(weights)])
+    # np.percentile's linear interpolation on the expanded, sorted values
+    pos = np.asarray(qs, dtype=float) * (cum[-1] - 1)
+    lo = values[np.searchsorted(cum, np.floor(pos), side="right")]
+    hi = values[np.minimum(np.searchsorted(cum, np.floor(pos) + 1, side="right"), len(values) - 1)]
+    return lo + (pos - np.floor(pos)) * (hi - lo)
+
+
+def _columns(first: FirstPass) -> dict:
+    return {col: {"dtype": str(first.dtypes[col]), "is_object": col not in first.schema["numeric"],
+                  "nunique": min(first.counters[col].nunique, NUNIQUE_CAP + 1)}
+            for col in first.schema["columns"]}
+
+
+def _plan(first: FirstPass) -> dict:
+    """Bin edges, box fences and association column kinds for pass 2, fixed by pass 1."""
+    numeric = {}
+    for col in first.schema["numeric"]:
+        n = first.moments[col].n
+        if not n:
+            continue
+        vmin, vmax = first.minmax[col]
+        q1, q3 = _quantiles(first, col, [0.25, 0.75])
+        fences = {}
+        for c in first.class_quantiles[col]:
+            cq1, cq3 = _quantiles(first, col, [0.25, 0.75], c)
+            fences[c] = (cq1 - 1.5 * (cq3 - cq1), cq3 + 1.5 * (cq3 - cq1))
+        numeric[col] = {"edges": auto_bin_edges(n, vmin, vmax, q3 - q1),
+                        "fine_edges": np.linspace(vmin, vmax, KDE_FINE_BINS + 1)
+                        if vmax > vmin else np.array([vmin - 0.5, vmax + 0.5]),
+                        "fences": fences}
+    engine = association_engine({"columns": _columns(first)})
+    return {"schema": first.schema, "numeric": numeric,
+            "associations": {"numeric": engine.numeric, "categorical": engine.categorical,
+                             "columns": engine.columns}}
+
+
+def _finalize(first: FirstPass, second: SecondPass, plan: dict) -> dict:
+    schema, target = first.schema, first.schema["target"]
+    classes = sorted(first.target_counts)
+    summary = {"n_rows": sum(first.target_counts.values()), "target": target,
+               "columns": _columns(first), "crosstabs": {}, "numeric": {},
+               "target_counts": {_json_key(c): first.target_counts[c] for c in classes}}
+
+    for col in schema["columns"]:
+        dtype = first.dtypes[col]
+        counter = first.counters[col]
+        if counter.nunique <= MAX_LEVELS and col != target:
+            levels, counts = counter.table(classes)
+            if col in schema["numeric"]:
+                levels = np.asarray(levels, dtype=dtype)
+            summary["crosstabs"][col] = {"levels": [_json_key(v) for v in levels],
+                                         "classes": [_json_key(c) for c in classes],
+                                         "counts": counts}
+
+        if col not in plan["numeric"] or col == target:
+            continue
+        moments, n = first.moments[col], first.moments[col].n
+        std = float(moments.std()[0]) if n > 1 else 0.0
+        boxes = {}
+        for c in classes:
+            if c not in first.class_quantiles[col]:
+                continue
+            q1, med, q3 = _quantiles(first, col, [0.25, 0.5, 0.75], c)
+            tails = second.tails[col][c]
+            # like cbook.boxplot_stats: whiskers never fall inside the box
+            boxes[_json_key(c)] = box_stats(q1, med, q3, max(tails.whishi, q3), min(tails.whislo, q1), tails.fliers)
+        summary["numeric"][col] = {
+            "count": int(n), "min": float(first.minmax[col][0]), "max": float(first.minmax[col][1]),
+            "mean": float(moments.mean[0]), "std": std,
+            "hist": {"edges": _compact(second.hist[col].edges), "counts": second.hist[col].counts.tolist()},
+            "kde": kde_from_histogram(second.fine[col].edges, second.fine[col].counts, std, n),
+            "box": boxes,
+        }
+
+    summary["associations"] = second.associations.to_dict()
+    return summary
+
+
+def summarize_csv(path: str, target: str = TARGET, chunksize: int = CHUNKSIZE, workers: int = None) -> dict:
+    """Build the EDA summary of a CSV file in two chunked passes with bounded memory."""
+    workers = workers or stage_budget()
+    head = pd.read_csv(path, nrows=1000)
+    schema = {"target": target, "columns": list(head.columns),
+              "numeric": [c for c in head.columns if pd.api.types.is_numeric_dtype(head[c])]}
+
+    first = map_merge(partial(_first_pass, schema=schema), pd.read_csv(path, chunksize=chunksize), workers)
+    plan = _plan(first)
+    second = map_merge(partial(_second_pass, plan=plan), pd.read_csv(path, chunksize=chunksize), workers)
+    summary = _finalize(first, second, plan)
+    print(f"✅ Streamed EDA summary over {summary['n_rows']:,} rows "
+          f"(chunks of {chunksize:,}, {workers} worker(s))")
+    return summary
+
+
+# ============================================================
+# 4. CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming EDA summary of a large CSV file")
+    parser.add_argument("path", help="CSV file to summarise")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--target", default=TARGET)
+    parser.add_argument("--out", default=SUMMARY_PATH, help="Where to write the summary JSON")
+    args = parser.parse_args(argv)
+    save_summary(summarize_csv(args.path, args.target, args.chunksize, args.workers), args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# src/eda/summary.py
+"""
+EDA statistics summary — everything the EDA figures need, computed once.
+
+A single pass over the data produces a compact, JSON-serialisable summary:
+target counts, per-level churn counts for low-cardinality columns,
+histogram bins, binned KDE curves and box-plot statistics per churn class
+for numerical columns, and the association state behind the heatmap
+(`src.eda.associations`). The plot functions in
+`src.eda` draw from this summary only, so rendering cost does not depend
+on the number of rows.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from matplotlib import cbook
+
+from src.eda.associations import AssociationEngine, split_columns
+
+SUMMARY_PATH = "reports/eda_results/eda_stats.json"
+TARGET = "Churn"
+MAX_LEVELS = 6          # columns with at most this many distinct values are treated as categorical
+NUNIQUE_CAP = 50        # distinct values are counted exactly up to this cap
+KDE_FINE_BINS = 1024    # resolution of the histogram the KDE is smoothed from
+KDE_GRIDSIZE = 200      # seaborn's kdeplot defaults: 200 points, cut=3
+KDE_CUT = 3
+MAX_FLIERS = 200        # distinct outliers kept per box
+
+
+# ============================================================
+# 1. Building blocks shared with the streaming path
+# ============================================================
+def auto_bin_edges(n, vmin, vmax, iqr):
+    """numpy's "auto" rule (min width of Sturges and Freedman–Diaconis), as seaborn's histplot."""
+    if vmax <= vmin:
+        return np.array([vmin - 0.5, vmax + 0.5])
+    span = vmax - vmin
+    sturges = span / (np.log2(n) + 1.0)
+    fd = 2.0 * iqr * n ** (-1.0 / 3.0)
+    width = min(fd, sturges) if fd > 0 else sturges
+    n_bins = max(1, int(np.ceil(span / width)))
+    return np.linspace(vmin, vmax, n_bins + 1)
+
+
+def kde_from_histogram(edges, counts, std, n, gridsize=KDE_GRIDSIZE, cut=KDE_CUT):
+    """Gaussian KDE (Scott's bandwidth) evaluated from a fine histogram instead of raw rows."""
+    if n < 2 or std <= 0:
+        return None
+    bw = std * n ** (-1.0 / 5.0)
+    x = np.linspace(edges[0] - cut * bw, edges[-1] + cut * bw, gridsize)
+    centers = (np.asarray(edges[:-1]) + np.asarray(edges[1:])) / 2
+    counts = np.asarray(counts, dtype=float)
+    keep = counts > 0
+    z = (x[:, None] - centers[keep][None, :]) / bw
+    y = (np.exp(-0.5 * z ** 2) @ counts[keep]) / (n * bw * np.sqrt(2 * np.pi))
+    return {"x": _compact(x), "y": _compact(y), "bw": float(bw)}
+
+
+def box_stats(q1, med, q3, values_inside_max, values_inside_min, fliers):
+    fliers = np.unique(np.asarray(fliers, dtype=float))
+    if len(fliers) > MAX_FLIERS:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, MAX_FLIERS).round().astype(int)]
+    return {"q1": float(q1), "med": float(med), "q3": float(q3),
+            "whislo": float(values_inside_min), "whishi": float(values_inside_max),
+            "fliers": fliers.tolist()}
+
+
+def _compact(values, digits=6):
+    """Plot-resolution floats keep the JSON artifact small."""
+    return [float(f"{v:.{digits}g}") for v in np.asarray(values, dtype=float)]
+
+
+def _json_key(value):
+    value = value.item() if hasattr(value, "item") else value
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+# ============================================================
+# 2. In-memory summary
+# ============================================================
+def compute_summary(df: pd.DataFrame, target: str = TARGET) -> dict:
+    """Summarise a DataFrame for every EDA figure (one pass per column)."""
+    n = len(df)
+    summary = {"n_rows": n, "target": target, "columns": {}, "crosstabs": {}, "numeric": {}}
+    y = df[target].to_numpy()
+    classes = np.unique(y)
+    summary["target_counts"] = {_json_key(c): int((y == c).sum()) for c in classes}
+
+    for col in df.columns:
+        s = df[col]
+        is_object = not pd.api.types.is_numeric_dtype(s)
+        codes, levels = pd.factorize(s, sort=True)
+        summary["columns"][col] = {"dtype": str(s.dtype), "is_object": is_object,
+                                   "nunique": int(min(len(levels), NUNIQUE_CAP + 1))}
+
+        if len(levels) <= MAX_LEVELS and col != target:
+            table = np.zeros((len(levels), len(classes)), dtype=np.int64)
+            target_codes = np.searchsorted(classes, y)
+            np.add.at(table, (codes[codes >= 0], target_codes[codes >= 0]), 1)
+            summary["crosstabs"][col] = {"levels": [_json_key(v) for v in levels],
+                                         "classes": [_json_key(c) for c in classes],
+                                         "counts": table.tolist()}
+
+        if is_object or col == target:
+            continue
+        x = s.to_numpy(dtype=float)
+        x = x[~np.isnan(x)]
+        q1, q3 = np.percentile(x, [25, 75])
+        edges = auto_bin_edges(len(x), x.min(), x.max(), q3 - q1)
+        fine_counts, fine_edges = np.histogram(x, bins=KDE_FINE_BINS, range=(x.min(), x.max()))
+        values = s.to_numpy(dtype=float)
+        boxes = {}
+        for c in classes:
+            v = values[y == c]
+            st = cbook.boxplot_stats(v[~np.isnan(v)])[0]
+            boxes[_json_key(c)] = box_stats(st["q1"], st["med"], st["q3"], st["whishi"], st["whislo"], st["fliers"])
+        summary["numeric"][col] = {
+            "count": int(len(x)), "min": float(x.min()), "max": float(x.max()),
+            "mean": float(x.mean()), "std": float(x.std(ddof=1)) if len(x) > 1 else 0.0,
+            "hist": {"edges": _compact(edges), "counts": np.histogram(x, bins=edges)[0].tolist()},
+            "kde": kde_from_histogram(fine_edges, fine_counts, x.std(ddof=1) if len(x) > 1 else 0.0, len(x)),
+            "box": boxes,
+        }
+
+    summary["associations"] = association_engine(summary).update(df).to_dict()
+    return summary
+
+
+def association_engine(summary: dict) -> AssociationEngine:
+    """An empty engine over the summarised columns, split into numeric and categorical."""
+    numeric, categorical = split_columns(summary["columns"], MAX_LEVELS)
+    return AssociationEngine(numeric, categorical, [c for c in summary["columns"] if c in numeric + categorical])
+
+
+# ============================================================
+# 3. Persistence / helpers for the plot functions
+# ============================================================
+def save_summary(summary: dict, path: str = SUMMARY_PATH) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, separators=(",", ":"), allow_nan=True)
+    print(f"✅ EDA summary statistics saved to {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+    return path
+
+
+def load_summary(path: str = SUMMARY_PATH) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def ensure_summary(data) -> dict:
+    """Accept either a raw DataFrame (summarised on the fly) or an existing summary."""
+    return compute_summary(data) if isinstance(data, pd.DataFrame) else data
@@ -3,13 +3,11 @@
 Utility functions for EDA visualizations.
 """
 
-import os
+from src.rendering import save_figure
+
 
 def save_fig(fig, save_dir, filename):
     """
-    Save a Matplotlib figure to the given directory.
+    Save a Matplotlib figure to the given directory (resolution / format from `src.rendering`).
     """
-    os.makedirs(save_dir, exist_ok=True)
-    path = os.path.join(save_dir, filename)
-    fig.savefig(path, bbox_inches="tight")
-    print(f"✅ Saved figure: {path}")
+    return save_figure(fig, save_dir, filename)
@@ -0,0 +1,148 @@
+"""
+encoder.py
+----------
+Persisted categorical encoder shared by training, batch scoring and the API.
+
+`CategoricalEncoder` stores, per column, the sorted category list that
+`LabelEncoder` would produce (so codes are identical to the historical
+processed dataset) and encodes whole columns with vectorized binary-search
+lookups instead of per-value Python (a dict lookup for inputs of at most
+SMALL_INPUT values). Categories not seen during fitting follow a defined
+fallback (`handle_unknown`).
+
+Column encoding uses `np.searchsorted` on the sorted category array — the
+same lookup `LabelEncoder.transform` performs — on fixed-width string arrays.
+"""
+
+from typing import Dict, Iterable, List, Optional, Union
+import joblib
+import numpy as np
+import pandas as pd
+
+ENCODER_PATH = "models/categorical_encoder.joblib"
+
+# Below this many values a dict lookup beats building a pandas Index
+SMALL_INPUT = 32
+
+
+class CategoricalEncoder:
+    """
+    Column-wise category → integer code tables.
+
+    Args:
+        categories (dict, optional): Pre-computed `{column: sorted categories}`.
+        handle_unknown (str | int): "missing" maps unseen values to NaN (XGBoost
+            then follows each split's default branch), "error" raises, and an
+            integer is used as the code directly.
+    """
+
+    def __init__(self, categories: Optional[Dict[str, List[str]]] = None,
+                 handle_unknown: Union[str, int] = "missing"):
+        self.categories: Dict[str, List[str]] = dict(categories or {})
+        self.handle_unknown = handle_unknown
+        self._sorted: Dict[str, np.ndarray] = {}
+        self._lookup: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------
+    # Fitting
+    # ------------------------------------------------------------
+    def fit(self, df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> "CategoricalEncoder":
+        """Fit on every non-numeric column (or the given ones) of a DataFrame."""
+        self.categories = {}
+        return self.partial_fit(df, columns)
+
+    def partial_fit(self, df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> "CategoricalEncoder":
+        """Merge the categories of one chunk into the tables (for streaming fits)."""
+        if columns is None:
+            columns = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+        for col in columns:
+            seen = set(self.categories.get(col, []))
+            seen.update(df[col].astype(str).unique())
+            self.categories[col] = sorted(seen)
+        self._sorted.clear()
+        self._lookup.clear()
+        return self
+
+    # ------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------
+    def __contains__(self, column: str) -> bool:
+        return column in self.categories
+
+    def _get_sorted(self, column: str) -> np.ndarray:
+        if column not in self._sorted:
+            self._sorted[column] = np.asarray(self.categories[column], dtype=str)
+        return self._sorted[column]
+
+    def _lookup_strings(self, column: str, values: np.ndarray) -> np.ndarray:
+        """Vectorized code lookup for an array of strings (-1 where unseen)."""
+        cats = self._get_sorted(column)
+        values = np.asarray(values, dtype=str)
+        if len(cats) == 0:
+            return np.full(len(values), -1.0)
+        pos = np.searchsorted(cats, values).clip(max=len(cats) - 1)
+        return np.where(cats[pos] == values, pos, -1).astype(np.float64)
+
+    def _get_lookup(self, column: str) -> Dict[str, int]:
+        if column not in self._lookup:
+            self._lookup[column] = {c: i for i, c in enumerate(self.categories[column])}
+        return self._lookup[column]
+
+    def encode_column(self, column: str, values) -> np.ndarray:
+        """
+        Encode one column. Values that are already numeric codes pass through,
+        strings are looked up. Returns int64 codes, or float64 when the
+        "missing" fallback produced NaN.
+        """
+        if isinstance(values, (pd.Series, np.ndarray)):
+            values = np.asarray(values)
+            if np.issubdtype(values.dtype, np.number):
+                return self._apply_fallback(column, values.astype(np.float64), np.zeros(len(values), bool), values)
+            if values.dtype != object:  # fixed-width strings: fully vectorized
+                codes = self._lookup_strings(column, values)
+                return self._apply_fallback(column, codes, codes == -1, values)
+
+        values = list(values)
+        is_str = np.array([isinstance(v, str) for v in values], dtype=bool)
+        if len(values) <= SMALL_INPUT:
+            lookup = self._get_lookup(column)
+            codes = np.array([lookup.get(v, -1) if s else v for v, s in zip(values, is_str)], dtype=np.float64)
+        else:
+            codes = np.empty(len(values), dtype=np.float64)
+            obj = np.array(values, dtype=object)
+            codes[~is_str] = obj[~is_str].astype(np.float64)
+            codes[is_str] = self._lookup_strings(column, obj[is_str])
+        return self._apply_fallback(column, codes, is_str & (codes == -1), values)
+
+    def _apply_fallback(self, column, codes: np.ndarray, unknown: np.ndarray, values) -> np.ndarray:
+        if unknown.any():
+            if self.handle_unknown == "error":
+                bad = sorted({str(v) for v, u in zip(values, unknown) if u})
+                raise ValueError(f"Unknown categories for '{column}': {bad}")
+            codes[unknown] = np.nan if self.handle_unknown == "missing" else self.handle_unknown
+        if np.isnan(codes).any():
+            return codes
+        return codes.astype(np.int64)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Encode every fitted column present in `df` (a copy is returned)."""
+        out = df.copy()
+        for col in self.categories:
+            if col in out.columns and not pd.api.types.is_numeric_dtype(out[col]):
+                out[col] = self.encode_column(col, out[col].to_numpy(dtype=str))
+        return out
+
+    def fit_transform(self, df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        return self.fit(df, columns).transform(df)
+
+    # ------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------
+    def save(self, path: str = ENCODER_PATH) -> None:
+        joblib.dump({"categories": self.categories, "handle_unknown": self.handle_unknown}, path)
+        print(f"💾 Categorical encoder saved to {path}")
+
+    @classmethod
+    def load(cls, path: str = ENCODER_PATH, handle_unknown: Optional[Union[str, int]] = None) -> "CategoricalEncoder":
+        state = joblib.load(path)
+        return cls(state["categories"], handle_unknown if handle_unknown is not None else state["handle_unknown"])
@@ -3,24 +3,290 @@
 Model Evaluation Utilities
 --------------------------
 This module evaluates trained models using metrics and visualization.
+
+`EvaluationEngine` scores once and sorts once: every metric (ROC / PR
+curves and AUCs, confusion matrices at every threshold, lift / gain by
+decile, classification report at any threshold) is read off cumulative
+sums over the sorted scores, so it stays O(n log n) on tens of millions of
+rows instead of re-sorting for each metric.
+
+`bootstrap_metrics` / `paired_bootstrap` put percentile intervals on ROC AUC,
+PR AUC and accuracy; resamples are processed in batches as weight matrices
+rather than one sklearn call per resample.
 """
 
-import os
-import joblib
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.metrics import (
-    classification_report,
-    roc_auc_score,
-    roc_curve,
-    precision_recall_curve,
-    average_precision_score,
-    accuracy_score
-)
+import pandas as pd
+from src.rendering import RenderJob, new_figure, render_jobs, save_figure
 from src.utils import ensure_dir
 
+EVAL_DIR = "reports/model_eval"
+
+
+# ============================================================
+# 1. Single-pass evaluation engine
+# ============================================================
+class EvaluationEngine:
+    """
+    Args:
+        y_true (array-like): Binary labels (0/1).
+        y_prob (array-like): Scores for the positive class.
+    """
+
+    def __init__(self, y_true, y_prob):
+        y_true = np.asarray(y_true).astype(np.int8, copy=False)
+        y_prob = np.asarray(y_prob, dtype=np.float64)
+        order = np.argsort(y_prob, kind="stable")[::-1]
+        self.scores = y_prob[order]
+        self.n = len(self.scores)
+        self.positives = int(y_true.sum())
+        self.negatives = self.n - self.positives
+        self._tp_cum = np.cumsum(y_true[order], dtype=np.int64)
+
+        # one curve point per distinct score (last row of each tie block)
+        last = np.r_[np.flatnonzero(np.diff(self.scores)), self.n - 1]
+        self.thresholds = self.scores[last]
+        self.tps = self._tp_cum[last]
+        self.fps = (last + 1) - self.tps
+
+    # ---------- counts at a threshold ----------
+    def _n_predicted(self, threshold, inclusive=True) -> int:
+        # scores are descending; count scores >= threshold (or > threshold)
+        side = "left" if inclusive else "right"
+        return self.n - int(np.searchsorted(self.scores[::-1], threshold, side=side))
+
+    def confusion(self, threshold=0.5, inclusive=True) -> dict:
+        """Confusion matrix with rows predicted positive when score >= threshold (> if not inclusive)."""
+        k = self._n_predicted(threshold, inclusive)
+        tp = int(self._tp_cum[k - 1]) if k else 0
+        fp = k - tp
+        return {"tp": tp, "fp": fp, "fn": self.positives - tp, "tn": self.negatives - fp}
+
+    def confusion_matrices(self) -> pd.DataFrame:
+        """Confusion matrix at every distinct threshold (score >= threshold is positive)."""
+        return pd.DataFrame({
+            "threshold": self.thresholds,
+            "tp": self.tps,
+            "fp": self.fps,
+            "fn": self.positives - self.tps,
+            "tn": self.negatives - self.fps,
+        })
+
+    # ---------- curves ----------
+    def roc_curve(self):
+        fpr = np.r_[0.0, self.fps / max(self.negatives, 1)]
+        tpr = np.r_[0.0, self.tps / max(self.positives, 1)]
+        return fpr, tpr, np.r_[np.inf, self.thresholds]
+
+    def pr_curve(self):
+        precision = self.tps / (self.tps + self.fps)
+        recall = self.tps / max(self.positives, 1)
+        return precision, recall, self.thresholds
+
+    def roc_auc(self) -> float:
+        fpr, tpr, _ = self.roc_curve()
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    def pr_auc(self) -> float:
+        """Average precision (step-wise area, as `sklearn.metrics.average_precision_score`)."""
+        precision, recall, _ = self.pr_curve()
+        return float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+
+    # ---------- lift / gain ----------
+    def lift_table(self, n_bins=10) -> pd.DataFrame:
+        """Lift and cumulative gain per score decile (bin 1 = highest scores)."""
+        edges = np.linspace(0, self.n, n_bins + 1).round().astype(np.int64)
+        cum_pos = np.r_[0, self._tp_cum][edges]
+        rows = np.diff(edges)
+        pos = np.diff(cum_pos)
+        base_rate = self.positives / max(self.n, 1)
+        rate = np.divide(pos, rows, out=np.zeros(n_bins), where=rows > 0)
+        return pd.DataFrame({
+            "decile": np.arange(1, n_bins + 1),
+            "rows": rows,
+            "positives": pos,
+            "response_rate": rate,
+            "lift": rate / base_rate if base_rate else np.nan,
+            "cumulative_gain": cum_pos[1:] / max(self.positives, 1),
+            "min_score": self.scores[np.maximum(edges[1:] - 1, 0)],
+        })
+
+    # ---------- threshold metrics ----------
+    def accuracy(self, threshold=0.5, inclusive=True) -> float:
+        c = self.confusion(threshold, inclusive)
+        return (c["tp"] + c["tn"]) / max(self.n, 1)
+
+    def classification_report(self, threshold=0.5, inclusive=True, digits=2) -> str:
+        """Text report laid out like `sklearn.metrics.classification_report` for classes 0 and 1."""
+        c = self.confusion(threshold, inclusive)
+
+        def prf(tp, fp, fn):
+            p = tp / (tp + fp) if tp + fp else 0.0
+            r = tp / (tp + fn) if tp + fn else 0.0
+            f = 2 * p * r / (p + r) if p + r else 0.0
+            return p, r, f
+
+        per_class = [
+            ("0", *prf(c["tn"], c["fn"], c["fp"]), self.negatives),
+            ("1", *prf(c["tp"], c["fp"], c["fn"]), self.positives),
+        ]
+        support = np.array([row[4] for row in per_class])
+        stats = np.array([row[1:4] for row in per_class])
+        macro = stats.mean(axis=0)
+        weighted = (stats * support[:, None]).sum(axis=0) / max(support.sum(), 1)
+
+        width = len("weighted avg")
+        head_fmt = "{:>{width}s} " + " {:>9}" * 4
+        row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
+        report = head_fmt.format("", "precision", "recall", "f1-score", "support", width=width) + "\n\n"
+        for name, p, r, f, s in per_class:
+            report += row_fmt.format(name, p, r, f, s, width=width, digits=digits)
+        report += "\n"
+        report += ("{:>{width}s} " + " {:>9.{digits}}" * 2 + " {:>9.{digits}f}" + " {:>9}\n").format(
+            "accuracy", "", "", self.accuracy(threshold, inclusive), self.n, width=width, digits=digits)
+        report += row_fmt.format("macro avg", *macro, self.n, width=width, digits=digits)
+        report += row_fmt.format("weighted avg", *weighted, self.n, width=width, digits=digits)
+        return report
+
+    @staticmethod
+    def downsample(*curve, max_points=2000):
+        """Thin a curve to at most `max_points` points for plotting (keeps both ends)."""
+        n = len(curve[0])
+        if n <= max_points:
+            return curve
+        idx = np.unique(np.linspace(0, n - 1, max_points).round().astype(np.int64))
+        return tuple(c[idx] for c in curve)
+
+
+# ============================================================
+# 2. Bootstrap confidence intervals (batched resampling)
+# ============================================================
+BOOTSTRAP_METRICS = ("roc_auc", "pr_auc", "accuracy")
+
+
+def _resample_counts(rng, n, batch):
+    """Multiplicity of every row in `batch` bootstrap resamples, shape (batch, n)."""
+    idx = rng.integers(0, n, size=(batch, n)) + (np.arange(batch) * n)[:, None]
+    return np.bincount(idx.ravel(), minlength=batch * n).reshape(batch, n)
+
 
-def evaluate_model(model, X_test, y_test, model_name="model"):
+def _weighted_metrics(y_true, y_prob, counts, threshold, inclusive):
+    """ROC AUC, average precision and accuracy for every row of `counts` at once."""
+    order = np.argsort(y_prob, kind="stable")[::-1]
+    scores = y_prob[order]
+    y = y_true[order]
+    w = counts[:, order]
+
+    # aggregate each tie block so tied scores form a single curve step
+    starts = np.r_[0, np.flatnonzero(np.diff(scores)) + 1]
+    pos = np.add.reduceat(w * y, starts, axis=1)
+    neg = np.add.reduceat(w * (1 - y), starts, axis=1)
+    tps = np.cumsum(pos, axis=1)
+    fps = np.cumsum(neg, axis=1)
+    p_tot, n_tot = tps[:, -1], fps[:, -1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prev_tps = np.c_[np.zeros(len(w)), tps[:, :-1]]
+        roc_auc = np.sum(neg * (tps + prev_tps) / 2, axis=1) / (p_tot * n_tot)
+        precision = np.where(tps + fps > 0, tps / (tps + fps), 0.0)
+        pr_auc = np.sum(pos * precision, axis=1) / p_tot
+
+    # predicted positive = first k sorted rows; k depends on the threshold only
+    k = len(scores) - int(np.searchsorted(scores[::-1], threshold, side="left" if inclusive else "right"))
+    tp_k = w[:, :k] @ y[:k] if k else np.zeros(len(w))
+    fp_k = w[:, :k].sum(axis=1) - tp_k if k else np.zeros(len(w))
+    accuracy = (tp_k + n_tot - fp_k) / w.sum(axis=1)
+    return {"roc_auc": roc_auc, "pr_auc": pr_auc, "accuracy": accuracy}
+
+
+def _bootstrap(y_true, probs, n_boot, seed, threshold, inclusive, batch_size):
+    y_true = np.asarray(y_true).astype(np.int64)
+    probs = [np.asarray(p, dtype=np.float64) for p in probs]
+    rng = np.random.default_rng(seed)
+    out = [{m: [] for m in BOOTSTRAP_METRICS} for _ in probs]
+    for start in range(0, n_boot, batch_size):
+        counts = _resample_counts(rng, len(y_true), min(batch_size, n_boot - start))
+        for acc, p in zip(out, probs):   # same resamples for every model → paired
+            for m, values in _weighted_metrics(y_true, p, counts, threshold, inclusive).items():
+                acc[m].append(values)
+    return [{m: np.concatenate(v) for m, v in acc.items()} for acc in out]
+
+
+def bootstrap_metrics(y_true, y_prob, n_boot=2000, alpha=0.05, threshold=0.5, inclusive=False,
+                      seed=42, batch_size=256):
+    """
+    Percentile bootstrap intervals for ROC AUC, PR AUC and accuracy.
+
+    Resamples are drawn as a (batch, n) matrix of row multiplicities and all
+    metrics are computed for the whole batch with array operations.
+
+    Returns:
+        dict: metric → {"estimate", "low", "high"}
+    """
+    engine = EvaluationEngine(y_true, y_prob)
+    point = {"roc_auc": engine.roc_auc(), "pr_auc": engine.pr_auc(),
+             "accuracy": engine.accuracy(threshold, inclusive)}
+    (samples,) = _bootstrap(y_true, [y_prob], n_boot, seed, threshold, inclusive, batch_size)
+    q = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+    return {
+        m: dict(zip(("estimate", "low", "high"), map(float, (point[m], *np.nanpercentile(samples[m], q)))))
+        for m in BOOTSTRAP_METRICS
+    }
+
+
+def paired_bootstrap(y_true, prob_a, prob_b, n_boot=2000, alpha=0.05, threshold=0.5, inclusive=False,
+                     seed=42, batch_size=256):
+    """
+    Paired bootstrap of metric(b) - metric(a) on the same resamples.
+
+    Returns:
+        dict: metric → {"diff", "low", "high", "p_value"} (two-sided bootstrap p-value)
+    """
+    a, b = EvaluationEngine(y_true, prob_a), EvaluationEngine(y_true, prob_b)
+    point = {
+        "roc_auc": b.roc_auc() - a.roc_auc(),
+        "pr_auc": b.pr_auc() - a.pr_auc(),
+        "accuracy": b.accuracy(threshold, inclusive) - a.accuracy(threshold, inclusive),
+    }
+    sa, sb = _bootstrap(y_true, [prob_a, prob_b], n_boot, seed, threshold, inclusive, batch_size)
+    q = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+    result = {}
+    for m in BOOTSTRAP_METRICS:
+        d = sb[m] - sa[m]
+        d = d[~np.isnan(d)]
+        p_value = min(1.0, 2 * min(np.mean(d <= 0), np.mean(d >= 0)))
+        result[m] = {"diff": float(point[m]), "low": float(np.percentile(d, q[0])),
+                     "high": float(np.percentile(d, q[1])), "p_value": float(p_value)}
+    return result
+
+
+# ============================================================
+# 3. Evaluation report + plots
+# ============================================================
+def render_roc_curve(fpr, tpr, roc_auc, model_name, folder=EVAL_DIR) -> str:
+    fig, ax = new_figure(figsize=(6, 5))
+    ax.plot(fpr, tpr, label=f"{model_name} (AUC={roc_auc:.3f})")
+    ax.plot([0, 1], [0, 1], "--", color="gray")
+    ax.set_title(f"ROC Curve — {model_name}")
+    ax.set_xlabel("False Positive Rate")
+    ax.set_ylabel("True Positive Rate")
+    ax.legend()
+    ax.grid(alpha=0.3)
+    return save_figure(fig, folder, f"{model_name}_roc.png", dpi=120)
+
+
+def render_pr_curve(recall, precision, pr_auc, model_name, folder=EVAL_DIR) -> str:
+    fig, ax = new_figure(figsize=(6, 5))
+    ax.plot(recall, precision, label=f"{model_name} (PR AUC={pr_auc:.3f})")
+    ax.set_title(f"Precision-Recall Curve — {model_name}")
+    ax.set_xlabel("Recall")
+    ax.set_ylabel("Precision")
+    ax.legend()
+    ax.grid(alpha=0.3)
+    return save_figure(fig, folder, f"{model_name}_pr.png", dpi=120)
+
+
+def evaluate_model(model, X_test, y_test, model_name="model", oof=None, n_boot=2000):
     """
     Evaluate a trained model on test data and save metrics & plots.
 
@@ -29,65 +295,70 @@ def evaluate_model(model, X_test, y_test, model_name="model"):
         X_test (pd.DataFrame): Test features.
         y_test (pd.Series): True labels.
         model_name (str): Name of the model for saving reports.
+        oof (CVResult, optional): Out-of-fold predictions from `src.cv_engine`;
+            adds the CV AUC and an F1-optimal threshold chosen on them.
+        n_boot (int): Bootstrap resamples for the 95% intervals (0 disables them).
 
     Returns:
-        dict: Evaluation metrics (accuracy, roc_auc, pr_auc)
+        dict: Evaluation metrics (accuracy, roc_auc, pr_auc, *_ci[, cv_roc_auc, threshold])
     """
 
-    ensure_dir("reports/model_eval")
+    ensure_dir(EVAL_DIR)
 
-    # --- Predict ---
-    y_pred = model.predict(X_test)
+    # --- Score once; labels at 0.5 use `predict`'s strict ">" rule ---
     y_prob = model.predict_proba(X_test)[:, 1]
+    engine = EvaluationEngine(y_test, y_prob)
 
     # --- Compute Metrics ---
-    roc_auc = roc_auc_score(y_test, y_prob)
-    pr_auc = average_precision_score(y_test, y_prob)
-    acc = accuracy_score(y_test, y_pred)
+    roc_auc = engine.roc_auc()
+    pr_auc = engine.pr_auc()
+    acc = engine.accuracy(0.5, inclusive=False)
+    report = engine.classification_report(0.5, inclusive=False)
+    lift = engine.lift_table()
+    ci = bootstrap_metrics(y_test, y_prob, n_boot=n_boot) if n_boot else {}
 
     print(f"\n=== {model_name} — Classification Report ===")
-    print(classification_report(y_test, y_pred))
+    print(report)
 
     # --- Save report ---
-    report_path = f"reports/model_eval/{model_name}_report.txt"
+    report_path = f"{EVAL_DIR}/{model_name}_report.txt"
     with open(report_path, "w") as f:
         f.write(f"=== {model_name} — Classification Report ===\n\n")
-        f.write(classification_report(y_test, y_pred))
+        f.write(report)
         f.write(f"\nROC AUC: {roc_auc:.3f}\nPR AUC: {pr_auc:.3f}\nAccuracy: {acc:.3f}\n")
+        if ci:
+            f.write(f"\n95% bootstrap CI ({n_boot} resamples):\n")
+            for name, label in [("roc_auc", "ROC AUC"), ("pr_auc", "PR AUC"), ("accuracy", "Accuracy")]:
+                f.write(f"  {label:<9} [{ci[name]['low']:.3f}, {ci[name]['high']:.3f}]\n")
+        if oof is not None:
+            threshold = oof.best_threshold()
+            f.write(f"\nOOF ROC AUC ({len(oof.fold_scores)} folds): {oof.oof_auc:.3f}\n")
+            f.write(f"F1-optimal threshold (from OOF): {threshold:.3f}\n\n")
+            f.write(engine.classification_report(threshold))
+        f.write("\n=== Lift / gain by decile ===\n")
+        f.write(lift.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        f.write("\n")
+    lift_path = f"{EVAL_DIR}/{model_name}_lift.csv"
+    lift.to_csv(lift_path, index=False)
+    print(f"✅ Saved lift table: {lift_path}")
 
-    # --- ROC Curve ---
-    fpr, tpr, _ = roc_curve(y_test, y_prob)
-    plt.figure(figsize=(6, 5))
-    plt.plot(fpr, tpr, label=f"{model_name} (AUC={roc_auc:.3f})")
-    plt.plot([0, 1], [0, 1], "--", color="gray")
-    plt.title(f"ROC Curve — {model_name}")
-    plt.xlabel("False Positive Rate")
-    plt.ylabel("True Positive Rate")
-    plt.legend()
-    plt.grid(alpha=0.3)
-    roc_path = f"reports/model_eval/{model_name}_roc.png"
-    plt.savefig(roc_path, dpi=120, bbox_inches="tight")
-    plt.close()
-    print(f"✅ Saved ROC Curve: {roc_path}")
-
-    # --- Precision-Recall Curve ---
-    prec, recall, _ = precision_recall_curve(y_test, y_prob)
-    plt.figure(figsize=(6, 5))
-    plt.plot(recall, prec, label=f"{model_name} (PR AUC={pr_auc:.3f})")
-    plt.title(f"Precision-Recall Curve — {model_name}")
-    plt.xlabel("Recall")
-    plt.ylabel("Precision")
-    plt.legend()
-    plt.grid(alpha=0.3)
-    pr_path = f"reports/model_eval/{model_name}_pr.png"
-    plt.savefig(pr_path, dpi=120, bbox_inches="tight")
-    plt.close()
-    print(f"✅ Saved PR Curve: {pr_path}")
+    # --- ROC / Precision-Recall curves (rendered in parallel, pyplot-free) ---
+    fpr, tpr = engine.downsample(*engine.roc_curve()[:2])
+    prec, recall = engine.downsample(*engine.pr_curve()[:2])
+    render_jobs([
+        RenderJob(render_roc_curve, (fpr, tpr, roc_auc, model_name)),
+        RenderJob(render_pr_curve, (np.r_[0.0, recall], np.r_[1.0, prec], pr_auc, model_name)),
+    ])
 
     print(f"✅ {model_name} evaluation completed.\n")
 
-    return {
+    metrics = {
         "accuracy": acc,
         "roc_auc": roc_auc,
         "pr_auc": pr_auc
     }
+    for name, interval in ci.items():
+        metrics[f"{name}_ci"] = (interval["low"], interval["high"])
+    if oof is not None:
+        metrics.update(cv_roc_auc=oof.oof_auc, threshold=threshold)
+    return metrics
@@ -7,20 +7,42 @@ This module provides:
 1. A lightweight `train_model()` for pytest validation
 2. Baseline RandomForest training
 3. Tuned RandomForest and XGBoost training with cross-validation
+4. Budgeted successive-halving search as a cheaper alternative to the full grid
+5. Early-stopped histogram search that reuses one QuantileDMatrix per fold
+
+Cross-validation of the final models goes through `src.cv_engine`: folds are
+computed once per training split and out-of-fold probabilities are saved to
+`models/oof/<name>.joblib` for evaluation and model comparison. Hyper-parameter
+searches use their own, cheaper SEARCH_SPLITS-fold split (the full XGBoost grid
+is 108 candidates × 3 folds = 324 fits); the tuned model then costs CV_SPLITS
+extra fits for its out-of-fold predictions, on the folds shared with RandomForest.
+
+Parallelism is never `n_jobs=-1` at two levels: every search asks
+`src.resources.allocate` for an outer (jobs) × inner (threads) split of the
+stage's core budget.
 """
 
+import argparse
+import math
 import os
+import time
 import joblib
 import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
 from sklearn.model_selection import (
     train_test_split,
-    cross_val_score,
     GridSearchCV,
+    ParameterGrid,
     RandomizedSearchCV,
-    RepeatedStratifiedKFold
+    StratifiedKFold,
 )
 from sklearn.ensemble import RandomForestClassifier
+import xgboost as xgb
 from xgboost import XGBClassifier
+from src.cv_engine import CVEngine
+from src.preprocess import load_processed_data
+from src.resources import allocate, stage_budget
 from src.utils import ensure_dir
 
 
@@ -50,24 +72,26 @@ def train_model(df, output_path=None):
 def train_baseline_rf(x, y, save_path="models/baseline_rf.pkl"):
     """
     Train a baseline Random Forest model with cross-validation.
+    Out-of-fold probabilities are kept in `models/oof/RandomForest.joblib`.
     Returns model and (x_train, x_test, y_train, y_test)
     """
     x_train, x_test, y_train, y_test = train_test_split(
         x, y, test_size=0.2, random_state=42, stratify=y
     )
 
+    engine = CVEngine(y_train)
+    alloc = allocate("RandomForest CV", outer_tasks=len(engine.folds))
     clf = RandomForestClassifier(
         n_estimators=300,
         random_state=42,
-        n_jobs=-1,
+        n_jobs=alloc.inner,
         class_weight="balanced"
     )
 
-    cv = RepeatedStratifiedKFold(n_splits=10, n_repeats=3, random_state=1)
-    cv_auc = cross_val_score(clf, x_train, y_train, cv=cv, scoring="roc_auc").mean()
-    print(f"[CV] ROC AUC: {cv_auc:.3f}")
+    with alloc.limits():
+        engine.run("RandomForest", clf, x_train, n_jobs=alloc.outer).save()
 
-    clf.fit(x_train, y_train)
+    clf.set_params(n_jobs=stage_budget()).fit(x_train, y_train)
     ensure_dir("models")
     joblib.dump(clf, save_path)
     print(f"✅ Baseline RandomForest saved to {save_path}")
@@ -78,42 +102,80 @@ def train_baseline_rf(x, y, save_path="models/baseline_rf.pkl"):
 # ============================================================
 # 2. Tuned XGBoost
 # ============================================================
-def train_xgboost_tuned(x, y, save_path="models/best_xgb.pkl"):
-    """
-    Perform grid search tuning for XGBoost.
-    Returns best model and (x_train, x_test, y_train, y_test)
-    """
-    x_train, x_test, y_train, y_test = train_test_split(
-        x, y, test_size=0.2, random_state=42, stratify=y
-    )
+SEARCH_SPLITS = 3   # folds per hyper-parameter candidate (out-of-fold runs use CV_SPLITS)
 
-    param_grid = {
-        "learning_rate": [0.01, 0.1, 0.2],
-        "max_depth": [3, 4, 5],
-        "n_estimators": [100, 500, 1000],
-        "subsample": [0.8, 1.0],
-        "colsample_bytree": [0.8, 1.0],
-    }
+XGB_PARAM_GRID = {
+    "learning_rate": [0.01, 0.1, 0.2],
+    "max_depth": [3, 4, 5],
+    "n_estimators": [100, 500, 1000],
+    "subsample": [0.8, 1.0],
+    "colsample_bytree": [0.8, 1.0],
+}
 
-    model = XGBClassifier(
+
+def _xgb_base(n_jobs=None):
+    return XGBClassifier(
         use_label_encoder=False,
         eval_metric="logloss",
         random_state=42,
-        n_jobs=-1
+        n_jobs=n_jobs or stage_budget()
     )
 
-    grid = GridSearchCV(
-        model,
-        param_grid=param_grid,
-        scoring="roc_auc",
-        cv=3,
-        verbose=2,
-        n_jobs=-1
+
+def train_xgboost_tuned(x, y, save_path="models/best_xgb.pkl", search="grid",
+                        max_fits=None, max_seconds=None):
+    """
+    Tune XGBoost with the full grid search (`search="grid"`), a budgeted
+    successive-halving search (`search="halving"`) or an early-stopped
+    search over shared per-fold QuantileDMatrix objects (`search="early_stopping"`).
+    Returns best model and (x_train, x_test, y_train, y_test)
+    """
+    x_train, x_test, y_train, y_test = train_test_split(
+        x, y, test_size=0.2, random_state=42, stratify=y
     )
-    grid.fit(x_train, y_train)
+    engine = CVEngine(y_train)
+    search_folds = CVEngine(y_train, n_splits=SEARCH_SPLITS).folds
 
-    print(f"🎯 Best XGB Params: {grid.best_params_}")
-    best_model = grid.best_estimator_
+    started = time.perf_counter()
+    if search == "halving":
+        alloc = allocate("XGBoost halving", outer_tasks=1)
+        with alloc.limits():
+            result = successive_halving_search(
+                _xgb_base(alloc.inner), XGB_PARAM_GRID, x_train, y_train, resource="n_estimators",
+                folds=search_folds, max_fits=max_fits, max_seconds=max_seconds,
+            )
+        best_params = result["best_params"]
+        best_model = clone(_xgb_base()).set_params(**best_params).fit(x_train, y_train)
+    elif search == "early_stopping":
+        alloc = allocate("XGBoost early stopping", outer_tasks=1)
+        with alloc.limits():
+            result = early_stopping_search(XGB_PARAM_GRID, x_train, y_train, folds=search_folds,
+                                           n_jobs=alloc.inner)
+        best_params = result["best_params"]
+        best_model = clone(_xgb_base()).set_params(**best_params).fit(x_train, y_train)
+    elif search == "grid":
+        alloc = allocate("XGBoost grid", outer_tasks=len(ParameterGrid(XGB_PARAM_GRID)) * len(search_folds))
+        grid = GridSearchCV(
+            _xgb_base(alloc.inner),
+            param_grid=XGB_PARAM_GRID,
+            scoring="roc_auc",
+            cv=list(search_folds),
+            verbose=2,
+            n_jobs=alloc.outer
+        )
+        with alloc.limits():
+            grid.fit(x_train, y_train)
+        best_params = grid.best_params_
+        best_model = grid.best_estimator_.set_params(n_jobs=stage_budget())
+    else:
+        raise ValueError(f"Unknown search mode: {search}")
+
+    print(f"🎯 Best XGB Params: {best_params}")
+    print(f"⏱️ XGB {search} search finished in {time.perf_counter() - started:.1f}s")
+    alloc = allocate("XGBoost CV", outer_tasks=len(engine.folds))
+    with alloc.limits():
+        engine.run("XGBoost", clone(best_model).set_params(n_jobs=alloc.inner), x_train,
+                   n_jobs=alloc.outer).save()
 
     ensure_dir("models")
     joblib.dump(best_model, save_path)
@@ -122,6 +184,222 @@ def train_xgboost_tuned(x, y, save_path="models/best_xgb.pkl"):
     return best_model, (x_train, x_test, y_train, y_test)
 
 
+# ============================================================
+# 2b. Successive halving (multi-fidelity search under a budget)
+# ============================================================
+def successive_halving_search(estimator, param_grid, x, y, resource="n_estimators",
+                              max_resource=None, min_resource=None, eta=3, cv=3, folds=None,
+                              max_fits=None, max_seconds=None, random_state=42):
+    """
+    Successive halving over `param_grid` with `resource` as the fidelity.
+
+    Every candidate is cross-validated with a small resource; the best
+    1/`eta` are promoted to `eta` times the resource, until one candidate is
+    left or the full resource is reached. `resource` is either a parameter
+    of the estimator (e.g. "n_estimators", its grid values are replaced by
+    the rung sizes) or "n_samples" (rows of a fixed random permutation).
+
+    The returned winner is the best (candidate, resource) pair seen on any
+    rung. The search stops early once `max_fits` (single model fits) or
+    `max_seconds` (wall-clock) would be exceeded; a partially evaluated rung
+    is discarded, unless it is the first one, in which case the best of the
+    candidates evaluated so far wins. `folds` (a list of (train_idx, val_idx))
+    overrides `cv`.
+
+    Returns:
+        dict: best_params, best_score, fits, seconds, rungs (per-rung history)
+    """
+    grid = dict(param_grid)
+    if resource == "n_samples":
+        max_resource = max_resource or len(x)
+    else:
+        values = grid.pop(resource, None)
+        max_resource = max_resource or (max(values) if values else estimator.get_params()[resource])
+    candidates = list(ParameterGrid(grid))
+
+    n_rungs = max(1, math.ceil(math.log(len(candidates), eta)) + 1) if len(candidates) > 1 else 1
+    min_resource = min_resource or max(1, int(max_resource / eta ** (n_rungs - 1)))
+    if folds is None:
+        folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(x, y))
+    cv = len(folds)
+    order = np.random.RandomState(random_state).permutation(len(x))
+
+    started, fits, history = time.perf_counter(), 0, []
+    best = None
+    for rung in range(n_rungs):
+        r = max_resource if rung == n_rungs - 1 else min(max_resource, int(min_resource * eta ** rung))
+        scored = []
+        for params in candidates:
+            if max_fits is not None and fits + cv > max_fits:
+                break
+            if max_seconds is not None and time.perf_counter() - started > max_seconds:
+                break
+            scores = []
+            for train_idx, val_idx in folds:
+                if resource == "n_samples":
+                    keep = np.isin(train_idx, order[:r])
+                    train_idx = train_idx[keep]
+                    model = clone(estimator).set_params(**params)
+                else:
+                    model = clone(estimator).set_params(**params, **{resource: r})
+                model.fit(x.iloc[train_idx], y.iloc[train_idx])
+                scores.append(roc_auc_score(y.iloc[val_idx], model.predict_proba(x.iloc[val_idx])[:, 1]))
+                fits += 1
+            scored.append((float(np.mean(scores)), params))
+
+        if len(scored) < len(candidates) and best is not None:
+            break  # budget exhausted mid-rung: keep the winner of the last complete rung
+        if not scored:
+            break
+        scored.sort(key=lambda t: t[0], reverse=True)
+        if best is None or scored[0][0] > best[0]:
+            # the resource is itself a tuned hyper-parameter here (more trees can overfit),
+            # so the winner is the best configuration seen on any rung
+            final_params = dict(scored[0][1], **({} if resource == "n_samples" else {resource: r}))
+            best = (scored[0][0], final_params)
+        history.append({"rung": rung, "resource": r, "candidates": len(scored),
+                        "best_score": scored[0][0], "fits": fits})
+        print(f"🪜 Rung {rung}: {resource}={r} | {len(scored)} candidates | best AUC {scored[0][0]:.4f}")
+        candidates = [p for _, p in scored[: max(1, math.ceil(len(scored) / eta))]]
+
+    if best is None:
+        raise RuntimeError("Budget too small to evaluate a single candidate.")
+    return {
+        "best_params": best[1],
+        "best_score": best[0],
+        "fits": fits,
+        "seconds": time.perf_counter() - started,
+        "rungs": history,
+    }
+
+
+# ============================================================
+# 2c. Early stopping over shared, pre-quantized fold data
+# ============================================================
+def early_stopping_search(param_grid, x, y, cv=3, folds=None, max_rounds=1000,
+                          early_stopping_rounds=50, stop_fraction=0.2, max_bin=256,
+                          random_state=42, n_jobs=None):
+    """
+    Grid search where the number of trees is learned, not searched.
+
+    Each fold's training rows are split once more: `stop_fraction` of them
+    (stratified) decide the early-stopping round, the rest are quantized once
+    into a `QuantileDMatrix` (the histogram input of `tree_method="hist"`).
+    The stopping rows and the fold's validation rows become `QuantileDMatrix`
+    objects referencing the same bins, and every candidate trains on these
+    shared objects. Scores are AUCs on the validation rows, which never
+    influence the stopping round, so they are comparable with grid and
+    halving CV scores. The returned `n_estimators` is the mean best iteration
+    across folds. `folds` (a list of (train_idx, val_idx)) overrides `cv`.
+
+    Returns:
+        dict: best_params, best_score, fits, seconds, trees (boosting rounds trained)
+    """
+    started = time.perf_counter()
+    grid = {k: v for k, v in param_grid.items() if k != "n_estimators"}
+    if folds is None:
+        folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(x, y)
+    data = []
+    for train_idx, val_idx in folds:
+        fit_idx, stop_idx = train_test_split(train_idx, test_size=stop_fraction, random_state=random_state,
+                                             stratify=y.iloc[train_idx])
+        dtrain = xgb.QuantileDMatrix(x.iloc[fit_idx], y.iloc[fit_idx], max_bin=max_bin)
+        dstop = xgb.QuantileDMatrix(x.iloc[stop_idx], y.iloc[stop_idx], ref=dtrain)
+        dval = xgb.QuantileDMatrix(x.iloc[val_idx], ref=dtrain)
+        data.append((dtrain, dstop, dval, y.iloc[val_idx]))
+
+    best, fits, trees = None, 0, 0
+    for params in ParameterGrid(grid):
+        booster_params = {
+            "objective": "binary:logistic",
+            "eval_metric": "auc",
+            "tree_method": "hist",
+            "max_bin": max_bin,
+            "seed": random_state,
+            "nthread": n_jobs or stage_budget(),
+            **params,
+        }
+        scores, rounds = [], []
+        for dtrain, dstop, dval, y_val in data:
+            booster = xgb.train(booster_params, dtrain, num_boost_round=max_rounds,
+                                evals=[(dstop, "stop")], early_stopping_rounds=early_stopping_rounds,
+                                verbose_eval=False)
+            prob = booster.predict(dval, iteration_range=(0, booster.best_iteration + 1))
+            scores.append(roc_auc_score(y_val, prob))
+            rounds.append(booster.best_iteration + 1)
+            trees += booster.num_boosted_rounds()
+            fits += 1
+        score = float(np.mean(scores))
+        if best is None or score > best[0]:
+            best = (score, dict(params, n_estimators=int(round(np.mean(rounds)))))
+
+    print(f"⏹️ Early-stopping search: best AUC {best[0]:.4f} with {best[1]['n_estimators']} trees "
+          f"({trees} boosting rounds over {fits} fits)")
+    return {
+        "best_params": best[1],
+        "best_score": best[0],
+        "fits": fits,
+        "seconds": time.perf_counter() - started,
+        "trees": trees,
+    }
+
+
+def compare_search_strategies(x, y, strategies=("grid", "halving", "early_stopping"),
+                              max_fits=None, max_seconds=None, param_grid=XGB_PARAM_GRID):
+    """
+    Run several XGBoost tuning strategies on the same split and report CV AUC,
+    held-out AUC, number of fits and wall-clock side by side.
+
+    Run with:
+        python -m src.model_train --compare-search [--max-fits N] [--max-seconds S]
+    """
+    x_train, x_test, y_train, y_test = train_test_split(
+        x, y, test_size=0.2, random_state=42, stratify=y
+    )
+    folds = CVEngine(y_train, n_splits=SEARCH_SPLITS).folds
+    report = {}
+
+    for name in strategies:
+        started = time.perf_counter()
+        if name == "grid":
+            alloc = allocate("XGBoost grid", outer_tasks=len(ParameterGrid(param_grid)) * len(folds))
+            grid = GridSearchCV(_xgb_base(alloc.inner), param_grid=param_grid, scoring="roc_auc",
+                                cv=list(folds), n_jobs=alloc.outer)
+            with alloc.limits():
+                grid.fit(x_train, y_train)
+            best_params, cv_auc = grid.best_params_, grid.best_score_
+            fits = len(grid.cv_results_["params"]) * len(folds)
+            model = grid.best_estimator_
+        else:
+            if name == "halving":
+                result = successive_halving_search(_xgb_base(), param_grid, x_train, y_train, folds=folds,
+                                                   max_fits=max_fits, max_seconds=max_seconds)
+            elif name == "early_stopping":
+                result = early_stopping_search(param_grid, x_train, y_train, folds=folds)
+            else:
+                raise ValueError(f"Unknown search mode: {name}")
+            best_params, cv_auc, fits = result["best_params"], result["best_score"], result["fits"]
+            model = clone(_xgb_base()).set_params(**best_params).fit(x_train, y_train)
+        report[name] = {
+            "best_params": best_params,
+            "cv_auc": cv_auc,
+            "test_auc": roc_auc_score(y_test, model.predict_proba(x_test)[:, 1]),
+            "fits": fits,
+            "seconds": time.perf_counter() - started,
+        }
+
+    print("\n=== XGBoost search comparison ===")
+    for name, r in report.items():
+        print(f"{name:<14} | CV AUC {r['cv_auc']:.4f} | test AUC {r['test_auc']:.4f} | "
+              f"fits {r['fits']:>4} | {r['seconds']:.1f}s")
+    if "grid" in report:
+        for name, r in report.items():
+            if name != "grid":
+                print(f"⏱️ {name} saves {report['grid']['seconds'] - r['seconds']:.1f}s "
+                      f"({report['grid']['seconds'] / max(r['seconds'], 1e-9):.1f}x faster than grid)")
+    return report
+
+
 # ============================================================
 # 3. Tuned RandomForest
 # ============================================================
@@ -135,7 +413,8 @@ def train_rf_tuned(x_train, y_train):
         "n_estimators": [50, 100, 200, 300, 400, 500]
     }
 
-    model = RandomForestClassifier(random_state=42)
+    alloc = allocate("RandomForest random search", outer_tasks=20 * 5)
+    model = RandomForestClassifier(random_state=42, n_jobs=alloc.inner)
     random_search = RandomizedSearchCV(
         model,
         param_distributions=param_dist,
@@ -144,9 +423,10 @@ def train_rf_tuned(x_train, y_train):
         cv=5,
         random_state=42,
         verbose=1,
-        n_jobs=-1
+        n_jobs=alloc.outer
     )
-    random_search.fit(x_train, y_train)
+    with alloc.limits():
+        random_search.fit(x_train, y_train)
 
     print(f"🎯 Best RF Params: {random_search.best_params_}")
     ensure_dir("models")
@@ -154,3 +434,19 @@ def train_rf_tuned(x_train, y_train):
     print("✅ Tuned RandomForest saved to models/best_rf.pkl")
 
     return random_search.best_estimator_
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="XGBoost tuning strategies compared on the processed data.")
+    parser.add_argument("--compare-search", action="store_true",
+                        help="Compare grid, halving and early-stopping search (CV AUC, test AUC, fits, time)")
+    parser.add_argument("--data", default="data/processed/telco_processed.csv", help="Processed CSV")
+    parser.add_argument("--strategies", nargs="+", default=["grid", "halving", "early_stopping"],
+                        choices=["grid", "halving", "early_stopping"])
+    parser.add_argument("--max-fits", type=int, default=None, help="Fit budget of the halving search")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Time budget of the halving search")
+    args = parser.parse_args()
+    if not args.compare_search:
+        parser.error("nothing to do: pass --compare-search")
+    compare_search_strategies(*load_processed_data(args.data), strategies=args.strategies,
+                              max_fits=args.max_fits, max_seconds=args.max_seconds)
@@ -0,0 +1,216 @@
+"""
+pipeline_cache.py
+-----------------
+Content-addressed stage cache for the `main.py` pipeline.
+
+Each stage is keyed by a hash of:
+1. The content of its input files
+2. The source code it depends on
+3. Its parameters
+4. The keys of the upstream stages it consumes
+
+A stage whose key matches the last successful run — and whose recorded
+output files are still present and unmodified — is skipped, and its stored
+return value is reused. Everything else is recomputed and recorded.
+"""
+
+import ast
+import glob
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import joblib
+
+CACHE_DIR = ".cache/pipeline"
+
+
+def _expand(paths: Iterable[str]) -> List[Path]:
+    """Files for a list of file/directory/glob paths (directories are walked, sorted)."""
+    files = []
+    for p in map(Path, paths):
+        if any(ch in str(p) for ch in "*?["):
+            files.extend(sorted(Path(f) for f in glob.glob(str(p)) if os.path.isfile(f)))
+        elif p.is_dir():
+            files.extend(sorted(f for f in p.rglob("*") if f.is_file() and "__pycache__" not in f.parts))
+        else:
+            files.append(p)
+    return files
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_paths(paths: Iterable[str]) -> Dict[str, str]:
+    """Content hash per file ('missing' for files that do not exist)."""
+    return {str(f): hash_file(f) if f.exists() else "missing" for f in _expand(paths)}
+
+
+def _module_file(name: str) -> Optional[Path]:
+    """Source file of dotted module `name` relative to the working directory, if it has one."""
+    base = Path(*name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _imported_modules(path: Path, package: str) -> Set[str]:
+    """Dotted names of the `package` modules that `path` imports (function-level imports included)."""
+    current = ".".join(path.with_suffix("").parts)
+    if path.name == "__init__.py":
+        current = ".".join(path.parent.parts) + ".__init__"
+    found = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"), filename=str(path))):
+        if isinstance(node, ast.Import):
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            parent = node.module or ""
+            if node.level:
+                anchor = current.split(".")[:-node.level]
+                parent = ".".join(anchor + ([node.module] if node.module else []))
+            submodules = [f"{parent}.{a.name}" for a in node.names if _module_file(f"{parent}.{a.name}")]
+            found.update(submodules)
+            # Names that are not submodules come from the package/module itself
+            if len(submodules) < len(node.names) or not Path(*parent.split(".")).is_dir():
+                found.add(parent)
+    return {name for name in found if name == package or name.startswith(package + ".")}
+
+
+def module_sources(*paths: str, package: str = "src") -> List[str]:
+    """
+    `paths` plus every `package` source file they import, transitively.
+
+    Used as a stage's `code` list so that editing any module the stage
+    depends on invalidates it. A package's `__init__.py` is only followed
+    when names are imported from the package itself, not from its submodules.
+    """
+    seen, todo = set(), [Path(p) for p in paths]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        if not path.is_file():
+            continue
+        for name in _imported_modules(path, package):
+            found = _module_file(name)
+            if found is not None:
+                todo.append(found)
+    return sorted(str(p) for p in seen)
+
+
+class StageCache:
+    """
+    Records stage keys, output hashes and return values under `cache_dir`.
+
+    Args:
+        cache_dir (str): Where the manifest and stored results live.
+        force (bool | Iterable[str]): True to recompute every stage, or the
+            names of the stages to recompute.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, force=False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.cache_dir / "manifest.json"
+        self.force_all = force is True
+        self.force = set() if isinstance(force, bool) else set(force)
+        self.manifest = self._read_manifest()
+        self.keys: Dict[str, str] = {}
+        self.summary: List[dict] = []
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self) -> None:
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def stage_key(self, name: str, inputs: Iterable[str] = (), code: Iterable[str] = (),
+                  params: Optional[dict] = None, deps: Iterable[str] = ()) -> str:
+        payload = {
+            "stage": name,
+            "inputs": hash_paths(inputs),
+            "code": hash_paths(code),
+            "params": params or {},
+            "deps": {d: self.keys[d] for d in deps},
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    def is_fresh(self, name: str, key: str) -> bool:
+        """True if `name` can be skipped: same key, outputs untouched, result stored."""
+        if self.force_all or name in self.force:
+            return False
+        entry = self.manifest.get(name)
+        if not entry or entry["key"] != key:
+            return False
+        if not (self.cache_dir / f"{name}.joblib").exists():
+            return False
+        return hash_paths(entry["outputs"]) == entry["output_hashes"]
+
+    def prepare(self, name: str, inputs: Iterable[str] = (), code: Iterable[str] = (),
+                params: Optional[dict] = None, deps: Iterable[str] = ()) -> str:
+        """Compute and remember the key of stage `name` (upstream stages must be prepared first)."""
+        key = self.stage_key(name, inputs, code, params, deps)
+        self.keys[name] = key
+        return key
+
+    def lookup(self, name: str, key: str):
+        """`(True, stored_result)` if the stage can be skipped, else `(False, None)`."""
+        if not self.is_fresh(name, key):
+            return False, None
+        started = time.perf_counter()
+        result = joblib.load(self.cache_dir / f"{name}.joblib")
+        self._log(name, "cached", time.perf_counter() - started, key)
+        return True, result
+
+    def record(self, name: str, key: str, result: Any, outputs: Iterable[str] = (),
+               seconds: float = 0.0) -> None:
+        """Store the result and output hashes of a freshly computed stage."""
+        outputs = list(outputs)
+        joblib.dump(result, self.cache_dir / f"{name}.joblib")
+        self.manifest[name] = {
+            "key": key,
+            "outputs": outputs,
+            "output_hashes": hash_paths(outputs),
+            "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self._write_manifest()
+        self._log(name, "recomputed", seconds, key)
+
+    def _log(self, name: str, status: str, seconds: float, key: str) -> None:
+        self.summary.append({"stage": name, "status": status, "seconds": seconds, "key": key[:12]})
+
+    def run(self, name: str, fn: Callable[..., Any], *args, inputs: Iterable[str] = (),
+            code: Iterable[str] = (), params: Optional[dict] = None, deps: Iterable[str] = (),
+            outputs: Iterable[str] = (), **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` as stage `name` unless its cached result is still valid."""
+        key = self.prepare(name, inputs, code, params, deps)
+        hit, result = self.lookup(name, key)
+        if hit:
+            return result
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.record(name, key, result, outputs, time.perf_counter() - started)
+        return result
+
+    def print_summary(self) -> None:
+        print("\n🗃️ Stage cache summary")
+        for row in self.summary:
+            icon = "♻️" if row["status"] == "cached" else "🔨"
+            print(f"  {icon} {row['stage']:<16} {row['status']:<11} {row['seconds']:8.2f}s  key={row['key']}")
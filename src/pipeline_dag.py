@@ -0,0 +1,161 @@
+"""
+pipeline_dag.py
+---------------
+Dependency-graph executor for the `main.py` pipeline.
+
+Stages declare the stages they depend on; every stage whose dependencies
+are finished is dispatched to a worker pool, so independent work (EDA plots,
+RandomForest and XGBoost training, per-model evaluation) runs concurrently
+within a configurable worker budget. Stages can go through a `StageCache`,
+in which case cache hits complete immediately in the parent process.
+
+At the end a report lists the wall-clock time of every stage and the
+critical path (the chain of dependent stages that bounded the total runtime).
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.pipeline_cache import StageCache
+
+
+@dataclass
+class Stage:
+    """
+    One node of the pipeline graph.
+
+    Args:
+        name (str): Unique stage name.
+        fn (Callable): Top-level (picklable) function to run.
+        args (tuple): Positional arguments passed first.
+        deps (list[str]): Stages that must finish before this one starts.
+        consumes (list[str]): Subset of `deps` whose results are appended to `args`.
+        cache (dict, optional): `inputs`/`code`/`params`/`outputs` for the stage cache.
+    """
+    name: str
+    fn: Callable[..., Any]
+    args: tuple = ()
+    deps: List[str] = field(default_factory=list)
+    consumes: List[str] = field(default_factory=list)
+    cache: Optional[dict] = None
+
+
+def _timed_call(fn, args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def _validate(stages: List[Stage]) -> Dict[str, Stage]:
+    by_name = {s.name: s for s in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Duplicate stage names in pipeline.")
+    for s in stages:
+        unknown = [d for d in s.deps if d not in by_name]
+        if unknown:
+            raise ValueError(f"Stage '{s.name}' depends on unknown stages: {unknown}")
+        if not set(s.consumes) <= set(s.deps):
+            raise ValueError(f"Stage '{s.name}' consumes results it does not depend on.")
+    return by_name
+
+
+def run_dag(stages: List[Stage], max_workers: int = 2, cache: Optional[StageCache] = None,
+            executor: str = "process", initializer: Optional[Callable] = None) -> Tuple[Dict[str, Any], Dict[str, dict]]:
+    """
+    Execute `stages` respecting dependencies with at most `max_workers` running at once.
+
+    Returns:
+        tuple: (results by stage name, timings by stage name with
+        `start`, `end`, `seconds` and `status`)
+    """
+    _validate(stages)
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    pool_kwargs = {"initializer": initializer} if initializer else {}
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, dict] = {}
+    keys: Dict[str, str] = {}
+    pending = list(stages)
+    running: Dict[Future, Tuple[Stage, Optional[str], float]] = {}
+    t0 = time.perf_counter()
+
+    with pool_cls(max_workers=max(int(max_workers), 1), **pool_kwargs) as pool:
+        while pending or running:
+            progressed = True
+            while progressed:  # cache hits may unlock further stages immediately
+                progressed = False
+                for stage in [s for s in pending if all(d in results for d in s.deps)]:
+                    if stage.name not in keys and cache is not None and stage.cache is not None:
+                        keys[stage.name] = cache.prepare(stage.name, deps=stage.deps, **_key_fields(stage.cache))
+                        hit, result = cache.lookup(stage.name, keys[stage.name])
+                        if hit:
+                            now = time.perf_counter() - t0
+                            results[stage.name] = result
+                            timings[stage.name] = {"start": now, "end": now, "seconds": 0.0, "status": "cached"}
+                            pending.remove(stage)
+                            progressed = True
+                            continue
+                    if len(running) >= max_workers:
+                        continue
+                    args = tuple(stage.args) + tuple(results[d] for d in stage.consumes)
+                    print(f"▶️  [{time.perf_counter() - t0:7.2f}s] start {stage.name}")
+                    future = pool.submit(_timed_call, stage.fn, args)
+                    running[future] = (stage, keys.get(stage.name), time.perf_counter() - t0)
+                    pending.remove(stage)
+
+            if not running:
+                if pending:
+                    raise RuntimeError(f"Unresolvable dependencies for: {[s.name for s in pending]}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, key, start = running.pop(future)
+                try:
+                    result, seconds = future.result()
+                except Exception:
+                    for f in running:
+                        f.cancel()
+                    print(f"❌ Stage '{stage.name}' failed.")
+                    raise
+                end = time.perf_counter() - t0
+                results[stage.name] = result
+                timings[stage.name] = {"start": start, "end": end, "seconds": seconds, "status": "recomputed"}
+                if key is not None:
+                    cache.record(stage.name, key, result, stage.cache.get("outputs", ()), seconds)
+                print(f"✅ [{end:7.2f}s] done  {stage.name} ({seconds:.2f}s)")
+
+    return results, timings
+
+
+def _key_fields(spec: dict) -> dict:
+    return {k: spec[k] for k in ("inputs", "code", "params") if k in spec}
+
+
+def critical_path(stages: List[Stage], timings: Dict[str, dict]) -> Tuple[float, List[str]]:
+    """`(seconds, [stage names])` of the longest chain of dependent stages."""
+    by_name = {s.name: s for s in stages}
+    best: Dict[str, Tuple[float, List[str]]] = {}
+
+    def visit(name: str) -> Tuple[float, List[str]]:
+        if name not in best:
+            upstream = [visit(d) for d in by_name[name].deps]
+            length, path = max(upstream, default=(0.0, []), key=lambda t: t[0])
+            best[name] = (length + timings[name]["seconds"], path + [name])
+        return best[name]
+
+    return max((visit(s.name) for s in stages), key=lambda t: t[0], default=(0.0, []))
+
+
+def print_report(stages: List[Stage], timings: Dict[str, dict]) -> None:
+    """Per-stage wall-clock table plus the critical path."""
+    wall = max((t["end"] for t in timings.values()), default=0.0)
+    busy = sum(t["seconds"] for t in timings.values())
+    print("\n⏱️ Stage timings")
+    for s in sorted(stages, key=lambda s: timings[s.name]["start"]):
+        t = timings[s.name]
+        print(f"  {s.name:<18} {t['status']:<11} start {t['start']:7.2f}s  end {t['end']:7.2f}s  took {t['seconds']:7.2f}s")
+    length, path = critical_path(stages, timings)
+    print(f"  total wall-clock {wall:.2f}s | summed stage time {busy:.2f}s | speed-up {busy / wall if wall else 1:.2f}x")
+    print(f"  critical path ({length:.2f}s): {' → '.join(path)}")
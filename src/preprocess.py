@@ -8,11 +8,31 @@ This module handles:
 2. Cleaning and type conversion
 3. Feature encoding
 4. Processed data saving & reloading for modeling
+5. Out-of-core (chunked) preprocessing for extracts larger than memory
 """
 
+import argparse
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
+from src.encoder import CategoricalEncoder
+
+# Raw Telco columns holding string categories (label-encoded during preprocessing)
+CATEGORICAL_COLUMNS = [
+    "gender", "Partner", "Dependents", "PhoneService", "MultipleLines",
+    "InternetService", "OnlineSecurity", "OnlineBackup", "DeviceProtection",
+    "TechSupport", "StreamingTV", "StreamingMovies", "Contract",
+    "PaperlessBilling", "PaymentMethod", "Churn",
+]
+
+# Explicit dtypes for streaming reads so every chunk parses the same way
+RAW_DTYPES = {
+    "customerID": str,
+    "SeniorCitizen": "int64",
+    "tenure": "int64",
+    "MonthlyCharges": "float64",
+    "TotalCharges": str,
+    **{col: str for col in CATEGORICAL_COLUMNS},
+}
 
 
 # ============================================================
@@ -44,13 +64,13 @@ def clean_total_charges(data: pd.DataFrame) -> pd.DataFrame:
     if "TotalCharges" not in data.columns:
         raise KeyError("❌ 'TotalCharges' column not found in dataset.")
 
-    if data["TotalCharges"].dtype == "object":
+    if not pd.api.types.is_numeric_dtype(data["TotalCharges"]):
         invalid_mask = data["TotalCharges"].str.strip() == ""
         invalid_count = invalid_mask.sum()
         if invalid_count > 0:
             print(f"⚠️ Found {invalid_count} invalid 'TotalCharges' rows. Replacing with previous valid values...")
             data.loc[invalid_mask, "TotalCharges"] = None
-            data["TotalCharges"] = data["TotalCharges"].fillna(method="ffill")
+            data["TotalCharges"] = data["TotalCharges"].ffill()
 
     data["TotalCharges"] = pd.to_numeric(data["TotalCharges"], errors="coerce")
     data = data.dropna(subset=["TotalCharges"])
@@ -73,16 +93,20 @@ def drop_unnecessary_columns(data: pd.DataFrame, cols_to_drop: List[str] = None)
 # ============================================================
 # 4. Encode categorical features
 # ============================================================
-def encode_categorical_features(data: pd.DataFrame) -> pd.DataFrame:
-    """Apply label encoding to categorical (non-numeric) columns."""
-    df = data.copy()
-    le = LabelEncoder()
+def encode_categorical_features(data: pd.DataFrame, encoder_path: Optional[str] = None) -> pd.DataFrame:
+    """
+    Apply label encoding to categorical (non-numeric) columns.
+    If `encoder_path` is given, the fitted category tables are saved there so
+    batch scoring and the API can encode raw values the same way.
+    """
     numeric_cols = data.select_dtypes(include=["number"]).columns
     categorical_cols = [col for col in data.columns if col not in numeric_cols]
 
     print(f"🔤 Encoding {len(categorical_cols)} categorical features...")
-    for col in categorical_cols:
-        df[col] = le.fit_transform(df[col].astype(str))
+    encoder = CategoricalEncoder(handle_unknown="error").fit(data, categorical_cols)
+    df = encoder.transform(data)
+    if encoder_path:
+        encoder.save(encoder_path)
     print("✅ Categorical encoding completed.")
     return df
 
@@ -109,3 +133,92 @@ def load_processed_data(path: str) -> Tuple[pd.DataFrame, pd.Series]:
     y = df["Churn"]
     print(f"📦 Processed data loaded. Samples: {X.shape[0]}, Features: {X.shape[1]}")
     return X, y
+
+
+# ============================================================
+# 7. Out-of-core (chunked) preprocessing
+# ============================================================
+def fill_total_charges(values: pd.Series, state: dict) -> pd.Series:
+    """
+    Chunk-safe version of the `clean_total_charges` conversion.
+
+    Blank strings are forward-filled (continuing from the last value of the
+    previous chunk, kept in `state["last_total_charges"]`) and the result is
+    converted to float; unparseable values become NaN.
+    """
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.copy()
+        values[values.str.strip() == ""] = None
+        if len(values) and pd.isna(values.iloc[0]) and state.get("last_total_charges") is not None:
+            values.iloc[0] = state["last_total_charges"]
+        values = values.ffill()
+    last = values.dropna()
+    if len(last):
+        state["last_total_charges"] = str(last.iloc[-1])
+    return pd.to_numeric(values, errors="coerce")
+
+
+def iter_raw_chunks(path: str, chunksize: int = 50_000) -> Iterator[pd.DataFrame]:
+    """Read the raw CSV in chunks with explicit dtypes."""
+    with pd.read_csv(path, dtype=RAW_DTYPES, chunksize=chunksize) as reader:
+        yield from reader
+
+
+def iter_clean_chunks(path: str, chunksize: int = 50_000,
+                      cols_to_drop: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Yield cleaned chunks (TotalCharges fixed, unnecessary columns dropped)."""
+    if cols_to_drop is None:
+        cols_to_drop = ["customerID"]
+    state: dict = {}
+    for chunk in iter_raw_chunks(path, chunksize):
+        chunk["TotalCharges"] = fill_total_charges(chunk["TotalCharges"], state)
+        chunk = chunk.dropna(subset=["TotalCharges"])
+        yield chunk.drop(columns=cols_to_drop, errors="ignore")
+
+
+def fit_encoder_in_chunks(path: str, chunksize: int = 50_000,
+                          cols_to_drop: Optional[List[str]] = None) -> CategoricalEncoder:
+    """First pass: fit the categorical encoder on the cleaned rows, chunk by chunk."""
+    encoder = CategoricalEncoder(handle_unknown="error")
+    for chunk in iter_clean_chunks(path, chunksize, cols_to_drop):
+        encoder.partial_fit(chunk)
+    return encoder
+
+
+def preprocess_in_chunks(raw_path: str, output_path: str, chunksize: int = 50_000,
+                         cols_to_drop: Optional[List[str]] = None,
+                         encoder_path: Optional[str] = None) -> int:
+    """
+    Streaming equivalent of load → clean → drop → encode → save.
+
+    Runs two passes over the raw CSV: the first fits the category tables
+    (label codes depend on every value in a column), the second cleans,
+    encodes and appends each chunk to `output_path`. The output is identical
+    to the in-memory path while only one chunk is held in memory.
+
+    Returns:
+        int: Number of rows written.
+    """
+    encoder = fit_encoder_in_chunks(raw_path, chunksize, cols_to_drop)
+    print(f"🔤 Collected categories for {len(encoder.categories)} columns (chunksize={chunksize})")
+    if encoder_path:
+        encoder.save(encoder_path)
+
+    rows = 0
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(iter_clean_chunks(raw_path, chunksize, cols_to_drop)):
+            chunk = encoder.transform(chunk)
+            chunk.to_csv(f, index=False, header=(i == 0))
+            rows += len(chunk)
+    print(f"💾 Processed data streamed to: {output_path} ({rows} rows)")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunked preprocessing of the raw Telco CSV.")
+    parser.add_argument("raw_path", help="Raw CSV in the Telco-Customer-Churn.csv layout")
+    parser.add_argument("output_path", help="Destination for the processed CSV")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Rows per chunk")
+    parser.add_argument("--encoder-path", default=None, help="Where to save the fitted encoder")
+    args = parser.parse_args()
+    preprocess_in_chunks(args.raw_path, args.output_path, args.chunksize, encoder_path=args.encoder_path)
@@ -0,0 +1,89 @@
+# src/rendering.py
+"""
+Figure rendering backend
+------------------------
+Figures are built with Matplotlib's object-oriented API on an Agg canvas
+(`Figure` + `FigureCanvasAgg`) instead of pyplot's global figure manager, so
+each figure is an independent object that can be rendered in any process.
+
+A plot is described as a `RenderJob` — a top-level function that draws on a
+fresh figure plus its arguments — and `render_jobs` runs a list of them,
+inline or in a process pool sized by the stage's CPU budget.
+
+Output settings (env overrides):
+    FIGURE_DPI      resolution for every saved figure (default: the caller's)
+    FIGURE_FORMAT   png | jpg | svg | pdf (default: png)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.resources import stage_budget
+
+FIGURE_DPI = os.getenv("FIGURE_DPI")
+FIGURE_FORMAT = os.getenv("FIGURE_FORMAT", "png")
+
+
+def new_figure(nrows=1, ncols=1, figsize=None, **subplot_kw):
+    """Create a pyplot-free figure attached to an Agg canvas. Returns (fig, axes)."""
+    fig = Figure(figsize=figsize or matplotlib.rcParams["figure.figsize"])
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(nrows, ncols, **subplot_kw)
+    return fig, axes
+
+
+def save_figure(fig, folder, filename, dpi=None, fmt=None) -> str:
+    """
+    Save `fig` as `folder/filename`, using the configured resolution and format.
+
+    The extension of `filename` is replaced by the output format; `dpi`
+    is the caller's default, overridden by FIGURE_DPI when it is set.
+    """
+    fmt = fmt or FIGURE_FORMAT
+    dpi = float(FIGURE_DPI) if FIGURE_DPI else (dpi or "figure")
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{os.path.splitext(filename)[0]}.{fmt}")
+    fig.savefig(path, dpi=dpi, format=fmt, bbox_inches="tight")
+    print(f"✅ Saved figure: {path}")
+    return path
+
+
+@dataclass
+class RenderJob:
+    """One figure: `fn(*args, **kwargs)` draws and saves it and returns the saved path."""
+    fn: Callable[..., Any]
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+    def __call__(self):
+        return self.fn(*self.args, **self.kwargs)
+
+
+def _run(job: RenderJob):
+    return job()
+
+
+def _init_worker(rc: dict):
+    # carry the parent's style (ggplot theme, fonts) into spawned workers
+    matplotlib.rcParams.update({k: v for k, v in rc.items() if k not in ("backend", "backend_fallback")})
+
+
+def render_jobs(jobs: List[RenderJob], workers: Optional[int] = None) -> list:
+    """
+    Render `jobs` and return their results in order.
+
+    Uses up to `workers` processes (default: the stage CPU budget); a single
+    worker or a single job renders inline without starting a pool.
+    """
+    workers = min(len(jobs), workers or stage_budget())
+    if workers <= 1:
+        return [job() for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(dict(matplotlib.rcParams),)) as pool:
+        return list(pool.map(_run, jobs))
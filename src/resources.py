@@ -0,0 +1,92 @@
+# src/resources.py
+"""
+CPU Resource Governor
+---------------------
+Training code asks the governor how many cores it may use instead of
+passing `n_jobs=-1` at every level. A request is split between outer
+parallelism (search candidates / CV folds, run as separate jobs) and inner
+parallelism (threads of one estimator), so outer × inner never exceeds the
+budget, and BLAS / OpenMP pools are capped at the inner share.
+
+Budget resolution:
+    TRAIN_CPU_BUDGET   total cores for training (default: cores available to the process)
+    STAGE_CPU_BUDGET   per-stage share, set by `main.py` as budget // pipeline workers so
+                       concurrently running stages together stay within the total
+"""
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from threadpoolctl import threadpool_limits
+
+NATIVE_THREAD_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+
+def total_budget() -> int:
+    """Cores the whole training pipeline may use."""
+    return max(1, int(os.getenv("TRAIN_CPU_BUDGET", str(available_cores()))))
+
+
+def stage_budget() -> int:
+    """Cores the current pipeline stage (process) may use."""
+    return max(1, min(total_budget(), int(os.getenv("STAGE_CPU_BUDGET") or total_budget())))
+
+
+def share_between_stages(workers: int) -> int:
+    """Give each of `workers` concurrent stages an equal share and export it to child processes."""
+    share = max(1, total_budget() // max(1, workers))
+    os.environ["STAGE_CPU_BUDGET"] = str(share)
+    print(f"🧮 CPU budget: {total_budget()} core(s) → {share} per stage × {workers} concurrent stage(s)")
+    return share
+
+
+def cap_native_threads(n: int) -> None:
+    """Cap BLAS / OpenMP pools of this process (and of processes it spawns later)."""
+    for var in NATIVE_THREAD_VARS:
+        os.environ[var] = str(n)
+    threadpool_limits(limits=n)
+
+
+@dataclass(frozen=True)
+class Allocation:
+    label: str
+    budget: int
+    outer: int
+    inner: int
+
+    @contextmanager
+    def limits(self):
+        """Cap BLAS / OpenMP threads at the inner share while the block runs."""
+        with threadpool_limits(limits=self.inner):
+            yield self
+
+
+def allocate(label: str, outer_tasks: int = 1, budget: int = None, verbose: bool = True) -> Allocation:
+    """
+    Split the stage budget for a job made of `outer_tasks` independent fits.
+
+    Outer parallelism is preferred (independent fits scale better than the
+    threads of one small-data fit); leftover cores go to each fit's threads.
+    """
+    budget = budget or stage_budget()
+    outer = max(1, min(outer_tasks, budget))
+    inner = max(1, budget // outer)
+    alloc = Allocation(label, budget, outer, inner)
+    if verbose:
+        print(f"🧮 CPU allocation [{label}]: {budget} core(s) → outer {outer} × inner {inner} "
+              f"({outer_tasks} task(s), BLAS/OpenMP capped at {inner})")
+    return alloc
@@ -0,0 +1,207 @@
+"""
+tree_ensemble.py
+----------------
+Native NumPy evaluator for boosted tree ensembles.
+
+This module provides:
+1. `export_xgb_trees()` — flattens the trees of a fitted XGBoost binary
+   classifier into compact arrays (feature index, threshold, left/right
+   child, default direction, leaf value) and optionally saves them as `.npz`
+2. `TreeEnsemble` — scores those arrays directly with vectorized NumPy,
+   for a single row or a batch, without pandas or DMatrix overhead
+3. A latency comparison against `XGBClassifier.predict_proba`
+
+Run with:
+    python -m src.tree_ensemble models/best_xgb.pkl
+"""
+
+import json
+import sys
+import time
+from typing import Optional
+import joblib
+import numpy as np
+
+# Rows are traversed in blocks so the (rows x trees) index matrix stays small
+BLOCK_ROWS = 4096
+
+
+# ============================================================
+# 1. Export
+# ============================================================
+def export_xgb_trees(model, save_path: Optional[str] = None) -> dict:
+    """
+    Flatten a fitted `XGBClassifier` (binary:logistic) into NumPy arrays.
+
+    All trees are concatenated into one node table; `roots` holds the node
+    offset of each tree. Leaves point to themselves so that traversal can run
+    a fixed number of steps (the maximum depth) without branching.
+    """
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+
+    objective = learner["objective"]["name"]
+    if objective != "binary:logistic":
+        raise ValueError(f"Unsupported objective for native scoring: {objective}")
+
+    gbm = learner["gradient_booster"]
+    if gbm.get("name") != "gbtree":
+        raise ValueError(f"Unsupported booster for native scoring: {gbm.get('name')}")
+    trees = gbm["model"]["trees"]
+
+    # Honour early stopping the same way predict_proba does
+    best_iteration = booster.attributes().get("best_iteration")
+    if best_iteration is not None:
+        trees = trees[: int(best_iteration) + 1]
+
+    feature, threshold, left, right, default_left, value, roots = [], [], [], [], [], [], []
+    offset, depth = 0, 0
+    for tree in trees:
+        if any(tree.get("split_type", [])):
+            raise ValueError("Categorical splits are not supported by the native evaluator.")
+        lc = np.asarray(tree["left_children"], dtype=np.int32)
+        rc = np.asarray(tree["right_children"], dtype=np.int32)
+        cond = np.asarray(tree["split_conditions"], dtype=np.float32)
+        n = len(lc)
+        is_leaf = lc == -1
+        self_idx = np.arange(n, dtype=np.int32)
+
+        roots.append(offset)
+        feature.append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.int32))
+        threshold.append(np.where(is_leaf, 0.0, cond).astype(np.float32))
+        left.append(np.where(is_leaf, self_idx, lc) + offset)
+        right.append(np.where(is_leaf, self_idx, rc) + offset)
+        default_left.append(np.asarray(tree["default_left"], dtype=bool))
+        value.append(np.where(is_leaf, cond, 0.0).astype(np.float32))
+        depth = max(depth, _tree_depth(lc, rc))
+        offset += n
+
+    base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+    arrays = {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float32),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "default_left": np.concatenate(default_left),
+        "value": np.concatenate(value).astype(np.float32),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "depth": np.int32(depth),
+        "base_margin": np.float32(np.log(base_score / (1.0 - base_score))),
+        "feature_names": np.asarray(booster.feature_names or [], dtype=str),
+    }
+
+    if save_path:
+        np.savez(save_path, **arrays)
+        print(f"✅ Exported {len(roots)} trees ({offset} nodes) to {save_path}")
+    return arrays
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Maximum root-to-leaf depth of one tree."""
+    depth, frontier = 0, [0]
+    while True:
+        children = [c for n in frontier for c in (left[n], right[n]) if c != -1]
+        if not children:
+            return depth
+        depth, frontier = depth + 1, children
+
+
+# ============================================================
+# 2. Evaluator
+# ============================================================
+class TreeEnsemble:
+    """Pure-NumPy scorer over arrays produced by `export_xgb_trees`."""
+
+    def __init__(self, arrays: dict):
+        self.feature = np.ascontiguousarray(arrays["feature"], dtype=np.int32)
+        self.threshold = np.ascontiguousarray(arrays["threshold"], dtype=np.float32)
+        self.left = np.ascontiguousarray(arrays["left"], dtype=np.int32)
+        self.right = np.ascontiguousarray(arrays["right"], dtype=np.int32)
+        self.default_left = np.ascontiguousarray(arrays["default_left"], dtype=bool)
+        self.value = np.ascontiguousarray(arrays["value"], dtype=np.float32)
+        self.roots = np.ascontiguousarray(arrays["roots"], dtype=np.int32)
+        self.depth = int(arrays["depth"])
+        self.base_margin = np.float32(arrays["base_margin"])
+        self.feature_names = [str(f) for f in arrays.get("feature_names", [])]
+
+    @classmethod
+    def from_model(cls, model) -> "TreeEnsemble":
+        return cls(export_xgb_trees(model))
+
+    @classmethod
+    def load(cls, path: str) -> "TreeEnsemble":
+        with np.load(path) as data:
+            return cls({k: data[k] for k in data.files})
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def predict_margin(self, X) -> np.ndarray:
+        """Raw (logit) scores for a single row or a 2-D batch."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        out = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), BLOCK_ROWS):
+            block = X[start:start + BLOCK_ROWS]
+            out[start:start + len(block)] = self._margin_block(block)
+        return out
+
+    def _margin_block(self, X: np.ndarray) -> np.ndarray:
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.depth):
+            x = X[rows, self.feature[node]]
+            go_left = (x < self.threshold[node]) | (np.isnan(x) & self.default_left[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node].sum(axis=1, dtype=np.float32) + self.base_margin
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities with the same (n, 2) layout as sklearn/XGBoost."""
+        p = 1.0 / (1.0 + np.exp(-self.predict_margin(X).astype(np.float64)))
+        return np.column_stack([1.0 - p, p])
+
+
+# ============================================================
+# 3. Latency comparison
+# ============================================================
+def compare_latency(model, X: np.ndarray, repeats: int = 200) -> dict:
+    """Median single-row and batch latency of XGBoost vs. the native evaluator."""
+    import pandas as pd
+
+    native = TreeEnsemble.from_model(model)
+    columns = native.feature_names or None
+    row = X[:1]
+
+    def timed(fn, n):
+        samples = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t0)
+        return float(np.median(samples)) * 1000.0
+
+    results = {
+        "xgb_single_df_ms": timed(lambda: model.predict_proba(pd.DataFrame(row, columns=columns)), repeats),
+        "xgb_single_np_ms": timed(lambda: model.predict_proba(row), repeats),
+        "native_single_ms": timed(lambda: native.predict_proba(row), repeats),
+        "xgb_batch_ms": timed(lambda: model.predict_proba(X), 10),
+        "native_batch_ms": timed(lambda: native.predict_proba(X), 10),
+        "batch_rows": len(X),
+        "max_abs_diff": float(np.abs(model.predict_proba(X)[:, 1] - native.predict_proba(X)[:, 1]).max()),
+    }
+    for k, v in results.items():
+        print(f"{k:>20}: {v:.4f}" if isinstance(v, float) else f"{k:>20}: {v}")
+    return results
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else "models/best_xgb.pkl"
+    data_path = sys.argv[2] if len(sys.argv) > 2 else "data/processed/telco_processed.csv"
+    model = joblib.load(model_path)
+    export_xgb_trees(model, model_path.rsplit(".", 1)[0] + ".trees.npz")
+    X = pd.read_csv(data_path).drop(columns=["Churn"]).to_numpy(dtype=np.float64)
+    compare_latency(model, X)
@@ -72,7 +72,7 @@ def ensure_dir(path: str):
     """Create folder if not exists."""
     os.makedirs(path, exist_ok=True)
 
-def save_fig(fig, folder, filename):
-    """Save figure to path safely."""
-    ensure_dir(folder)
-    fig.savefig(os.path.join(folder, filename), bbox_inches="tight", dpi=300)
+def save_fig(fig, folder, filename, dpi=300):
+    """Save figure to path safely (FIGURE_DPI / FIGURE_FORMAT override, see src.rendering)."""
+    from src.rendering import save_figure
+    return save_figure(fig, folder, filename, dpi=dpi)
@@ -1,5 +1,6 @@
 # tests/conftest.py
 import pytest
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -21,3 +22,19 @@ def sample_data():
             "MonthlyCharges": [50.0 + i for i in range(10)],
             "TotalCharges": [500.0 + i * 10 for i in range(10)]
         })
+
+
+@pytest.fixture
+def telco_frame():
+    """Fixture: factory for a synthetic, label-encoded Telco-like frame of `n` rows."""
+    def make(n=3000, seed=0):
+        rng = np.random.default_rng(seed)
+        contract = rng.integers(0, 3, n)
+        return pd.DataFrame({
+            "Contract": contract,
+            "PaymentMethod": np.where(rng.random(n) < 0.3, contract, rng.integers(0, 4, n)),
+            "tenure": rng.integers(0, 72, n) + 10 * contract,
+            "MonthlyCharges": rng.gamma(4.0, 15.0, n),
+            "Churn": rng.integers(0, 2, n),
+        })
+    return make
@@ -0,0 +1,67 @@
+# tests/test_api_client.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src.app.api_client import APIError, ChurnAPIClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Stand-in for the churn API: the first call answers 503, then batches score tenure / 100."""
+    protocol_version = "HTTP/1.1"
+    calls = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.calls.append((self.path, self.client_address[1]))
+        if len(self.calls) == 1:
+            return self._reply(503, {"detail": "warming up"})
+        if self.path.endswith("/batch"):
+            results = [{"index": i, "churn_probability": r["tenure"] / 100, "prediction": "No Churn"}
+                       if r["tenure"] is not None else {"index": i, "error": "tenure missing"}
+                       for i, r in enumerate(body["records"])]
+            return self._reply(200, {"count": len(results), "failed": 0, "results": results})
+        self._reply(422, {"detail": "bad payload"})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.calls = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/api/predict"
+    httpd.shutdown()
+
+
+def test_score_frame_retries_batches_and_keeps_order(server):
+    client = ChurnAPIClient(server, retries=2)
+    df = pd.DataFrame({"customerID": [f"c{i}" for i in range(25)], "tenure": [float(i) for i in range(25)]})
+    df.loc[3, "tenure"] = None
+    progress = []
+
+    scored = client.score_frame(df, ["tenure"], batch_size=10, concurrency=1,
+                                on_progress=lambda done, total: progress.append((done, total)))
+
+    assert progress == [(10, 25), (20, 25), (25, 25)]
+    assert scored["customerID"].tolist() == df["customerID"].tolist()
+    assert scored.loc[24, "churn_probability"] == 0.24 and scored.loc[3, "error"] == "tenure missing"
+    assert len(_Handler.calls) == 4                                   # one 503 retried + 3 batches
+    assert len({port for _, port in _Handler.calls[1:]}) == 1         # sequential batches reuse one keep-alive connection
+
+    with pytest.raises(APIError) as err:
+        client.predict({"tenure": 1})
+    assert err.value.status_code == 422 and err.value.detail == "bad payload"
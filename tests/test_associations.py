@@ -0,0 +1,39 @@
+# tests/test_associations.py
+import numpy as np
+import pandas as pd
+
+from src.eda.associations import AssociationEngine
+
+
+def _engine():
+    return AssociationEngine(["tenure", "MonthlyCharges"], ["Contract", "PaymentMethod"])
+
+
+def test_measures_match_direct_formulas(telco_frame):
+    """Cramér's V, correlation ratio and Pearson agree with direct pandas/numpy formulas"""
+    df = telco_frame(4000)
+    engine = _engine().update(df)
+    table = pd.crosstab(df.Contract, df.PaymentMethod).to_numpy()
+    expected = np.outer(table.sum(1), table.sum(0)) / table.sum()
+    v = np.sqrt(((table - expected) ** 2 / expected).sum() / table.sum() / (min(table.shape) - 1))
+    assert np.isclose(engine.categorical_matrix().loc["Contract", "PaymentMethod"], v)
+
+    means = df.groupby("Contract").tenure.agg(["mean", "size"])
+    eta2 = (means["size"] * (means["mean"] - df.tenure.mean()) ** 2).sum() / ((df.tenure - df.tenure.mean()) ** 2).sum()
+    assert np.isclose(engine.correlation_ratio().loc["Contract", "tenure"], np.sqrt(eta2))
+    assert np.allclose(engine.pearson(), df[["tenure", "MonthlyCharges"]].corr())
+
+
+def test_merge_and_incremental_update_match_one_pass(telco_frame):
+    """Partial engines (with levels seen in different orders) merge, and persisted state keeps updating"""
+    df = telco_frame(4000)
+    full = _engine().update(df).matrix("mi")
+    reversed_rows = df.iloc[::-1]
+    parts = [_engine().update(reversed_rows.iloc[i:i + 800]) for i in range(0, len(df), 800)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert np.allclose(merged.matrix("mi"), full)
+
+    refreshed = AssociationEngine.from_dict(_engine().update(df.iloc[:1000]).to_dict()).update(df.iloc[1000:])
+    assert np.allclose(refreshed.matrix("mi"), full)
@@ -0,0 +1,52 @@
+# tests/test_benchmark.py
+import json
+
+import numpy as np
+import pytest
+
+from src.benchmark import compare_to_baseline, load_payloads, main, run_benchmark, summarize
+from tests.test_predict_batch import PAYLOAD
+
+
+def test_inprocess_run_reports_latency_percentiles():
+    result = run_benchmark(payloads=[PAYLOAD, {"tenure": 1}], n_requests=40, concurrency=4, warmup=4)
+    assert result["requests"] == 40
+    assert result["status_counts"] == {"200": 20, "422": 20}
+    assert result["errors"] == 20
+    lat = result["latency_ms"]
+    assert 0 < lat["p50"] <= lat["p95"] <= lat["p99"] <= lat["max"]
+    assert result["throughput_rps"] > 0 and result["model_version"]
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {"requests": 100, "errors": 0, "throughput_rps": 500.0,
+                "latency_ms": {"p50": 10.0, "p95": 20.0, "p99": 30.0}}
+    same = dict(baseline, latency_ms={"p50": 11.0, "p95": 21.0, "p99": 33.0}, throughput_rps=450.0)
+    assert compare_to_baseline(same, baseline, tolerance=0.2) == []
+
+    slow = dict(baseline, latency_ms={"p50": 10.0, "p95": 20.0, "p99": 45.0}, throughput_rps=300.0, errors=2)
+    regressions = compare_to_baseline(slow, baseline, tolerance=0.2)
+    assert [r.split()[0] for r in regressions] == ["p99", "throughput", "error"]
+
+
+def test_cli_saves_baseline_from_payload_file(tmp_path):
+    payloads = tmp_path / "payloads.jsonl"
+    payloads.write_text("\n".join(json.dumps(p) for p in load_payloads(n=5)) + "\n")
+    out = tmp_path / "baseline.json"
+    main(["--payloads", str(payloads), "--requests", "10", "--concurrency", "2", "--warmup", "0",
+          "--save", str(out)])
+    saved = json.loads(out.read_text())
+    assert saved["name"] == "predict_c2" and saved["requests"] == 10 and saved["errors"] == 0
+
+
+def test_summarize_rejects_run_without_completed_requests():
+    with pytest.raises(ValueError, match="No requests completed"):
+        summarize(np.array([]), {}, 0.01)
+
+
+def test_sampled_payloads_are_distinct_so_cache_never_hits():
+    result = run_benchmark(n_requests=30, concurrency=4, warmup=2)
+    assert result["distinct_payloads"] == 32
+    assert result["cache"]["hits"] == 0 and result["cache"]["misses"] == 30
+    payloads = load_payloads(n=8000)
+    assert len({json.dumps(p, sort_keys=True) for p in payloads}) == 8000
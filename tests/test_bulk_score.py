@@ -0,0 +1,18 @@
+import pandas as pd
+from src import bulk_score
+
+
+def test_score_file_is_chunk_size_invariant(tmp_path):
+    """Chunked scoring of the raw layout gives the same output for any chunk size"""
+    raw = pd.read_csv("data/raw/Telco-Customer-Churn.csv", dtype={"TotalCharges": str}).head(60)
+    raw.loc[20, "TotalCharges"] = " "  # blank value on a chunk boundary (chunksize=10)
+    src = tmp_path / "raw.csv"
+    raw.to_csv(src, index=False)
+
+    bulk_score.score_file(str(src), str(tmp_path / "a.csv"), chunksize=10)
+    bulk_score.score_file(str(src), str(tmp_path / "b.csv"), chunksize=1000)
+
+    a = pd.read_csv(tmp_path / "a.csv")
+    b = pd.read_csv(tmp_path / "b.csv")
+    assert len(a) == 60
+    pd.testing.assert_frame_equal(a, b)
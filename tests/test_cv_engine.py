@@ -0,0 +1,40 @@
+# tests/test_cv_engine.py
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+
+from src.cv_engine import CVEngine, CVResult, compare_results
+
+
+def _data():
+    x, y = make_classification(n_samples=400, n_features=5, random_state=0)
+    return pd.DataFrame(x), pd.Series(y)
+
+
+def test_folds_shared_and_oof_complete(tmp_path):
+    """Engines on the same labels share folds; every row gets one OOF score"""
+    x, y = _data()
+    a, b = CVEngine(y), CVEngine(y)
+    assert a.folds is b.folds
+    val = np.sort(np.concatenate([v for _, v in a.folds]))
+    assert np.array_equal(val, np.arange(len(y)))
+
+    lr = a.run("lr", LogisticRegression(), x)
+    weak = b.run("weak", LogisticRegression(C=1e-4), x[[0]])
+    assert lr.oof.shape == (len(y),) and np.all((lr.oof >= 0) & (lr.oof <= 1))
+
+    path = lr.save(tmp_path / "lr.joblib")
+    assert np.array_equal(CVResult.load(str(path)).oof, lr.oof)
+    rows = compare_results(lr, weak)
+    assert rows[0][0] == "lr" and rows[1][4] <= len(a.folds)
+
+
+def test_best_threshold_maximises_f1():
+    """The vectorised F1 sweep matches a brute-force search"""
+    x, y = _data()
+    result = CVEngine(y).run("lr", LogisticRegression(), x)
+    brute = max(np.unique(result.oof), key=lambda t: f1_score(result.y, result.oof >= t))
+    t = result.best_threshold()
+    assert np.isclose(f1_score(result.y, result.oof >= t), f1_score(result.y, result.oof >= brute))
@@ -0,0 +1,47 @@
+# tests/test_data_preview.py
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routers import data_preview
+from src.api.services.data_store import ColumnarStore
+
+
+def _use_csv(monkeypatch, tmp_path, df):
+    path = tmp_path / "processed.csv"
+    df.to_csv(path, index=False)
+    monkeypatch.setattr(data_preview, "DATA_PATH", str(path))
+    monkeypatch.setattr(data_preview, "store", ColumnarStore(str(path), cache_dir=str(tmp_path / "cache")))
+    return path
+
+
+def test_data_preview_pages_projects_and_filters(monkeypatch, tmp_path):
+    """offset/limit/columns/filter select rows; X-Total-Count counts all matches"""
+    df = pd.DataFrame({"tenure": range(10), "Contract": [0, 1] * 5, "Churn": ["No", "Yes"] * 5})
+    _use_csv(monkeypatch, tmp_path, df)
+    client = TestClient(app)
+
+    res = client.get("/api/data-preview", params={"offset": 2, "limit": 3})
+    assert res.status_code == 200 and res.headers["X-Total-Count"] == "10"
+    assert [r["tenure"] for r in res.json()] == [2, 3, 4]
+
+    res = client.get("/api/data-preview", params={"columns": "tenure,Churn", "filter": ["Contract:1"], "n": 2,
+                                                  "offset": 1})
+    assert res.headers["X-Total-Count"] == "5"
+    assert res.json() == [{"tenure": 3, "Churn": "Yes"}, {"tenure": 5, "Churn": "Yes"}]
+
+    assert client.get("/api/data-preview", params={"columns": "nope"}).status_code == 400
+    assert client.get("/api/data-preview", params={"filter": "Contract"}).status_code == 400
+    assert client.get("/api/data-preview", params={"filter": "tenure:abc"}).status_code == 400
+
+
+def test_data_preview_rebuilds_cache_when_csv_changes(monkeypatch, tmp_path):
+    """A rewritten CSV is picked up, including previously cached filter results"""
+    path = _use_csv(monkeypatch, tmp_path, pd.DataFrame({"tenure": [1, 2, 3], "Contract": [0, 1, 1]}))
+    client = TestClient(app)
+    assert client.get("/api/data-preview", params={"filter": "Contract:1"}).headers["X-Total-Count"] == "2"
+
+    pd.DataFrame({"tenure": [10, 20, 30, 40], "Contract": [1, 1, 1, 0]}).to_csv(path, index=False)
+    res = client.get("/api/data-preview", params={"filter": "Contract:1"})
+    assert res.headers["X-Total-Count"] == "3"
+    assert [r["tenure"] for r in res.json()] == [10, 20, 30]
@@ -0,0 +1,44 @@
+# tests/test_eda_streaming.py
+import numpy as np
+
+from src.eda.associations import AssociationEngine
+from src.eda.sketches import Moments, QuantileSketch
+from src.eda.streaming import summarize_csv
+from src.eda.summary import compute_summary
+
+
+def test_streamed_summary_matches_in_memory(tmp_path, telco_frame):
+    """Chunked summary equals the in-memory one; only continuous-column box quartiles are sketched"""
+    df = telco_frame(3000)
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    full, streamed = compute_summary(df), summarize_csv(str(path), chunksize=700, workers=1)
+
+    for key in ["n_rows", "target_counts", "columns", "crosstabs"]:
+        assert streamed[key] == full[key]
+    assert np.allclose(AssociationEngine.from_dict(streamed["associations"]).matrix(),
+                       AssociationEngine.from_dict(full["associations"]).matrix(), atol=1e-9)
+    assert streamed["numeric"]["tenure"]["box"] == full["numeric"]["tenure"]["box"]    # exact counts
+    for col in ["tenure", "MonthlyCharges"]:
+        assert streamed["numeric"][col]["hist"]["counts"] == full["numeric"][col]["hist"]["counts"]
+    for c, box in full["numeric"]["MonthlyCharges"]["box"].items():
+        assert abs(streamed["numeric"]["MonthlyCharges"]["box"][c]["med"] - box["med"]) < 1.0
+
+
+def test_partial_sketches_merge():
+    """Sketches built over separate chunks merge into the result of one pass"""
+    x = np.random.default_rng(1).normal(size=(50_000, 3))
+    parts = [Moments("abc").update(chunk) for chunk in np.array_split(x, 7)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert np.allclose(merged.corr(), np.corrcoef(x.T))
+
+    sketches = [QuantileSketch(seed=i).update(chunk[:, 0]) for i, chunk in enumerate(np.array_split(x, 7))]
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    assert merged.n == len(x) and sum(map(len, merged.levels)) < 5_000
+    est = merged.quantiles([0.1, 0.5, 0.9])
+    ranks = np.searchsorted(np.sort(x[:, 0]), est) / len(x)
+    assert np.all(np.abs(ranks - [0.1, 0.5, 0.9]) < 0.02)
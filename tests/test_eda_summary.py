@@ -0,0 +1,27 @@
+# tests/test_eda_summary.py
+import numpy as np
+import pandas as pd
+
+from src.eda.associations import AssociationEngine
+from src.eda.summary import compute_summary
+
+
+def test_summary_matches_raw_statistics(telco_frame):
+    """Crosstabs, histograms, boxes and correlations agree with pandas/numpy on the raw rows"""
+    df = telco_frame(2000)
+    s = compute_summary(df)
+    assert s["target_counts"] == {"0": int((df.Churn == 0).sum()), "1": int((df.Churn == 1).sum())}
+
+    ct = pd.crosstab(df.Contract, df.Churn).to_numpy().tolist()
+    assert s["crosstabs"]["Contract"]["counts"] == ct
+
+    m = s["numeric"]["MonthlyCharges"]
+    assert sum(m["hist"]["counts"]) == len(df)
+    x, y = np.asarray(m["kde"]["x"]), np.asarray(m["kde"]["y"])
+    assert abs(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2) - 1) < 0.01    # density integrates to 1
+    churned = df.MonthlyCharges[df.Churn == 1]
+    assert np.isclose(m["box"]["1"]["med"], churned.median())
+
+    pearson = AssociationEngine.from_dict(s["associations"]).pearson()
+    assert list(pearson.columns) == ["tenure", "MonthlyCharges"]      # label-encoded Contract is categorical
+    assert np.allclose(pearson.to_numpy(), df[["tenure", "MonthlyCharges"]].corr().to_numpy(), atol=1e-6)
@@ -0,0 +1,53 @@
+# tests/test_metrics.py
+from fastapi.testclient import TestClient
+
+from src.api.main import app
+from src.api.routers import predict
+from src.api.services.metrics import (
+    ERRORS, REGISTRY, REQUESTS, STAGE_LATENCY, Histogram, register_model_metrics,
+)
+from tests.test_predict_batch import PAYLOAD
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        h.observe(value, "predict")
+    lines = h.render()
+    assert 'demo_seconds_bucket{stage="predict",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="predict",le="1"} 3' in lines
+    assert 'demo_seconds_bucket{stage="predict",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{stage="predict"} 4' in lines
+
+
+def test_metrics_endpoint_reports_requests_stages_and_model():
+    client = TestClient(app)
+    route = "/api/predict"
+    before = {s: STAGE_LATENCY.count(route, s) for s in ("parse", "features", "predict", "serialize")}
+    batch_features = STAGE_LATENCY.count("/api/predict/batch", "features")
+    ok, bad = REQUESTS.value("POST", route, "200"), ERRORS.value("POST", route, "422")
+
+    # a payload no other test sends, so the prediction cache cannot skip the model stages
+    assert client.post(route, json=dict(PAYLOAD, TotalCharges=531.17)).status_code == 200
+    assert all(STAGE_LATENCY.count(route, s) == n + 1 for s, n in before.items())
+    assert STAGE_LATENCY.count("/api/predict/batch", "features") == batch_features
+
+    # Schema rejection: parse is still timed, the endpoint stages are not
+    assert client.post(route, json={"tenure": 1}).status_code == 422
+    assert STAGE_LATENCY.count(route, "parse") == before["parse"] + 2
+    assert STAGE_LATENCY.count(route, "features") == before["features"] + 1
+
+    assert REQUESTS.value("POST", route, "200") == ok + 1
+    assert ERRORS.value("POST", route, "422") == bad + 1
+
+    body = client.get("/metrics").text
+    assert 'inference_stage_seconds_bucket{route="/api/predict",stage="predict",le="+Inf"}' in body
+    assert "model_info{model=\"best_xgb\",version=" in body
+    assert "process_resident_memory_bytes " in body
+
+
+def test_model_metrics_registration_is_idempotent():
+    register_model_metrics(predict.model_service.registry.stats)
+    body = REGISTRY.render()
+    assert body.count("# TYPE model_info gauge") == 1
+    assert body.count("# TYPE model_load_seconds gauge") == 1
@@ -0,0 +1,63 @@
+# tests/test_model_eval.py
+import numpy as np
+from sklearn.metrics import (
+    accuracy_score,
+    average_precision_score,
+    classification_report,
+    confusion_matrix,
+    roc_auc_score,
+)
+
+from src.model_eval import EvaluationEngine
+
+
+def _scores(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    p = np.clip(0.3 * y + rng.random(n) * 0.7, 0, 1).round(2)   # many ties
+    return y, p
+
+
+def test_engine_matches_sklearn():
+    """AUCs, confusion matrix and report agree with sklearn on tied scores"""
+    y, p = _scores()
+    engine = EvaluationEngine(y, p)
+    assert np.isclose(engine.roc_auc(), roc_auc_score(y, p))
+    assert np.isclose(engine.pr_auc(), average_precision_score(y, p))
+
+    for t, inclusive in [(0.5, True), (0.5, False), (0.37, True)]:
+        pred = (p >= t) if inclusive else (p > t)
+        tn, fp, fn, tp = confusion_matrix(y, pred).ravel()
+        assert engine.confusion(t, inclusive) == {"tp": tp, "fp": fp, "fn": fn, "tn": tn}
+        assert np.isclose(engine.accuracy(t, inclusive), accuracy_score(y, pred))
+        assert engine.classification_report(t, inclusive) == classification_report(y, pred.astype(int))
+
+
+def test_lift_table_deciles():
+    """Deciles cover every row and cumulative gain ends at 1"""
+    y, p = _scores(n=1003)
+    lift = EvaluationEngine(y, p).lift_table()
+    assert lift["rows"].sum() == 1003
+    assert lift["positives"].sum() == y.sum()
+    assert np.isclose(lift["cumulative_gain"].iloc[-1], 1.0)
+    assert lift["lift"].iloc[0] >= lift["lift"].iloc[-1]
+
+
+def test_bootstrap_matches_resampled_sklearn():
+    """Batched resample metrics equal sklearn on the same resamples; paired CI brackets the diff"""
+    from sklearn.metrics import roc_auc_score, average_precision_score
+    from src.model_eval import _resample_counts, _weighted_metrics, bootstrap_metrics, paired_bootstrap
+
+    y, p = _scores(n=800)
+    counts = _resample_counts(np.random.default_rng(3), len(y), 4)
+    batch = _weighted_metrics(y, p, counts, 0.5, False)
+    for i in range(4):
+        idx = np.repeat(np.arange(len(y)), counts[i])
+        assert np.isclose(batch["roc_auc"][i], roc_auc_score(y[idx], p[idx]))
+        assert np.isclose(batch["pr_auc"][i], average_precision_score(y[idx], p[idx]))
+        assert np.isclose(batch["accuracy"][i], accuracy_score(y[idx], p[idx] > 0.5))
+
+    ci = bootstrap_metrics(y, p, n_boot=300)
+    assert ci["roc_auc"]["low"] <= ci["roc_auc"]["estimate"] <= ci["roc_auc"]["high"]
+    same = paired_bootstrap(y, p, p, n_boot=300)
+    assert same["roc_auc"]["diff"] == 0 and same["roc_auc"]["p_value"] == 1.0
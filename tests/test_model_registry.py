@@ -0,0 +1,41 @@
+import os
+import shutil
+import joblib
+import numpy as np
+from sklearn.dummy import DummyClassifier
+from src.api.services.model_registry import ModelRegistry
+
+
+def test_registry_lazy_loads_and_hot_swaps(tmp_path):
+    """Models load on first use and are swapped when the file changes"""
+    shutil.copy("models/best_xgb.pkl", tmp_path / "best_xgb.pkl")
+    registry = ModelRegistry(model_dir=str(tmp_path), check_interval=0)
+    assert registry.stats()["loads"] == 0
+
+    old = registry.get("best_xgb")
+    X = np.zeros((2, 19))
+    expected = old.model.predict_proba(X)
+
+    replacement = DummyClassifier(strategy="prior").fit(X, [0, 1])
+    joblib.dump(replacement, tmp_path / "best_xgb.pkl")
+    os.utime(tmp_path / "best_xgb.pkl", (old.mtime + 10, old.mtime + 10))
+
+    new = registry.get("best_xgb")
+    assert new.version != old.version and registry.reloads == 1
+    assert registry.get(version=new.version[:8]) is new
+    # The old snapshot is still usable by requests that were already in flight
+    np.testing.assert_allclose(old.model.predict_proba(X), expected)
+
+
+def test_registry_keeps_last_good_snapshot_on_corrupt_artifact(tmp_path):
+    """A half-written artifact does not replace the model being served"""
+    X = np.zeros((2, 19))
+    joblib.dump(DummyClassifier(strategy="prior").fit(X, [0, 1]), tmp_path / "best_xgb.pkl")
+    registry = ModelRegistry(model_dir=str(tmp_path), check_interval=0)
+    good = registry.get("best_xgb")
+
+    (tmp_path / "best_xgb.pkl").write_bytes(b"not a pickle")
+    os.utime(tmp_path / "best_xgb.pkl", (good.mtime + 10, good.mtime + 10))
+
+    assert registry.get("best_xgb") is good
+    assert registry.reloads == 0
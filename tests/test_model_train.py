@@ -7,3 +7,68 @@ def test_train_model(tmp_path, sample_data):
     model = model_train.train_model(sample_data, output_path=model_path)
     assert model is not None
     assert model_path.exists()
+
+
+def test_successive_halving_respects_fit_budget():
+    """Halving search stops at the fit budget and still returns a winner"""
+    from sklearn.datasets import make_classification
+    from sklearn.ensemble import RandomForestClassifier
+    import pandas as pd
+
+    x, y = make_classification(n_samples=300, n_features=6, random_state=0)
+    x, y = pd.DataFrame(x), pd.Series(y)
+    grid = {"max_depth": [2, 4, 6, None], "n_estimators": [5, 45]}
+    est = RandomForestClassifier(random_state=0)
+
+    full = model_train.successive_halving_search(est, grid, x, y)
+    assert [r["candidates"] for r in full["rungs"]] == [4, 2, 1]
+    assert full["fits"] == (4 + 2 + 1) * 3
+
+    capped = model_train.successive_halving_search(est, grid, x, y, max_fits=15)
+    assert capped["fits"] <= 15
+    assert "n_estimators" in capped["best_params"]
+
+
+def test_early_stopping_search_learns_tree_count():
+    """Early-stopping search returns a learned n_estimators within max_rounds"""
+    from sklearn.datasets import make_classification
+    import pandas as pd
+
+    x, y = make_classification(n_samples=300, n_features=6, random_state=0)
+    x, y = pd.DataFrame(x), pd.Series(y)
+    result = model_train.early_stopping_search(
+        {"max_depth": [2, 3], "n_estimators": [999]}, x, y, max_rounds=60, early_stopping_rounds=5
+    )
+    assert result["fits"] == 2 * 3
+    assert 1 <= result["best_params"]["n_estimators"] <= 60
+    assert 0.5 < result["best_score"] <= 1.0
+
+
+def test_compare_search_strategies_reports_each_strategy():
+    """Grid, halving and early stopping are compared on the same split"""
+    from sklearn.datasets import make_classification
+    import pandas as pd
+
+    x, y = make_classification(n_samples=300, n_features=6, random_state=0)
+    x, y = pd.DataFrame(x), pd.Series(y)
+    grid = {"max_depth": [2, 3], "n_estimators": [5, 15]}
+    report = model_train.compare_search_strategies(x, y, param_grid=grid)
+
+    assert list(report) == ["grid", "halving", "early_stopping"]
+    assert report["grid"]["fits"] == 4 * model_train.SEARCH_SPLITS
+    for r in report.values():
+        assert 0.5 < r["cv_auc"] <= 1.0 and 0.5 < r["test_auc"] <= 1.0
+
+
+def test_successive_halving_partial_first_rung_still_returns_winner():
+    """A budget that ends inside rung 0 returns the best candidate evaluated"""
+    from sklearn.datasets import make_classification
+    from sklearn.ensemble import RandomForestClassifier
+    import pandas as pd
+
+    x, y = make_classification(n_samples=300, n_features=6, random_state=0)
+    x, y = pd.DataFrame(x), pd.Series(y)
+    grid = {"max_depth": [2, 4, 6, None], "n_estimators": [5, 45]}
+    result = model_train.successive_halving_search(RandomForestClassifier(random_state=0), grid, x, y,
+                                                   max_fits=6)
+    assert result["fits"] == 6 and result["rungs"][0]["candidates"] == 2
@@ -0,0 +1,38 @@
+from src.pipeline_cache import StageCache, module_sources
+
+
+def test_stage_cache_skips_unchanged_and_reruns_on_change(tmp_path):
+    """Stages are skipped while inputs/outputs are unchanged and rerun otherwise"""
+    src, out = tmp_path / "in.txt", tmp_path / "out.txt"
+    src.write_text("a")
+    calls = []
+
+    def stage():
+        calls.append(1)
+        out.write_text(src.read_text().upper())
+        return out.read_text()
+
+    def run(**kwargs):
+        cache = StageCache(cache_dir=str(tmp_path / "cache"), **kwargs)
+        result = cache.run("upper", stage, inputs=[str(src)], outputs=[str(out)])
+        return result, cache.summary[0]["status"]
+
+    assert run() == ("A", "recomputed")
+    assert run() == ("A", "cached")
+    assert run(force=["upper"]) == ("A", "recomputed")
+
+    src.write_text("b")
+    assert run() == ("B", "recomputed")
+    out.write_text("tampered")
+    assert run() == ("B", "recomputed")
+    assert len(calls) == 4
+
+
+def test_module_sources_follows_stage_imports():
+    """A training stage's code list covers every src module it imports, directly or not"""
+    code = module_sources("src/model_train.py")
+    for path in ["src/model_train.py", "src/cv_engine.py", "src/resources.py", "src/utils.py",
+                 "src/preprocess.py", "src/encoder.py"]:
+        assert path in code
+    assert "src/eda/__init__.py" not in module_sources("src/eda/overview.py")
+    assert "src/eda/overview.py" in module_sources("src/eda/__init__.py")
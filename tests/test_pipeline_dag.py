@@ -0,0 +1,34 @@
+import time
+from src.pipeline_dag import Stage, critical_path, run_dag
+
+
+def _sleep_then(value, *upstream, seconds=0.2):
+    time.sleep(seconds)
+    return value + sum(upstream)
+
+
+def test_run_dag_runs_independent_stages_concurrently():
+    """Independent stages overlap and results flow to consumers"""
+    stages = [
+        Stage("a", _sleep_then, args=(1,)),
+        Stage("b", _sleep_then, args=(2,), deps=["a"], consumes=["a"]),
+        Stage("c", _sleep_then, args=(3,), deps=["a"], consumes=["a"]),
+        Stage("d", _sleep_then, args=(0,), deps=["b", "c"], consumes=["b", "c"]),
+    ]
+    results, timings = run_dag(stages, max_workers=2, executor="thread")
+
+    assert results == {"a": 1, "b": 3, "c": 4, "d": 7}
+    assert timings["b"]["start"] < timings["c"]["end"] and timings["c"]["start"] < timings["b"]["end"]
+    _, path = critical_path(stages, timings)
+    assert path[0] == "a" and path[-1] == "d" and len(path) == 3
+
+
+def test_figure_stage_patterns_follow_figure_format(monkeypatch):
+    """EDA stage outputs and the report's inputs use the configured figure format"""
+    import main
+
+    monkeypatch.setattr(main, "FIGURE_FORMAT", "pdf")
+    stages = {s.name: s for s in main.build_stages(colors=["#000000"])}
+    eda = [s for name, s in stages.items() if name.startswith("eda_") and name not in ("eda_summary", "eda_report")]
+    assert eda and all(s.cache["outputs"][0].endswith(".pdf") for s in eda)
+    assert stages["eda_report"].cache["inputs"] == [f"{main.EDA_DIR}/*.pdf"]
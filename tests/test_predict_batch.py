@@ -0,0 +1,102 @@
+import asyncio
+from src.api.schemas.churn_schema import CustomerFeatures
+from src.api.services.churn_service import ChurnModelService
+
+PAYLOAD = {
+    "gender": 1, "SeniorCitizen": 0, "Partner": 1, "Dependents": 0,
+    "tenure": 12, "PhoneService": 1, "MultipleLines": 0,
+    "InternetService": 1, "OnlineSecurity": 0, "OnlineBackup": 0,
+    "DeviceProtection": 0, "TechSupport": 0, "StreamingTV": 0,
+    "StreamingMovies": 0, "Contract": 1, "PaperlessBilling": 1,
+    "PaymentMethod": 1, "MonthlyCharges": 70.0, "TotalCharges": 500.0
+}
+
+
+def test_predict_batch_matches_single_and_keeps_order():
+    """Batch scoring returns one item per record, in order, with per-row errors"""
+    service = ChurnModelService()
+    other = dict(PAYLOAD, tenure=60, Contract=2, MonthlyCharges=20.0)
+    bad = dict(PAYLOAD, tenure="not-a-number")
+
+    result = service.predict_batch([PAYLOAD, bad, other])
+
+    assert result.count == 3 and result.failed == 1
+    assert [item.index for item in result.results] == [0, 1, 2]
+    assert result.results[1].error and result.results[1].churn_probability is None
+
+    single = service.predict(CustomerFeatures(**other))
+    assert result.results[2].churn_probability == single.churn_probability
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    """Concurrent predict_async calls are scored together and match predict()"""
+    service = ChurnModelService(microbatch_window_ms=20, microbatch_max_size=8)
+    payloads = [dict(PAYLOAD, tenure=t) for t in range(1, 9)]
+
+    async def run():
+        return await asyncio.gather(
+            *(service.predict_async(CustomerFeatures(**p)) for p in payloads)
+        )
+
+    results = asyncio.run(run())
+    expected = [service.predict(CustomerFeatures(**p)) for p in payloads]
+    assert results == expected
+
+    stats = service.batcher.stats()
+    assert stats["batches"] == 1 and stats["rows"] == 8
+    assert stats["batch_size_histogram"]["le_8"] == 1
+
+
+def test_prediction_cache_hits_on_repeated_payload():
+    """Repeated identical payloads are served from the cache"""
+    service = ChurnModelService(cache_size=2, cache_ttl=60)
+    first = service.predict(CustomerFeatures(**PAYLOAD))
+    second = service.predict(CustomerFeatures(**PAYLOAD))
+
+    assert first == second
+    assert service.cache.hits == 1 and service.cache.misses == 1
+
+    for tenure in (1, 2):  # push the original entry out of a 2-slot cache
+        service.predict(CustomerFeatures(**dict(PAYLOAD, tenure=tenure)))
+    assert service.cache.evictions == 1
+
+
+def test_predict_accepts_raw_category_strings():
+    """Raw Telco strings are encoded to the same codes used in training"""
+    service = ChurnModelService(cache_size=0)
+    raw = dict(PAYLOAD, gender="Male", Partner="Yes", Dependents="No",
+               PhoneService="Yes", MultipleLines="No", InternetService="Fiber optic",
+               Contract="One year", PaymentMethod="Credit card (automatic)")
+    assert service.predict(CustomerFeatures(**raw)) == service.predict(CustomerFeatures(**PAYLOAD))
+
+    unseen = service.predict(CustomerFeatures(**dict(raw, Contract="Ten years")))
+    assert 0.0 <= unseen.churn_probability <= 1.0
+
+
+def test_predict_coerces_string_label_codes():
+    """Label codes sent as digit strings score the same as int codes"""
+    service = ChurnModelService(cache_size=0)
+    as_text = {k: str(v) if isinstance(v, int) else v for k, v in PAYLOAD.items()}
+    features = CustomerFeatures(**as_text)
+    assert features.Contract == 1 and isinstance(features.gender, int)
+    assert service.predict(features) == service.predict(CustomerFeatures(**PAYLOAD))
+
+
+def test_micro_batcher_scores_each_row_with_its_own_snapshot():
+    """A reload landing mid-window does not score old-snapshot rows with the new model"""
+    import dataclasses
+    import numpy as np
+    from sklearn.dummy import DummyClassifier
+
+    service = ChurnModelService(cache_size=0, microbatch_window_ms=20, microbatch_max_size=8)
+    old = service.registry.get()
+    X = service.build_feature_matrix([CustomerFeatures(**PAYLOAD)])
+    constant = DummyClassifier(strategy="constant", constant=1).fit(np.zeros((2, X.shape[1])), [0, 1])
+    new = dataclasses.replace(old, version="reloaded", model=constant, native=None)
+
+    async def run():
+        return await asyncio.gather(service.batcher.submit(X, old), service.batcher.submit(X, new))
+
+    from_old, from_new = asyncio.run(run())
+    assert from_old == service.score_matrix(X)[0] and from_new == 1.0
+    assert service.batcher.stats()["batches"] == 1
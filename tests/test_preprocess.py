@@ -7,3 +7,18 @@ def test_clean_data(sample_data):
     assert df_clean is not None
     assert not df_clean.empty
     assert "MonthlyCharges" in df_clean.columns
+
+
+def test_preprocess_in_chunks_matches_in_memory(tmp_path):
+    """Chunked preprocessing writes exactly what the in-memory path writes"""
+    raw = preprocess.load_data("data/raw/Telco-Customer-Churn.csv").head(300)
+    raw.loc[100, "TotalCharges"] = " "  # blank value on a chunk boundary (chunksize=50)
+    raw_path = tmp_path / "raw.csv"
+    raw.to_csv(raw_path, index=False)
+
+    data = preprocess.clean_total_charges(preprocess.load_data(str(raw_path)))
+    data = preprocess.encode_categorical_features(preprocess.drop_unnecessary_columns(data))
+    preprocess.save_processed_data(data, str(tmp_path / "memory.csv"))
+
+    preprocess.preprocess_in_chunks(str(raw_path), str(tmp_path / "chunked.csv"), chunksize=50)
+    assert (tmp_path / "chunked.csv").read_text() == (tmp_path / "memory.csv").read_text()
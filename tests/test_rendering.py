@@ -0,0 +1,16 @@
+# tests/test_rendering.py
+from src.rendering import RenderJob, new_figure, render_jobs, save_figure
+
+
+def _line_plot(folder, name, fmt):
+    fig, ax = new_figure(figsize=(3, 2))
+    ax.plot([0, 1], [1, 0])
+    return save_figure(fig, folder, f"{name}.png", dpi=50, fmt=fmt)
+
+
+def test_render_jobs_in_pool(tmp_path):
+    """Jobs render in worker processes, in order, with the requested format"""
+    jobs = [RenderJob(_line_plot, (str(tmp_path), f"fig{i}", fmt)) for i, fmt in enumerate(["png", "svg", "png"])]
+    paths = render_jobs(jobs, workers=2)
+    assert [p.rsplit("/", 1)[-1] for p in paths] == ["fig0.png", "fig1.svg", "fig2.png"]
+    assert all((tmp_path / p.rsplit("/", 1)[-1]).stat().st_size > 0 for p in paths)
@@ -0,0 +1,47 @@
+# tests/test_report_generator.py
+import json
+import os
+
+import numpy as np
+from PIL import Image
+
+from src.eda.report_generator import generate_eda_report
+
+
+def _figure(path, seed):
+    pixels = np.random.default_rng(seed).integers(0, 255, (900, 1500, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+
+
+def test_report_uses_lazy_thumbnails_and_manifest(tmp_path):
+    for i, name in enumerate(["b_plot.png", "a_plot.png"]):
+        _figure(tmp_path / name, i)
+    generate_eda_report(str(tmp_path))
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert [e["file"] for e in manifest["images"]] == ["a_plot.png", "b_plot.png"]
+    first = manifest["images"][0]
+    assert (first["width"], first["height"]) == (1500, 900) and first["thumb_width"] == 480
+    assert first["thumb_bytes"] < first["bytes"]
+
+    page = (tmp_path / "eda_summary.html").read_text()
+    assert page.count("loading='lazy'") == 2 and f"href='a_plot.png?v={first['sha256'][:12]}'" in page
+
+    # unchanged figures keep their thumbnails; a changed one updates the manifest hash
+    thumb = tmp_path / first["thumb"]
+    mtime = os.stat(thumb).st_mtime_ns
+    _figure(tmp_path / "b_plot.png", 7)
+    generate_eda_report(str(tmp_path))
+    rebuilt = json.loads((tmp_path / "manifest.json").read_text())
+    assert os.stat(thumb).st_mtime_ns == mtime
+    assert rebuilt["hash"] != manifest["hash"]
+
+
+def test_report_links_pdf_figures(tmp_path):
+    """PDF figures (FIGURE_FORMAT=pdf) are listed and linked, without a thumbnail"""
+    (tmp_path / "c_plot.pdf").write_bytes(b"%PDF-1.4 demo")
+    generate_eda_report(str(tmp_path))
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert [(e["file"], e["thumb"]) for e in manifest["images"]] == [("c_plot.pdf", "c_plot.pdf")]
+    page = (tmp_path / "eda_summary.html").read_text()
+    assert "href='c_plot.pdf?v=" in page and "<img" not in page
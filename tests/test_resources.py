@@ -0,0 +1,15 @@
+# tests/test_resources.py
+from src import resources
+
+
+def test_resource_allocation_never_oversubscribes(monkeypatch):
+    """outer × inner stays within the per-stage share of the budget"""
+    monkeypatch.setenv("TRAIN_CPU_BUDGET", "16")
+    # share_between_stages writes os.environ; setenv first so teardown restores it
+    monkeypatch.setenv("STAGE_CPU_BUDGET", "")
+    assert resources.share_between_stages(3) == 5
+    for tasks in (1, 3, 5, 540):
+        alloc = resources.allocate("test", outer_tasks=tasks, verbose=False)
+        assert alloc.budget == 5
+        assert alloc.outer * alloc.inner <= 5
+        assert alloc.outer == min(tasks, 5)
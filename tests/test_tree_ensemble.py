@@ -0,0 +1,20 @@
+import joblib
+import numpy as np
+import pandas as pd
+from src.tree_ensemble import TreeEnsemble, export_xgb_trees
+
+
+def test_native_trees_match_xgboost(tmp_path):
+    """Exported NumPy evaluator reproduces XGBoost probabilities"""
+    model = joblib.load("models/best_xgb.pkl")
+    X = pd.read_csv("data/processed/telco_processed.csv").drop(columns=["Churn"])
+    X = X.sample(500, random_state=0).to_numpy(dtype=np.float64)
+    X[::7, 17] = np.nan  # exercise default (missing-value) directions
+
+    path = tmp_path / "trees.npz"
+    export_xgb_trees(model, str(path))
+    native = TreeEnsemble.load(str(path))
+
+    expected = model.predict_proba(X)
+    np.testing.assert_allclose(native.predict_proba(X), expected, atol=1e-5)
+    np.testing.assert_allclose(native.predict_proba(X[0]), expected[:1], atol=1e-5)